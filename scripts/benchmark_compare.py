@@ -112,15 +112,76 @@ def main() -> None:
         output.append(f"**Average: {harmonize_avg:+.1f}%**")
         output.append("")
 
+    # --- Detection scaling ---
+    scaling_rows, scaling_avg = compare(baseline, current, "test_bench_detect_scaling[")
+    if scaling_rows:
+        output.append("### Detection scaling (registered parsers)")
+        output.append("")
+        output.extend(format_table(scaling_rows))
+        output.append("")
+        output.append(f"**Average: {scaling_avg:+.1f}%**")
+        output.append("")
+
+    # --- Original data retention ---
+    original_rows, original_avg = compare(
+        baseline, current, "test_bench_original_data["
+    )
+    if original_rows:
+        output.append("### Original data retention (`as_table(original_data=...)`)")
+        output.append("")
+        output.extend(format_table(original_rows))
+        output.append("")
+        output.append(f"**Average: {original_avg:+.1f}%**")
+        output.append("")
+
+    # --- Harmonization engines ---
+    engine_rows, engine_avg = compare(
+        baseline, current, "test_bench_harmonization_engine["
+    )
+    if engine_rows:
+        output.append("### Harmonization engines (`as_table(engine=...)`)")
+        output.append("")
+        output.extend(format_table(engine_rows))
+        output.append("")
+        output.append(f"**Average: {engine_avg:+.1f}%**")
+        output.append("")
+
+    # --- CSV reader engines ---
+    csv_rows, csv_avg = compare(baseline, current, "test_bench_csv_engine[")
+    if csv_rows:
+        output.append("### CSV reader engines (`detect_file`, `CSV_ENGINE=...`)")
+        output.append("")
+        output.extend(format_table(csv_rows))
+        output.append("")
+        output.append(f"**Average: {csv_avg:+.1f}%**")
+        output.append("")
+
+    # --- Large synthetic files ---
+    large_rows, large_avg = compare(baseline, current, "_large")
+    if large_rows:
+        output.append("### Large synthetic files (`detect_file` + `as_table`)")
+        output.append("")
+        output.extend(format_table(large_rows))
+        output.append("")
+        output.append(f"**Average: {large_avg:+.1f}%**")
+        output.append("")
+
     # --- Summary ---
-    if not detect_rows and not harmonize_rows:
+    all_rows = (
+        detect_rows
+        + harmonize_rows
+        + scaling_rows
+        + original_rows
+        + engine_rows
+        + csv_rows
+        + large_rows
+    )
+    if not all_rows:
         output.append(
             "No matching benchmarks found in both baseline and current results."
         )
     else:
-        regressions = [
-            r for r in (detect_rows + harmonize_rows) if r[3] > REGRESSION_THRESHOLD_PCT
-        ]
+        regressions = [r for r in all_rows if r[3] > REGRESSION_THRESHOLD_PCT]
         if regressions:
             output.append(
                 f":warning: **{len(regressions)} test(s) regressed "
@@ -1,3 +1,4 @@
+from .batch import parse_many, scan_file
 from .parser import detect_file
 
-__all__ = ["detect_file"]
+__all__ = ["detect_file", "parse_many", "scan_file"]
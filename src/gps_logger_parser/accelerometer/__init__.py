@@ -1,10 +1,14 @@
 import datetime
+import math
 import re
 
-import pyarrow.csv as pacsv
+import numpy as np
+import pandas as pd
 
-from ..helpers import stream_starts_with
-from ..parser_base import Parsable, Parser
+from ..dispatch import Signature
+from ..helpers import line_offset
+from ..parser_base import DetectionContext, Parsable, Parser
+from ..timestamps import as_utc
 from .columns import AccelerometerHarmonizedColumn
 from .mixin import AccelerometerHarmonizationMixin
 
@@ -31,74 +35,124 @@ class AcceleratorParser(AccelerometerHarmonizationMixin, Parser):
         AccelerometerHarmonizedColumn.Z: "Z",
     }
 
+    @classmethod
+    def signatures(cls):
+        """The file must start with the expected HEAD bytes."""
+        return [Signature.prefix(cls.HEAD)]
+
     @classmethod
     def can_parse(cls, parsable):
-        """Check if the file starts with the expected HEAD bytes."""
-        try:
-            with parsable.get_stream(binary=False) as stream:
-                return stream_starts_with(stream, cls.HEAD)
-        except (UnicodeDecodeError, OSError):
+        """Scan the preamble for the X,Y,Z header and parse start and frequency."""
+        if not super().can_parse(parsable):
             return False
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
-
-        row_count = 0
         intro = ""
+        for row_count, (_start, end, row) in enumerate(parsable.iter_lines()):
+            if [v.strip() for v in row.split(",")] == cls.FIELDS:
+                return cls._intro_context(intro, row_count, end)
+            intro += row
 
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_starts_with(stream, self.HEAD):
-                self._raise_not_supported("Stream head different than expected")
+            if row_count + 1 > cls.MAX_READ:
+                break
 
-            stream.seek(0)
+        return False
 
-            for row in stream:
-                if [v.strip() for v in row.split(",")] == self.FIELDS:
-                    break
-                row_count += 1
-                intro += row
+    @classmethod
+    def _intro_context(cls, intro, preamble_rows, data_offset):
+        try:
+            metadata = {
+                "start": cls.get_start_datetime(intro),
+                "frequency": cls.get_frequency(intro),
+            }
+        except (AttributeError, ValueError):
+            # The preamble is written with a different date layout
+            return False
 
-                if row_count > self.MAX_READ:
-                    self._raise_not_supported(
-                        f"Expected data not found after {self.MAX_READ} lines"
-                    )
+        return DetectionContext(
+            header=list(cls.FIELDS),
+            data_offset=data_offset,
+            preamble_rows=preamble_rows,
+            metadata=metadata,
+            intro=intro,
+        )
 
-        parse_options = pacsv.ParseOptions(
-            delimiter=self.SEPARATOR, invalid_row_handler=skip
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self._read_rows()
+
+    def _csv_options(self):
+        return {
+            "separator": self.SEPARATOR,
+            "include_columns": self.FIELDS + ["empty"],
+            "encoding": self.file.encoding,
+            "invalid_row_handler": skip,
+            "fallback": False,
+        }
+
+    def _csv_range(self):
+        return self.context.data_offset, None
+
+    def _finish_data(self, data, first_row):
+        """Date the samples, ``frequency`` apart from ``start``, as one range."""
+        start = np.datetime64(self.context.metadata["start"])
+        frequency = np.timedelta64(self.context.metadata["frequency"])
+        data["datetime"] = start + frequency * np.arange(
+            first_row, first_row + len(data)
         )
-        read_options = pacsv.ReadOptions(skip_rows=row_count + 1)
-        convert_options = pacsv.ConvertOptions(
-            include_columns=self.FIELDS + ["empty"],
-            include_missing_columns=True,
+        return data
+
+    def _time_span(self, start, end):
+        """Rows of a time range, from the ``start`` and ``frequency`` of the preamble.
+
+        Samples are ``frequency`` apart, so the rows of the range are known
+        without reading any: only the line breaks before the last one are
+        counted, to find their byte offsets.
+        """
+        if self._data is not None or not self.file.ascii_compatible:
+            return None
+        range_start, _end = self._csv_range()
+        header = self._header_bytes(range_start, None, self._csv_options())
+        if header is None:
+            return None
+
+        origin = as_utc(self.context.metadata["start"])
+        frequency = pd.Timedelta(self.context.metadata["frequency"])
+        first_row, last_row = (
+            None
+            if value is None
+            else max(math.ceil((as_utc(value) - origin) / frequency), 0)
+            for value in (start, end)
         )
-        with self.file.get_stream(binary=True) as stream:
-            self.data = pacsv.read_csv(
-                stream,
-                parse_options=parse_options,
-                read_options=read_options,
-                convert_options=convert_options,
-            ).to_pandas()
-
-        frequency = self.get_frequency(intro)
-        start = self.get_start_datetime(intro)
-        self.data["datetime"] = [
-            start + (frequency * index) for index in range(len(self.data))
-        ]
-
-    def get_start_datetime(self, intro):
-        date, year, month, day = re.search(self.DATE_REGEX, intro).groups()
-        time, hour, minutes, seconds = re.search(self.TIME_REGEX, intro).groups()
+        first_row = first_row or 0
+
+        data_start, data_end = range_start + len(header), self.file.size
+        with self.file.get_view() as view:
+            span_start = line_offset(view, data_start, data_end, first_row)
+            span_end = (
+                data_end
+                if last_row is None
+                else line_offset(view, span_start, data_end, last_row - first_row)
+            )
+        return span_start, span_end, first_row
+
+    @classmethod
+    def get_start_datetime(cls, intro):
+        date, year, month, day = re.search(cls.DATE_REGEX, intro).groups()
+        time, hour, minutes, seconds = re.search(cls.TIME_REGEX, intro).groups()
 
         return datetime.datetime.strptime(
-            f"{date.replace(' ', '')} {time}", self.STRP_FORMAT
+            f"{date.replace(' ', '')} {time}", cls.STRP_FORMAT
         )
 
-    def get_frequency(self, intro):
-        frequency = re.search(self.FREQUENCY_REGEX, intro).group(1)
-        delta = {self.DELTA_ATTR: int(frequency)}
+    @classmethod
+    def get_frequency(cls, intro):
+        frequency = re.search(cls.FREQUENCY_REGEX, intro).group(1)
+        delta = {cls.DELTA_ATTR: int(frequency)}
         return datetime.timedelta(**delta)
 
 
@@ -0,0 +1,434 @@
+"""
+Batch ingestion of many logger files with a process pool.
+
+Sources can be files, directories (walked recursively) or glob patterns, on
+the local disk or on remote storage (``s3://``). Each file is detected and
+written to parquet in a worker process, so the import cost of the parsing
+stack is paid once per worker instead of once per file.
+"""
+
+import hashlib
+import logging
+import os
+import posixpath
+import re
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import fsspec
+import pyarrow as pa
+from fsspec.utils import get_protocol
+from upath import UPath
+
+from .dataset import DatasetWriter
+from .manifest import Manifest, entry_is_current, file_fingerprint, output_options
+from .parser import detect_file
+from .parser_base import OriginalData, QualityControl
+from .scan import ScanSummary
+
+logger = logging.getLogger(__name__)
+
+LOCAL_PROTOCOLS = ("file", "local")
+GLOB_MAGIC = re.compile(r"[*?[]")
+
+
+class FileResult(NamedTuple):
+    """Outcome of parsing a single file"""
+
+    path: str
+    parser: str | None = None
+    rows: int = 0
+    size: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+    skipped: bool = False
+    fingerprint: dict | None = None
+    output: str | None = None
+    # Table handed back to the main process to be appended to a dataset
+    table: pa.Table | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchSummary(NamedTuple):
+    """Outcome of a batch, with aggregate throughput over its wall time"""
+
+    results: list[FileResult]
+    seconds: float
+
+    @property
+    def succeeded(self) -> list[FileResult]:
+        return [result for result in self.results if result.ok and not result.skipped]
+
+    @property
+    def skipped(self) -> list[FileResult]:
+        return [result for result in self.results if result.skipped]
+
+    @property
+    def failed(self) -> list[FileResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def rows(self) -> int:
+        return sum(result.rows for result in self.succeeded)
+
+    @property
+    def size(self) -> int:
+        return sum(result.size for result in self.succeeded)
+
+    def _rate(self, value):
+        return value / self.seconds if self.seconds else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self._rate(len(self.succeeded))
+
+    @property
+    def rows_per_second(self) -> float:
+        return self._rate(self.rows)
+
+    @property
+    def mb_per_second(self) -> float:
+        return self._rate(self.size / 1_000_000)
+
+
+def _storage_options(source: str, storage_options: dict | None) -> dict:
+    """Storage options only apply to remote sources."""
+    if not storage_options or get_protocol(source) in LOCAL_PROTOCOLS:
+        return {}
+    return storage_options
+
+
+def read_list_file(path: str, storage_options: dict | None = None) -> list[str]:
+    """Read sources from a text file, one per line; blank and # lines are skipped."""
+    with UPath(path, **_storage_options(path, storage_options)).open("r") as stream:
+        return [
+            line.strip()
+            for line in stream
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def resolve_sources(
+    sources: list[str], storage_options: dict | None = None
+) -> list[str]:
+    """Expand directories and glob patterns into the list of files to parse."""
+    return list(_resolve_outputs(sources, storage_options))
+
+
+def _glob_root(pattern: str) -> str:
+    """Directory of a glob pattern, up to its first magic part."""
+    parts = pattern.split("/")
+    magic = next(index for index, part in enumerate(parts) if GLOB_MAGIC.search(part))
+    return "/".join(parts[:magic])
+
+
+def _resolve_outputs(
+    sources: list[str], storage_options: dict | None = None
+) -> dict[str, str]:
+    """Map each file of ``sources`` to the name of its output, without suffix.
+
+    Outputs are named after the path of the file relative to the directory or
+    glob pattern it was found in, so that files sharing a name in different
+    subdirectories are written apart. Files given one by one are named after
+    themselves, with a short hash of their path if their names collide.
+    """
+    names = {}
+    for source in sources:
+        options = _storage_options(source, storage_options)
+        fs, _token, paths = fsspec.get_fs_token_paths(source, storage_options=options)
+        remote = get_protocol(source) not in LOCAL_PROTOCOLS
+        pattern = fs._strip_protocol(source)
+        for path in paths:
+            if fs.isdir(path):
+                root = path
+                found = sorted(fs.find(path))
+            else:
+                has_magic = GLOB_MAGIC.search(pattern)
+                root = _glob_root(pattern) if has_magic else posixpath.dirname(path)
+                found = [path]
+            for file in found:
+                name = posixpath.relpath(file, root)
+                if remote:
+                    file = fs.unstrip_protocol(file)
+                # A file matched by several sources is parsed once
+                names.setdefault(file, name)
+
+    counts = Counter(names.values())
+    return {
+        file: (
+            f"{name}-{hashlib.sha256(file.encode()).hexdigest()[:8]}"
+            if counts[name] > 1
+            else name
+        )
+        for file, name in names.items()
+    }
+
+
+def parse_file(
+    source: str,
+    output: str,
+    storage_options: dict | None = None,
+    previous: dict | None = None,
+    dataset: bool = False,
+    original_data: str = OriginalData.JSON,
+    batch_size: int | None = None,
+    quality_control: str = QualityControl.NONE,
+    time_range: tuple | None = None,
+    columns: list[str] | None = None,
+    filters: list | None = None,
+    name: str | None = None,
+) -> FileResult:
+    """Detect a single file and write it as parquet into ``output``.
+
+    With ``dataset``, the table is returned in the result instead, to be
+    appended to the dataset by the calling process. The file is skipped if
+    ``previous``, its manifest entry from an earlier run, still matches the
+    file, the parser code and the options below (see
+    ``manifest.output_options``). Errors are returned in the result instead
+    of raised, so that one broken file does not stop a batch. With
+    ``batch_size``, the parquet file is written that many rows at a time.
+    ``quality_control`` flags or drops the rows failing the quality checks,
+    and only the rows of ``time_range`` are written if given. With
+    ``columns``, only those harmonized columns are written, and with
+    ``filters`` only the rows meeting them. The file is written to
+    ``<output>/<name>.parquet``, ``name`` defaulting to the file name.
+    """
+    start = time.perf_counter()
+    try:
+        path = UPath(source, **_storage_options(source, storage_options))
+        output_path = UPath(output, **_storage_options(output, storage_options))
+        name = name or path.name
+        fingerprint = file_fingerprint(path)
+        options = output_options(
+            dataset, original_data, quality_control, time_range, columns, filters
+        )
+        if entry_is_current(previous, fingerprint, output_path, options):
+            return FileResult(
+                path=source,
+                parser=previous["parser"],
+                seconds=time.perf_counter() - start,
+                skipped=True,
+            )
+
+        parser_instance = detect_file(path, columns=columns)
+        if dataset:
+            table = parser_instance.as_table(
+                original_data=original_data,
+                quality_control=quality_control,
+                time_range=time_range,
+                filters=filters,
+            )
+            rows = len(table)
+        else:
+            table = None
+            if "/" in name:
+                (output_path / name).parent.mkdir(parents=True, exist_ok=True)
+            rows = parser_instance.write_parquet(
+                output_path,
+                filename=name,
+                batch_size=batch_size,
+                original_data=original_data,
+                quality_control=quality_control,
+                time_range=time_range,
+                filters=filters,
+            )
+    except Exception as error:
+        logger.debug(traceback.format_exc())
+        return FileResult(
+            path=source,
+            seconds=time.perf_counter() - start,
+            error=f"{type(error).__name__}: {error}",
+        )
+
+    return FileResult(
+        path=source,
+        parser=type(parser_instance).__name__,
+        rows=rows,
+        size=fingerprint["size"],
+        seconds=time.perf_counter() - start,
+        fingerprint=fingerprint,
+        output=None if dataset else f"{name}.parquet",
+        table=table,
+    )
+
+
+def scan_file(
+    source: str, storage_options: dict | None = None, count_rows: bool = False
+) -> ScanSummary:
+    """Detect a single file and summarize it without parsing it whole.
+
+    See ``Parser.scan``: only a few windows of the rows are read, with range
+    requests on remote storage, and ``count_rows`` counts the lines of the
+    file instead of estimating the number of rows.
+    """
+    path = UPath(source, **_storage_options(source, storage_options))
+    return detect_file(path).scan(count_rows=count_rows)
+
+
+def parse_many(
+    sources: list[str],
+    output: str,
+    workers: int | None = None,
+    storage_options: dict | None = None,
+    incremental: bool = True,
+    dataset: bool = False,
+    original_data: str = OriginalData.JSON,
+    batch_size: int | None = None,
+    quality_control: str = QualityControl.NONE,
+    time_range: tuple | None = None,
+    columns: list[str] | None = None,
+    filters: list | None = None,
+    logger=logger,
+) -> BatchSummary:
+    """Parse every file found in ``sources`` and write them as parquet.
+
+    A manifest of the written files is kept in ``output``. With
+    ``incremental``, files whose input, parser code and options did not
+    change since they were last written are skipped. With ``dataset``, all
+    the files are appended to a single hive-partitioned dataset in ``output``
+    (see ``dataset.DatasetWriter``) instead of one parquet file each; the
+    earlier rows of the files appended again are removed first.
+
+    Args:
+        sources: files, directories or glob patterns, local or remote
+        output: directory the parquet files are written to, named after the
+            path of each file relative to the directory or glob it was found in
+        workers: size of the process pool, defaults to the number of CPUs;
+            with 1 the files are parsed in the calling process
+        storage_options: fsspec options for remote sources (e.g. ``anon``)
+        incremental: skip the files that are current in the manifest
+        dataset: write a partitioned dataset instead of a file per input
+        original_data: how the source rows are retained, see ``OriginalData``
+        batch_size: rows written at a time to each parquet file, by default
+            files are written whole (see ``Parser.write_parquet``)
+        quality_control: whether rows failing the quality checks are flagged
+            or dropped, see ``QualityControl``
+        time_range: ``(start, end)`` of the rows to write, either end can be
+            None; the rows of time sorted formats are found without reading
+            the whole file
+        columns: harmonized columns to write, with the metadata ones; only
+            the source columns they need are read
+        filters: conditions on harmonized columns the rows written meet,
+            e.g. ``"hdop <= 5"``, see ``filters.Filter``
+
+    Returns:
+        A summary holding one result per file, in the order of the sources
+    """
+    start = time.perf_counter()
+    names = _resolve_outputs(sources, storage_options)
+    files = list(names)
+    output_path = UPath(output, **_storage_options(output, storage_options))
+    # Workers write their files straight into it
+    output_path.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest.load(output_path)
+    writer = DatasetWriter(output_path) if dataset else None
+    options = output_options(
+        dataset, original_data, quality_control, time_range, columns, filters
+    )
+    previous = [manifest.entries.get(file) if incremental else None for file in files]
+    if dataset:
+        previous = _remove_stale_parts(
+            files, previous, manifest, output_path, options, storage_options
+        )
+    workers = workers or os.cpu_count() or 1
+    arguments = (
+        files,
+        [output] * len(files),
+        [storage_options] * len(files),
+        previous,
+        [dataset] * len(files),
+        [original_data] * len(files),
+        [batch_size] * len(files),
+        [quality_control] * len(files),
+        [time_range] * len(files),
+        [columns] * len(files),
+        [filters] * len(files),
+        list(names.values()),
+    )
+
+    try:
+        if workers == 1 or len(files) <= 1:
+            outcomes = map(parse_file, *arguments)
+            results = _collect(outcomes, manifest, writer, options, logger)
+        else:
+            max_workers = min(workers, len(files))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                outcomes = executor.map(parse_file, *arguments)
+                results = _collect(outcomes, manifest, writer, options, logger)
+    finally:
+        # Keep what was written even if the batch is interrupted
+        if writer is not None:
+            writer.close()
+            for source, parts in writer.parts.items():
+                manifest.record_parts(source, parts)
+        manifest.save()
+
+    return BatchSummary(results=results, seconds=time.perf_counter() - start)
+
+
+def _remove_stale_parts(
+    files, previous, manifest, output_path, options, storage_options
+) -> list[dict | None]:
+    """Remove the dataset rows of the inputs that are appended again.
+
+    Inputs that are not current are appended again, so the dataset files
+    holding their earlier rows are removed first. The other inputs with rows
+    in these files are appended again as well, see ``Manifest.forget``.
+
+    Returns:
+        The manifest entries ``parse_file`` compares the ``files`` with
+    """
+    stale = set()
+    for file, entry in zip(files, previous, strict=True):
+        path = UPath(file, **_storage_options(file, storage_options))
+        try:
+            fingerprint = file_fingerprint(path)
+        except OSError:
+            # Left to parse_file to report
+            stale.add(file)
+            continue
+        if not entry_is_current(entry, fingerprint, output_path, options):
+            stale.add(file)
+
+    dropped, parts = manifest.forget(stale)
+    for part in parts:
+        try:
+            (output_path / part).unlink()
+        except FileNotFoundError:
+            pass
+    return [
+        None if file in dropped else entry
+        for file, entry in zip(files, previous, strict=True)
+    ]
+
+
+def _collect(outcomes, manifest, writer, options, logger):
+    results = []
+    for result in outcomes:
+        if result.table is not None:
+            writer.write(result.table, source=result.path)
+            result = result._replace(table=None)
+
+        if result.skipped:
+            logger.debug(f"Skipped {result.path}: unchanged since the last run")
+        elif result.ok:
+            logger.info(f"Parsed {result.path} with {result.parser}")
+            manifest.record(
+                result.path,
+                result.fingerprint,
+                result.parser,
+                result.output,
+                result.rows,
+                options,
+            )
+        else:
+            logger.error(f"Failed {result.path}: {result.error}")
+            manifest.entries.pop(result.path, None)
+        results.append(result)
+    return results
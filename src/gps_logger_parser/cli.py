@@ -1,10 +1,15 @@
+import datetime
+import json
 import logging
 
 import typer
 from upath import UPath
 
+from .batch import parse_many as parse_many_files
+from .batch import read_list_file, resolve_sources, scan_file
 from .logger import configure_logger
 from .parser import detect_file
+from .parser_base import OriginalData, QualityControl
 
 app = typer.Typer(
     help="A CLI tool to parse GPS logger files and output them in a standardized format"
@@ -15,16 +20,93 @@ _output_option = typer.Option(
 )
 _verbose_option = typer.Option(False, "--verbose", "-v", help="Enable verbose logging")
 _file_argument = typer.Argument(..., help="Path to the GPS logger file to parse")
+_s3_endpoint_option = typer.Option(None, "--s3-endpoint", help="Custom S3 endpoint URL")
+_sources_argument = typer.Argument(
+    None, help="Files, directories or glob patterns to parse"
+)
+_from_list_option = typer.Option(
+    None, "--from-list", help="Text file listing the sources, one per line"
+)
+_workers_option = typer.Option(
+    None, "--workers", "-j", help="Number of worker processes (default: CPUs)"
+)
+_dataset_option = typer.Option(
+    False,
+    "--dataset",
+    help="Append to a parquet dataset partitioned by datatype, device and month",
+)
+_original_data_option = typer.Option(
+    OriginalData.JSON,
+    "--original-data",
+    help="How to retain the source rows: json, struct, line or none",
+)
+_quality_control_option = typer.Option(
+    QualityControl.NONE,
+    "--quality-control",
+    help="Flag or drop the rows failing the quality checks: none, flag or drop",
+)
+_start_option = typer.Option(
+    None, "--start", help="Only parse the rows from this time on (UTC)"
+)
+_end_option = typer.Option(
+    None, "--end", help="Only parse the rows before this time (UTC)"
+)
+_columns_option = typer.Option(
+    None,
+    "--columns",
+    help="Comma separated harmonized columns to keep, e.g. timestamp,latitude",
+)
+_filter_option = typer.Option(
+    None,
+    "--filter",
+    help="Only keep the rows meeting a condition, e.g. 'hdop <= 5' (repeatable)",
+)
+_batch_size_option = typer.Option(
+    None,
+    "--batch-size",
+    help="Write the parquet files this many rows at a time (default: whole)",
+)
+_count_rows_option = typer.Option(
+    False,
+    "--count-rows",
+    help="Count the lines of each file instead of estimating the rows",
+)
+_force_option = typer.Option(
+    False, "--force", help="Parse again the files unchanged since the last run"
+)
+
+
+def _time_range(start, end) -> tuple | None:
+    return None if start is None and end is None else (start, end)
+
+
+def _columns(columns: str | None) -> list[str] | None:
+    if columns is None:
+        return None
+    return [name.strip() for name in columns.split(",") if name.strip()]
+
+
+def _storage_options(s3_endpoint: str | None) -> dict:
+    params = {"anon": True}
+    if s3_endpoint:
+        params["endpoint_url"] = s3_endpoint
+    return params
 
 
 @app.command()
 def parse(
     file: str = _file_argument,
     output: str = _output_option,
+    dataset: bool = _dataset_option,
+    original_data: OriginalData = _original_data_option,
+    quality_control: QualityControl = _quality_control_option,
+    start: datetime.datetime = _start_option,
+    end: datetime.datetime = _end_option,
+    columns: str = _columns_option,
+    filters: list[str] = _filter_option,
+    batch_size: int = _batch_size_option,
     verbose: bool = _verbose_option,
-    s3_endpoint: str = typer.Option(
-        None, "--s3-endpoint", help="Custom S3 endpoint URL"
-    ),
+    s3_endpoint: str = _s3_endpoint_option,
 ):
     params = {}
 
@@ -32,12 +114,116 @@ def parse(
     logger = configure_logger(logging_level=logging_level)
 
     if file.startswith("s3://"):
-        if s3_endpoint:
-            params["endpoint_url"] = s3_endpoint
-        params["anon"] = True
+        params = _storage_options(s3_endpoint)
+
+    parser_instance = detect_file(
+        UPath(file, **params), logger=logger, columns=_columns(columns)
+    )
+    if dataset:
+        parser_instance.write_dataset(
+            UPath(output),
+            original_data=original_data,
+            quality_control=quality_control,
+            time_range=_time_range(start, end),
+            filters=filters,
+        )
+    else:
+        parser_instance.write_parquet(
+            UPath(output),
+            batch_size=batch_size,
+            original_data=original_data,
+            quality_control=quality_control,
+            time_range=_time_range(start, end),
+            filters=filters,
+        )
+
+
+@app.command("parse-many")
+def parse_many(
+    sources: list[str] = _sources_argument,
+    from_list: str = _from_list_option,
+    output: str = _output_option,
+    workers: int = _workers_option,
+    force: bool = _force_option,
+    dataset: bool = _dataset_option,
+    original_data: OriginalData = _original_data_option,
+    quality_control: QualityControl = _quality_control_option,
+    start: datetime.datetime = _start_option,
+    end: datetime.datetime = _end_option,
+    columns: str = _columns_option,
+    filters: list[str] = _filter_option,
+    batch_size: int = _batch_size_option,
+    verbose: bool = _verbose_option,
+    s3_endpoint: str = _s3_endpoint_option,
+):
+    logging_level = logging.DEBUG if verbose else logging.INFO
+    logger = configure_logger(logging_level=logging_level)
+    storage_options = _storage_options(s3_endpoint)
+
+    sources = list(sources or [])
+    if from_list:
+        sources += read_list_file(from_list, storage_options)
+    if not sources:
+        raise typer.BadParameter("No sources given")
+
+    summary = parse_many_files(
+        sources,
+        output,
+        workers=workers,
+        storage_options=storage_options,
+        incremental=not force,
+        dataset=dataset,
+        original_data=original_data,
+        quality_control=quality_control,
+        time_range=_time_range(start, end),
+        columns=_columns(columns),
+        filters=filters,
+        batch_size=batch_size,
+        logger=logger,
+    )
+    logger.info(
+        f"Parsed {len(summary.succeeded)}/{len(summary.results)} files "
+        f"({len(summary.skipped)} unchanged), "
+        f"{summary.rows} rows in {summary.seconds:.2f}s: "
+        f"{summary.files_per_second:.2f} files/s, "
+        f"{summary.rows_per_second:.0f} rows/s, "
+        f"{summary.mb_per_second:.2f} MB/s"
+    )
+    if summary.failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def scan(
+    sources: list[str] = _sources_argument,
+    from_list: str = _from_list_option,
+    count_rows: bool = _count_rows_option,
+    verbose: bool = _verbose_option,
+    s3_endpoint: str = _s3_endpoint_option,
+):
+    """Print a JSON summary of each file: device, time range, rows and bbox."""
+    # Logs are printed to stdout too, only warnings go along the summaries
+    logging_level = logging.DEBUG if verbose else logging.WARNING
+    logger = configure_logger(logging_level=logging_level)
+    storage_options = _storage_options(s3_endpoint)
+
+    sources = list(sources or [])
+    if from_list:
+        sources += read_list_file(from_list, storage_options)
+    if not sources:
+        raise typer.BadParameter("No sources given")
 
-    parser_instance = detect_file(UPath(file, **params), logger=logger)
-    parser_instance.write_parquet(UPath(output))
+    failed = False
+    for source in resolve_sources(sources, storage_options):
+        try:
+            summary = scan_file(source, storage_options, count_rows).to_dict()
+        except Exception as error:
+            logger.debug(f"Could not scan {source}", exc_info=True)
+            summary = {"path": source, "error": f"{type(error).__name__}: {error}"}
+            failed = True
+        typer.echo(json.dumps(summary))
+    if failed:
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
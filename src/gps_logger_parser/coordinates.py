@@ -0,0 +1,52 @@
+"""
+Vectorized conversion of logger coordinates to signed decimal degrees.
+
+Loggers often write positions as degrees and decimal minutes (``69 03.9617``)
+with the hemisphere in a column of its own (``N``/``S``, ``E``/``W``). These
+functions convert whole columns with numpy instead of a Python call per row.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Hemispheres of the negative latitudes and longitudes
+NEGATIVE_HEMISPHERES = ["S", "W"]
+
+
+def _to_float(values) -> np.ndarray:
+    # Values that are not numbers are NaN
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(
+        dtype="float64", na_value=np.nan
+    )
+
+
+def decimal_degrees(degrees, minutes=None) -> np.ndarray:
+    """Degrees plus decimal ``minutes`` divided by 60."""
+    values = _to_float(degrees)
+    if minutes is not None:
+        values = values + _to_float(minutes) / 60
+    return values
+
+
+def signed_degrees(degrees, hemispheres) -> np.ndarray:
+    """Negate the degrees of the southern and western hemispheres."""
+    values = _to_float(degrees)
+    negative = pd.Series(hemispheres).isin(NEGATIVE_HEMISPHERES).to_numpy()
+    return np.where(negative, -values, values)
+
+
+def to_decimal_degrees(degrees, minutes=None, hemispheres=None) -> np.ndarray:
+    """Signed decimal degrees from degrees, decimal minutes and hemispheres.
+
+    Args:
+        degrees: column of (decimal) degrees
+        minutes: column of decimal minutes, None if ``degrees`` are decimal
+        hemispheres: column of ``N``/``S``/``E``/``W``, None if unsigned
+
+    Returns:
+        The decimal degrees, NaN where a value is not a number
+    """
+    values = decimal_degrees(degrees, minutes)
+    if hemispheres is None:
+        return values
+    return signed_degrees(values, hemispheres)
@@ -0,0 +1,165 @@
+"""
+Hive-partitioned parquet dataset output.
+
+Instead of one parquet file per logger file, the tables of many logger files
+are appended to a single dataset, laid out as::
+
+    <output>/datatype=<datatype>/device=<device>/year=<year>/month=<month>/
+
+The partition keys have no leading underscore, as dataset readers (pyarrow,
+DuckDB, Spark) skip directories starting with one; ``datatype`` repeats the
+``_datatype`` column, which stays in the files.
+
+Tables are buffered and written in batches, so that small logger files end
+up sharing parquet files. Files roll over at ``max_rows_per_file`` rows and
+are written with row groups of ``rows_per_group`` rows. The files written for
+each logger file are kept in ``DatasetWriter.parts``, so that its rows can be
+removed before it is appended again.
+"""
+
+import os
+import pathlib
+import uuid
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow.fs import FSSpecHandler, PyFileSystem
+from upath import UPath
+
+from .scan import first_value
+
+PARTITIONING = ["datatype", "device", "year", "month"]
+
+DATASET_MAX_ROWS_PER_FILE = int(
+    os.environ.get("DATASET_MAX_ROWS_PER_FILE", default=str(1_000_000))
+)
+DATASET_ROWS_PER_GROUP = int(
+    os.environ.get("DATASET_ROWS_PER_GROUP", default=str(128 * 1024))
+)
+
+
+def device_id(table: pa.Table) -> str | None:
+    """Default device id of a table: its first ``id``, like ``Parser.scan``.
+
+    Tables without one (e.g. formats that do not record the logger) fall back
+    to the stem of the logger file they come from.
+    """
+    device = first_value(table, "id")
+    if device is not None and str(device) != "":
+        return str(device)
+    if "_logger_file" not in table.column_names or len(table) == 0:
+        return None
+    return pathlib.PurePosixPath(table.column("_logger_file")[0].as_py()).stem
+
+
+def _timestamps(table: pa.Table) -> pa.ChunkedArray | None:
+    if "timestamp" not in table.column_names:
+        return None
+
+    timestamps = table.column("timestamp")
+    if pa.types.is_timestamp(timestamps.type):
+        return timestamps
+    try:
+        return pc.cast(timestamps, pa.timestamp("us"))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Timestamps that are not ISO 8601 strings leave the period unknown
+        return None
+
+
+def add_partition_columns(table: pa.Table, device: str | None = None) -> pa.Table:
+    """Append the ``PARTITIONING`` columns to a table from ``Parser.as_table``."""
+    device = device or device_id(table)
+    table = table.append_column("datatype", table.column("_datatype"))
+    table = table.append_column("device", pa.array([device] * len(table), pa.string()))
+
+    timestamps = _timestamps(table)
+    if timestamps is None:
+        years = months = pa.nulls(len(table), pa.int64())
+    else:
+        years = pc.year(timestamps)
+        months = pc.month(timestamps)
+    return table.append_column("year", years).append_column("month", months)
+
+
+class DatasetWriter:
+    """Append parser tables to a hive-partitioned parquet dataset.
+
+    Tables are buffered until ``max_rows_per_file`` rows with the same schema
+    are pending, then written together. Call ``close`` (or use the writer as a
+    context manager) to write what is left in the buffers.
+
+    ``parts`` maps the ``source`` of each table written to the files, relative
+    to ``output``, holding its rows. Tables written together share their
+    files, so these also hold rows of other sources.
+    """
+
+    def __init__(
+        self,
+        output: UPath,
+        max_rows_per_file: int = DATASET_MAX_ROWS_PER_FILE,
+        rows_per_group: int = DATASET_ROWS_PER_GROUP,
+    ):
+        self.output = UPath(output)
+        self.max_rows_per_file = max_rows_per_file
+        self.rows_per_group = min(rows_per_group, max_rows_per_file)
+        self.filesystem = PyFileSystem(FSSpecHandler(self.output.fs))
+        self.written_rows = 0
+        self.parts = {}
+        # Tables sharing a schema are written together, with their sources
+        self._buffers = {}
+
+    def write(
+        self, table: pa.Table, device: str | None = None, source: str | None = None
+    ):
+        """Buffer a table from ``Parser.as_table``, writing once enough is pending."""
+        table = add_partition_columns(table, device).replace_schema_metadata(None)
+        # Extension types (geoarrow) are not hashable, their serialization is
+        key = table.schema.serialize().to_pybytes()
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append((table, source))
+        if sum(len(pending) for pending, _source in buffer) >= self.max_rows_per_file:
+            self._flush(key)
+
+    def flush(self):
+        for key in list(self._buffers):
+            self._flush(key)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _flush(self, key: bytes):
+        pending = self._buffers.pop(key, [])
+        if not pending:
+            return
+
+        table = pa.concat_tables([table for table, _source in pending])
+        written = []
+        ds.write_dataset(
+            table,
+            base_dir=self.output.path,
+            filesystem=self.filesystem,
+            format="parquet",
+            partitioning=PARTITIONING,
+            partitioning_flavor="hive",
+            # A unique name per batch appends to the partitions already written
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_file=self.max_rows_per_file,
+            min_rows_per_group=self.rows_per_group,
+            max_rows_per_group=self.rows_per_group,
+            file_visitor=lambda file: written.append(file.path),
+        )
+        self.written_rows += len(table)
+
+        base = f"{self.output.path.rstrip('/')}/"
+        files = {path.removeprefix(base) for path in written}
+        for _table, source in pending:
+            if source is not None:
+                self.parts.setdefault(source, set()).update(files)
@@ -0,0 +1,168 @@
+"""
+Signature based dispatch of logger files to candidate parsers.
+
+Parsers declare how their files look through ``Parser.signatures()``, built
+from class attributes they already have (``FIELDS``/``SEPARATOR`` headers,
+``START_WITH``/``HEAD`` prefixes, ``MARKER`` strings, ``HEAD`` patterns).
+``DispatchIndex`` compiles those declarations once into lookup tables, so a
+file's first line or leading bytes map straight to a short list of candidate
+parsers instead of probing every registered parser in turn.
+"""
+
+import csv
+import io
+import re
+from collections import defaultdict
+from enum import Enum
+from typing import NamedTuple
+
+
+class SignatureKind(str, Enum):
+    """Kinds of signature a parser can declare"""
+
+    HEADER = "header"
+    PREFIX = "prefix"
+    MARKER = "marker"
+    PATTERN = "pattern"
+
+
+class Signature(NamedTuple):
+    """A cheap check on the cached file prefix identifying a parser's format.
+
+    - ``HEADER``: the first CSV record, split on ``separator``, equals ``value``
+    - ``PREFIX``: the file starts with ``value``
+    - ``MARKER``: ``value`` appears within the first ``window`` characters
+    - ``PATTERN``: the regex ``value`` matches within the first ``window``
+      characters
+    """
+
+    kind: SignatureKind
+    value: str | tuple
+    separator: str = ","
+    skip_initial_space: bool = True
+    window: int = 0
+    errors: str = "strict"
+
+    @classmethod
+    def header(cls, fields, separator=",", skip_initial_space=True):
+        return cls(
+            SignatureKind.HEADER,
+            tuple(fields),
+            separator=separator,
+            skip_initial_space=skip_initial_space,
+        )
+
+    @classmethod
+    def prefix(cls, text):
+        return cls(SignatureKind.PREFIX, text)
+
+    @classmethod
+    def marker(cls, text, window, errors="strict"):
+        return cls(SignatureKind.MARKER, text, window=window, errors=errors)
+
+    @classmethod
+    def pattern(cls, regex, window):
+        return cls(SignatureKind.PATTERN, regex, window=window)
+
+    def matches(self, parsable) -> bool:
+        try:
+            head = parsable.get_head(errors=self.errors)
+        except UnicodeDecodeError:
+            return False
+
+        if self.kind == SignatureKind.HEADER:
+            return read_header(head, self.separator, self.skip_initial_space) == (
+                self.value
+            )
+        if self.kind == SignatureKind.PREFIX:
+            return head.startswith(self.value)
+        if self.kind == SignatureKind.MARKER:
+            return self.value in head[: self.window]
+        return bool(re.search(self.value, head[: self.window]))
+
+
+def read_header(head: str, separator: str, skip_initial_space: bool):
+    """Return the first CSV record of ``head`` as a tuple, or None if empty."""
+    reader = csv.reader(
+        io.StringIO(head),
+        delimiter=separator,
+        skipinitialspace=skip_initial_space,
+    )
+    try:
+        return tuple(next(reader))
+    except StopIteration:
+        return None
+
+
+class DispatchIndex:
+    """Precompiled mapping from file signatures to candidate parsers.
+
+    Built once from the ``signatures()`` of the registered parsers. Parsers
+    that declare no signature (their ``can_parse`` needs logic that cannot be
+    indexed) are kept in ``fallback`` and probed along with the candidates,
+    at their position in the registry (see ``probe_order``).
+    """
+
+    def __init__(self, parsers):
+        self.parsers = list(parsers)
+        self.fallback = []
+        self._order = {parser: index for index, parser in enumerate(self.parsers)}
+        # (separator, skip_initial_space) -> header tuple -> parsers
+        self._headers = defaultdict(lambda: defaultdict(list))
+        # (errors, prefix length) -> prefix -> parsers
+        self._prefixes = defaultdict(lambda: defaultdict(list))
+        # (signature, parser) pairs for window scans, which cannot be hashed
+        self._scans = []
+
+        for parser in self.parsers:
+            signatures = parser.signatures()
+            if not signatures:
+                self.fallback.append(parser)
+                continue
+
+            for signature in signatures:
+                if signature.kind == SignatureKind.HEADER:
+                    key = (signature.separator, signature.skip_initial_space)
+                    self._headers[key][signature.value].append(parser)
+                elif signature.kind == SignatureKind.PREFIX:
+                    key = (signature.errors, len(signature.value))
+                    self._prefixes[key][signature.value].append(parser)
+                else:
+                    self._scans.append((signature, parser))
+
+    def candidates(self, parsable) -> list:
+        """Return the indexed parsers whose signature matches, in registry order."""
+        matches = set()
+
+        for errors, length in self._prefixes:
+            try:
+                head = parsable.get_head(errors=errors)
+            except UnicodeDecodeError:
+                continue
+            matches.update(self._prefixes[(errors, length)].get(head[:length], ()))
+
+        if self._headers:
+            try:
+                head = parsable.get_head()
+            except UnicodeDecodeError:
+                head = None
+            if head is not None:
+                for (separator, skip_initial_space), headers in self._headers.items():
+                    header = read_header(head, separator, skip_initial_space)
+                    matches.update(headers.get(header, ()))
+
+        for signature, parser in self._scans:
+            if parser not in matches and signature.matches(parsable):
+                matches.add(parser)
+
+        return sorted(matches, key=self._order.__getitem__)
+
+    def probe_order(self, parsable) -> list:
+        """Return the candidates and the fallback parsers, in registry order.
+
+        The first of these accepting the file is the one a probe of every
+        registered parser, in order, would pick.
+        """
+        return sorted(
+            [*self.candidates(parsable), *self.fallback], key=self._order.__getitem__
+        )
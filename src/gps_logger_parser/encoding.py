@@ -0,0 +1,83 @@
+"""
+Tiered text encoding detection for logger files.
+
+Detection runs on a bounded sample of the file and stops at the first tier
+that can decide:
+
+1. a byte order mark
+2. a strict ASCII or UTF-8 validation of the sample
+3. chardet, fed only with the sample
+
+The outcome records which tier decided and how many bytes were examined.
+"""
+
+import codecs
+import os
+from enum import Enum
+from typing import NamedTuple
+
+from chardet import UniversalDetector
+
+ENCODING_SAMPLE_SIZE = int(
+    os.environ.get("ENCODING_SAMPLE_SIZE", default=str(64 * 1024))
+)
+
+# Longest marks first: the UTF-32 LE mark starts with the UTF-16 LE one
+BOMS = (
+    (codecs.BOM_UTF32_LE, "UTF-32"),
+    (codecs.BOM_UTF32_BE, "UTF-32"),
+    (codecs.BOM_UTF8, "UTF-8-SIG"),
+    (codecs.BOM_UTF16_LE, "UTF-16"),
+    (codecs.BOM_UTF16_BE, "UTF-16"),
+)
+
+
+class EncodingTier(str, Enum):
+    """Detection step that decided the encoding of a file"""
+
+    BOM = "bom"
+    ASCII = "ascii"
+    UTF8 = "utf-8"
+    CHARDET = "chardet"
+
+
+class EncodingDetection(NamedTuple):
+    encoding: str | None
+    tier: EncodingTier
+    bytes_read: int
+
+
+def detect_encoding(sample: bytes, complete: bool) -> EncodingDetection:
+    """Detect the encoding of a file from a bounded sample of its first bytes.
+
+    Args:
+        sample: the first bytes of the file
+        complete: True if the sample holds the whole file
+
+    Returns:
+        The detected encoding, the tier that decided it and the sample size
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return EncodingDetection(encoding, EncodingTier.BOM, len(bom))
+
+    if sample.isascii():
+        # Bytes after the sample may still be non-ASCII: UTF-8 is the
+        # strict superset that keeps decoding them when they are valid
+        encoding = "ascii" if complete else "utf-8"
+        return EncodingDetection(encoding, EncodingTier.ASCII, len(sample))
+
+    try:
+        # A multi-byte character may be cut by the end of a partial sample
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=complete)
+    except UnicodeDecodeError:
+        pass
+    else:
+        return EncodingDetection("utf-8", EncodingTier.UTF8, len(sample))
+
+    detector = UniversalDetector()
+    detector.feed(sample)
+    detector.close()
+    return EncodingDetection(
+        detector.result["encoding"], EncodingTier.CHARDET, len(sample)
+    )
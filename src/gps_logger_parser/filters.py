@@ -0,0 +1,130 @@
+"""
+Row filters on harmonized columns.
+
+Filters are written like ``"hdop <= 5"``, ``"satellites_count >= 4"`` or
+``"geometry not null"``, and evaluated with Arrow compute on each batch of
+rows as it is read, so that the rows they reject are not harmonized (see
+``Parser.as_table``).
+"""
+
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .timestamps import as_utc
+
+OPERATORS = {
+    "==": pc.equal,
+    "!=": pc.not_equal,
+    "<": pc.less,
+    "<=": pc.less_equal,
+    ">": pc.greater,
+    ">=": pc.greater_equal,
+}
+# Checks for missing values, instead of a comparison
+NULL_CHECKS = {"null": pc.is_null, "not null": pc.is_valid}
+
+_COMPARISON = re.compile(
+    r"^\s*(?P<column>\w+)\s*(?P<operator>==|!=|<=|>=|=|<|>)\s*(?P<value>.+?)\s*$"
+)
+_NULL_CHECK = re.compile(
+    r"^\s*(?P<column>\w+)\s+(?:is\s+)?(?P<negation>not\s+)?null\s*$", re.IGNORECASE
+)
+
+
+def _literal(text: str):
+    """The value of a comparison: quoted text, else a number, else the text."""
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+class Filter(NamedTuple):
+    """Condition on a harmonized column that rows must meet
+
+    - ``operator``: one of ``OPERATORS``, or ``"null"``/``"not null"``
+    - ``value``: what the column is compared with, None for null checks;
+      text is cast to the type of the column (e.g. timestamps)
+    """
+
+    column: str
+    operator: str
+    value: object = None
+
+    @classmethod
+    def parse(cls, text: str) -> "Filter":
+        """Read a filter from text, e.g. ``"hdop <= 5"`` or ``"id is null"``."""
+        match = _NULL_CHECK.match(text)
+        if match:
+            operator = "not null" if match["negation"] else "null"
+            return cls(match["column"], operator)
+        match = _COMPARISON.match(text)
+        if match:
+            operator = "==" if match["operator"] == "=" else match["operator"]
+            return cls(match["column"], operator, _literal(match["value"]))
+        raise ValueError(
+            f"Invalid filter {text!r}, expected e.g. 'hdop <= 5' or 'geometry not null'"
+        )
+
+    def __str__(self):
+        if self.operator in NULL_CHECKS:
+            return f"{self.column} {self.operator}"
+        value = f"'{self.value}'" if isinstance(self.value, str) else self.value
+        return f"{self.column} {self.operator} {value}"
+
+    def evaluate(self, values) -> pa.Array:
+        """Boolean mask of the values meeting the condition, null if unknown."""
+        if self.operator in NULL_CHECKS:
+            return NULL_CHECKS[self.operator](values)
+        scalar = pa.scalar(self.value)
+        try:
+            if pa.types.is_timestamp(values.type) and isinstance(self.value, str):
+                # Like time ranges, timestamps without a timezone are UTC
+                timestamp = as_utc(self.value)
+                unit = pa.timestamp(values.type.unit)
+                scalar = pa.scalar(timestamp, unit).cast(values.type)
+            elif pa.types.is_string(scalar.type) and not (
+                pa.types.is_string(values.type)
+                or pa.types.is_large_string(values.type)
+                or pa.types.is_null(values.type)
+            ):
+                scalar = scalar.cast(values.type)
+            return OPERATORS[self.operator](values, scalar)
+        except (ValueError, pa.ArrowNotImplementedError) as error:
+            raise ValueError(
+                f"Filter {self}: cannot compare {values.type} values "
+                f"with {self.value!r}"
+            ) from error
+
+
+def parse_filters(filters) -> list[Filter]:
+    """Filters from their text, ``Filter`` tuples, or a single one of these."""
+    if filters is None:
+        return []
+    if isinstance(filters, str | Filter):
+        filters = [filters]
+    return [
+        Filter(*condition) if isinstance(condition, tuple) else Filter.parse(condition)
+        for condition in filters
+    ]
+
+
+def filter_mask(table: pa.Table, filters: list[Filter]) -> pa.Array:
+    """Mask of the rows of a table meeting every filter.
+
+    Rows a comparison cannot be decided for, e.g. ``hdop <= 5`` on a missing
+    ``hdop``, do not meet it.
+    """
+    keep = pa.array(np.ones(len(table), dtype=bool))
+    for condition in filters:
+        meets = condition.evaluate(table.column(condition.column))
+        keep = pc.and_(keep, pc.fill_null(meets, False))
+    return keep
@@ -1,9 +1,6 @@
-import csv
-
 import pandas as pd
-import pyarrow.csv as pacsv
 
-from ..parser_base import CSVParser, Parsable
+from ..parser_base import CSVParser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
 
@@ -17,6 +14,7 @@ def skip(row):
 
 class AXYTREKParser(GPSHarmonizationMixin, CSVParser):
     DATATYPE = "gps_axytrek"
+    TIME_SORTED = True
     FIELDS = [
         "TagID",
         "Date",
@@ -58,41 +56,25 @@ class AXYTREKParser(GPSHarmonizationMixin, CSVParser):
         GPSHarmonizedColumn.TRIP_NR: None,
     }
 
-    def harmonize_data(self, data):
+    DERIVED_FROM = ("Date", "Time")
+
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
         data["timestamp"] = pd.to_datetime(
             data["Date"] + " " + data["Time"],
             errors="raise",
             format="%d.%m.%Y %H:%M:%S.%f",
         )
-        return super().harmonize_data(data)
-
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
+        return data
 
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            reader = csv.reader(
-                stream,
-                delimiter=self.SEPARATOR,
-                skipinitialspace=self.SKIP_INITIAL_SPACE,
-            )
-            header = next(reader)
-            if header != self.FIELDS:
-                self._raise_not_supported(
-                    f"Stream have a header different than expected, "
-                    f"{header} != {self.FIELDS}"
-                )
-
-        parse_options = pacsv.ParseOptions(
-            delimiter=self.SEPARATOR, invalid_row_handler=skip
-        )
-        with self.file.get_stream(binary=True) as binary_stream:
-            self.data = pacsv.read_csv(
-                binary_stream, parse_options=parse_options
-            ).to_pandas()
+    def _csv_options(self):
+        # The header was checked by can_parse, the rows are read with pyarrow
+        return {
+            "separator": self.SEPARATOR,
+            "encoding": self.file.encoding,
+            "invalid_row_handler": skip,
+            "fallback": False,
+        }
 
 
 PARSERS = [
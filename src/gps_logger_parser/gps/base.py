@@ -1,5 +1,3 @@
-import pandas as pd
-
 from ..parser_base import CSVParser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
@@ -7,6 +5,7 @@ from .mixin import GPSHarmonizationMixin
 
 class GPSParser(GPSHarmonizationMixin, CSVParser):
     DATATYPE = "gps"
+    DERIVED_FROM = ("UTC_date", "UTC_time")
     FIELDS = [
         "device_id",
         "UTC_datetime",
@@ -54,12 +53,12 @@ class GPSParser(GPSHarmonizationMixin, CSVParser):
         GPSHarmonizedColumn.TRIP_NR: None,
     }
 
-    def harmonize_data(self, data):
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
-        data["timestamp"] = pd.to_datetime(
-            data["UTC_date"] + " " + data["UTC_time"], errors="raise"
+        data["timestamp"] = self._parse_timestamps(
+            data["UTC_date"] + " " + data["UTC_time"], "timestamp"
         )
-        return super().harmonize_data(data)
+        return data
 
 
 PARSERS = [
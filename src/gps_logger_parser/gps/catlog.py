@@ -1,10 +1,5 @@
-import csv
-import io
-
-import pandas as pd
-
-from ..helpers import stream_starts_with
-from ..parser_base import CSVParser, Parsable
+from ..dispatch import Signature
+from ..parser_base import CSVParser, Parsable, Parser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
 
@@ -33,6 +28,7 @@ class GPSCatTrackParser(GPSHarmonizationMixin, CSVParser):
         "SNR",
         "tbd",
     ]
+    DERIVED_FROM = ("Date", "Time")
 
     MAPPINGS = {
         GPSHarmonizedColumn.ID: "",
@@ -55,64 +51,39 @@ class GPSCatTrackParser(GPSHarmonizationMixin, CSVParser):
     }
 
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file starts with the expected START_WITH prefix."""
-        if not cls.START_WITH:
-            return True
-        try:
-            with parsable.get_stream(binary=False) as stream:
-                return stream_starts_with(stream, cls.START_WITH)
-        except (UnicodeDecodeError, OSError):
+    def signatures(cls):
+        """The file must start with the expected START_WITH prefix."""
+        return [Signature.prefix(cls.START_WITH)]
+
+    @classmethod
+    def can_parse(cls, parsable: Parsable):
+        """Check START_WITH and the header row that follows the DIVIDER."""
+        if not Parser.can_parse.__func__(cls, parsable):
             return False
 
-    def harmonize_data(self, data):
+        # The row after the header row is not read
+        context = cls._divider_context(
+            parsable, skip_rows=1, skipinitialspace=cls.SKIP_INITIAL_SPACE
+        )
+        if not context or context.header != cls.FIELDS:
+            return False
+        return context
+
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
-        data["timestamp"] = pd.to_datetime(
-            data["Date"] + " " + data["Time"], errors="raise"
+        data["timestamp"] = self._parse_timestamps(
+            data["Date"] + " " + data["Time"], "timestamp"
         )
-        return super().harmonize_data(data)
-
-    def __init__(self, parsable: Parsable):
-        self.file = parsable
-        self.data = []
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if self.START_WITH and not stream_starts_with(stream, self.START_WITH):
-                self._raise_not_supported("Stream must start with Name:CatLog")
-
-            if self.DIVIDER:
-                full_content = stream.read()
-                if self.DIVIDER not in full_content:
-                    self._raise_not_supported(
-                        f"Stream doesn't have the divider {self.DIVIDER}"
-                    )
-                _intro, data = full_content.split(self.DIVIDER, 1)
-                content = io.StringIO(data)
-            else:
-                content = stream
-
-            reader = csv.reader(
-                content,
-                delimiter=self.SEPARATOR,
-                skipinitialspace=self.SKIP_INITIAL_SPACE,
-            )
-            header = next(reader)
-            if header != self.FIELDS:
-                self._raise_not_supported(
-                    f"Stream have fields different than expected, "
-                    f"{header} != {self.FIELDS}"
-                )
-
-            self.data = pd.read_csv(
-                content,
-                header=0,
-                names=self.FIELDS,
-                sep=self.SEPARATOR,
-                index_col=False,
-            )
+        return data
+
+    def _csv_options(self):
+        # Rows are read from the data offset, past the header row. Rows with
+        # fewer fields than FIELDS are rejected instead of padded, they are
+        # those of GPSCatTrack3
+        return {**super()._csv_options(), "skip_rows": 0, "fallback": False}
+
+    def _csv_range(self):
+        return self.context.data_offset, None
 
 
 class GPSCatTrack2(GPSCatTrackParser):
@@ -190,46 +161,8 @@ class GPSCatTrack3(GPSCatTrackParser):
         GPSHarmonizedColumn.TRIP_NR: None,
     }
 
-    def __init__(self, parsable: Parsable):
-        self.file = parsable
-        self.data = []
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if self.START_WITH and not stream_starts_with(stream, self.START_WITH):
-                self._raise_not_supported("Stream must start with Name:CatLog")
-
-            if self.DIVIDER:
-                full_content = stream.read()
-                if self.DIVIDER not in full_content:
-                    self._raise_not_supported(
-                        f"Stream doesn't have the divider {self.DIVIDER}"
-                    )
-                _intro, data = full_content.split(self.DIVIDER, 1)
-                content = io.StringIO(data)
-            else:
-                content = stream
-
-            reader = csv.reader(
-                content,
-                delimiter=self.SEPARATOR,
-                skipinitialspace=self.SKIP_INITIAL_SPACE,
-            )
-            header = next(reader)
-            if header != self.FIELDS:
-                self._raise_not_supported(
-                    f"Stream have fields different than expected, "
-                    f"{header} != {self.FIELDS}"
-                )
-
-            # Ensure that the headers are present, then ignore them
-            names = self.FIELDS[:-2]
-
-            self.data = pd.read_csv(
-                content, header=0, names=names, sep=self.SEPARATOR, index_col=False
-            )
+    def _csv_options(self):
+        return {**super()._csv_options(), "names": self.FIELDS[:-2]}
 
 
 PARSERS = [
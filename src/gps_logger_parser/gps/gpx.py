@@ -1,11 +1,109 @@
-import gpxpy
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from ..helpers import stream_chunk_contains
-from ..parser_base import Parser
+from ..dispatch import Signature
+from ..parser_base import DetectionContext, Parsable, Parser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
 
+# Column of each child element of a track point
+POINT_ELEMENTS = {
+    "ele": "elevation",
+    "time": "time",
+    "sat": "satellites",
+    "hdop": "horizontal_dilution",
+    "course": "course",
+    "speed": "speed",
+    "type": "type",
+    "pdop": "position_dilution",
+}
+# Only part of the track points of GPX 1.0, in extensions with GPX 1.1
+GPX_10_ELEMENTS = ["course", "speed"]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def iter_track_points(
+    stream, batch_size: int | None = None, gpx_10: bool = True
+) -> Iterator[pd.DataFrame]:
+    """Yield the track points of a GPX document as DataFrames.
+
+    The document is read incrementally: the attributes and child elements of
+    each ``trkpt`` are appended to column lists and the element is dropped,
+    so only a batch of points is held in memory, never the document tree.
+
+    Args:
+        stream: binary stream of the GPX document
+        batch_size: points of each DataFrame, None for a single one
+        gpx_10: read ``course`` and ``speed``, which GPX 1.1 moved to
+            extensions
+
+    Yields:
+        DataFrames with the ``GPXParser.FIELDS`` columns
+    """
+    elements = dict(POINT_ELEMENTS)
+    if not gpx_10:
+        for name in GPX_10_ELEMENTS:
+            elements.pop(name)
+
+    columns = {field: [] for field in GPXParser.FIELDS}
+    names = {}
+    segment = None
+    # ElementTree does not resolve external entities, and the expat bundled
+    # with Python bounds entity expansion
+    for event, element in ET.iterparse(stream, events=("start", "end")):  # noqa: S314
+        name = names.get(element.tag)
+        if name is None:
+            name = names[element.tag] = _local_name(element.tag)
+
+        if event == "start":
+            if name == "trkseg":
+                segment = element
+            continue
+        if name != "trkpt":
+            continue
+
+        columns["latitude"].append(element.get("lat"))
+        columns["longitude"].append(element.get("lon"))
+        values = {}
+        for child in element:
+            column = elements.get(names.get(child.tag) or _local_name(child.tag))
+            if column is not None and child.text and child.text.strip():
+                values[column] = child.text.strip()
+        for column in POINT_ELEMENTS.values():
+            columns[column].append(values.get(column))
+
+        # Points are not kept in the tree once read
+        if segment is not None:
+            segment.remove(element)
+        if batch_size is not None and len(columns["latitude"]) == batch_size:
+            yield _track_points(columns)
+            columns = {field: [] for field in GPXParser.FIELDS}
+
+    if columns["latitude"] or batch_size is None:
+        yield _track_points(columns)
+
+
+def _track_points(columns: dict) -> pd.DataFrame:
+    data = {}
+    for field, values in columns.items():
+        if field == "time":
+            data[field] = pd.to_datetime(
+                pd.Series(values, dtype=object), utc=True, format="ISO8601"
+            )
+        elif field == "type":
+            data[field] = pd.Series(values, dtype=object)
+        else:
+            array = pc.cast(pa.array(values, pa.string()), pa.float64())
+            data[field] = array.to_numpy(zero_copy_only=False)
+    return pd.DataFrame(data)
+
 
 class GPXParser(GPSHarmonizationMixin, Parser):
     DATATYPE = "gps_gpx"
@@ -42,36 +140,52 @@ class GPXParser(GPSHarmonizationMixin, Parser):
         GPSHarmonizedColumn.TRIP_NR: None,
     }
 
+    MARKER = "<?xml"
+    MARKER_WINDOW = 30
+
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file starts with <?xml within the first 30 bytes."""
+    def signatures(cls):
+        """The file must contain MARKER within the first MARKER_WINDOW bytes."""
+        return [Signature.marker(cls.MARKER, cls.MARKER_WINDOW)]
+
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self.version = self._root_version()
+        # Larger files are streamed by iter_data, or read on first use
+        if self.file.head_complete:
+            self.data = self.read_data()
+
+    def _root_version(self):
+        """Check the root element of the cached prefix, returning its version."""
+        parser = ET.XMLPullParser(events=("start",))
         try:
-            with parsable.get_stream(binary=False) as stream:
-                if not stream.seekable():
-                    return False
-                return stream_chunk_contains(stream, 30, "<?xml")
-        except (UnicodeDecodeError, OSError):
-            return False
-
-    def harmonize_data(self, data):
-        data["time"] = pd.to_datetime(data["time"], utc=True)
-        return super().harmonize_data(data)
-
-    def __init__(self, stream):
-        super().__init__(stream)
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_chunk_contains(stream, 30, "<?xml"):
-                self._raise_not_supported("Stream does not start with <?xml")
-
-            gpx = gpxpy.parse(stream)
-            points = []
-            for track in gpx.tracks:
-                for segment in track.segments:
-                    for point in segment.points:
-                        points.append(tuple(getattr(point, f) for f in self.FIELDS))
-
-            self.data = pd.DataFrame(points, columns=self.FIELDS)
+            parser.feed(self.file.head_bytes)
+            root = next((element for _event, element in parser.read_events()), None)
+        except ET.ParseError as error:
+            self._raise_not_supported(f"Invalid XML: {error}")
+        if root is None or _local_name(root.tag) != "gpx":
+            self._raise_not_supported("The root element is not gpx")
+        return root.get("version")
+
+    def _iter_track_points(self, batch_size):
+        with self.file.get_stream(binary=True) as stream:
+            yield from iter_track_points(
+                stream, batch_size, gpx_10=self.version != "1.1"
+            )
+
+    def read_data(self, include_columns=None):
+        [data] = self._iter_track_points(batch_size=None)
+        return data
+
+    def iter_data(
+        self, batch_size: int, include_columns=None
+    ) -> Iterator[pd.DataFrame]:
+        if self._data is not None:
+            yield from super().iter_data(batch_size, include_columns)
+            return
+        yield from self._iter_track_points(batch_size)
@@ -1,4 +1,5 @@
 import pandas as pd
+import pyarrow as pa
 
 from ..parser_base import CSVParser
 from .columns import GPSHarmonizedColumn
@@ -8,6 +9,7 @@ from .mixin import GPSHarmonizationMixin
 class GPSUHo11(GPSHarmonizationMixin, CSVParser):
     DATATYPE = "gps_ho11"
     SEPARATOR = ";"
+    DECIMAL_POINT = ","
     FIELDS = [
         "ID",
         "Date",
@@ -45,29 +47,25 @@ class GPSUHo11(GPSHarmonizationMixin, CSVParser):
         GPSHarmonizedColumn.TRIP_NR: "Tripnr",
     }
 
-    def harmonize_data(self, data):
+    DERIVED_FROM = ("Date", "Time")
+
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
         data["timestamp"] = pd.to_datetime(
             data["Date"] + " " + data["Time"],
             errors="raise",
             format="%d.%m.%Y %H:%M:%S",
         )
+        return data
 
-        for column in [
-            "Latitude",
-            "Longitude",
-            "Altitude",
-            "Speed",
-            "Course",
-            "Distance",
-        ]:
-            try:
-                data[column] = data[column].str.replace(",", ".", regex=False)
-                data[column] = pd.to_numeric(data[column], errors="coerce")
-            except AttributeError:
-                pass
-
-        return super().harmonize_data(data)
+    def _csv_options(self):
+        return {
+            **super()._csv_options(),
+            # Decimal numbers even when the first rows only hold integers
+            "column_types": dict.fromkeys(
+                ["Latitude", "Longitude", "Altitude", "Distance"], pa.float64()
+            ),
+        }
 
 
 PARSERS = [
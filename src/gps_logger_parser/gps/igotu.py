@@ -1,5 +1,3 @@
-import pandas as pd
-
 from ..parser_base import CSVParser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
@@ -11,6 +9,7 @@ class IGotU_GT_Parser(GPSHarmonizationMixin, CSVParser):
     """
 
     DATATYPE = "gps_igotugl"
+    TIMESTAMP_FORMATS = ("%m/%d/%Y %H:%M:%S", "%Y/%m/%d %H:%M:%S")
     FIELDS = [
         "Date",
         "Time",
@@ -23,6 +22,7 @@ class IGotU_GT_Parser(GPSHarmonizationMixin, CSVParser):
         "Distance",
         "Essential",
     ]
+    DERIVED_FROM = ("Date", "Time")
 
     MAPPINGS = {
         GPSHarmonizedColumn.ID: None,
@@ -44,23 +44,13 @@ class IGotU_GT_Parser(GPSHarmonizationMixin, CSVParser):
         GPSHarmonizedColumn.TRIP_NR: None,
     }
 
-    def harmonize_data(self, data):
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
-        # Try M/D/Y format first (most common), fall back to Y/M/D
-        combined = data["Date"] + " " + data["Time"]
-        data["timestamp"] = pd.to_datetime(
-            combined,
-            format="%m/%d/%Y %H:%M:%S",
-            errors="coerce",
+        # M/D/Y (most common) or Y/M/D, sniffed on a sample of the rows
+        data["timestamp"] = self._parse_timestamps(
+            data["Date"] + " " + data["Time"], "timestamp", errors="coerce"
         )
-        missing_mask = data["timestamp"].isna()
-        if missing_mask.any():
-            data.loc[missing_mask, "timestamp"] = pd.to_datetime(
-                combined[missing_mask],
-                format="%Y/%m/%d %H:%M:%S",
-                errors="coerce",
-            )
-        return super().harmonize_data(data)
+        return data
 
 
 class IGotU_GT_TabSeparatedParser(IGotU_GT_Parser):
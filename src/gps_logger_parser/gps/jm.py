@@ -1,26 +1,70 @@
 import csv
-import io
 import re
 
 import pandas as pd
 
-from ..helpers import stream_chunk_contains
-from ..parser_base import Parsable, Parser
+from ..coordinates import to_decimal_degrees
+from ..dispatch import Signature
+from ..helpers import iter_matches
+from ..parser_base import DetectionContext, Parsable, Parser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
 
+# A line break of a text stream (universal newlines)
+NEWLINE = rb"(?:\r\n|\r(?!\n)|\n)"
 
-def signed(val, direction):
-    val = float(val)
-    if direction in ("S", "W"):
-        return -val
-    return val
+
+class DataSectionMixin:
+    """Read the rows of a 2Jm log from the byte range of its data section.
+
+    The section is scanned for in the file instead of read into a string,
+    and its lines are decoded and passed through ``_fix_content`` a block at
+    a time as they are read, so large logs are streamed.
+    """
+
+    def _fix_content(self, data: str):
+        return data
+
+    def _check_header(self):
+        """The first row of the data section must have as many fields as FIELDS."""
+        start, _end = self.data_range
+        with self.file.get_stream(binary=True) as stream:
+            stream.seek(start)
+            line = self._fix_content(self._decode(stream.readline()))
+
+        reader = csv.reader([line], delimiter=self.SEPARATOR, skipinitialspace=True)
+        header = next(reader, [])
+        if len(header) != len(self.FIELDS):
+            self._raise_not_supported(
+                f"Stream have fields different than expected, "
+                f"{len(header)} != {len(self.FIELDS)}"
+            )
+
+    def _decode(self, block: bytes) -> str:
+        # Decoded like a text stream opened with errors="backslashreplace"
+        text = block.decode(self.file.encoding or "utf-8", "backslashreplace")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def _csv_options(self):
+        # The row checked as a header is skipped, and the one after it as well
+        return {
+            "names": self.FIELDS,
+            "separator": self.SEPARATOR,
+            "skip_rows": 2,
+            "encoding": "utf-8",
+        }
+
+    def _csv_range(self):
+        return self.data_range
+
+    def _csv_transform(self):
+        return lambda block: self._fix_content(self._decode(block)).encode()
 
 
 # Earth&Ocean mGPS-2
 
 
-class GPS2JMParser7_5(GPSHarmonizationMixin, Parser):
+class GPS2JMParser7_5(DataSectionMixin, GPSHarmonizationMixin, Parser):
     """
     Parser for 2Jm format v 7.5
     """
@@ -28,10 +72,14 @@ class GPS2JMParser7_5(GPSHarmonizationMixin, Parser):
     DATATYPE = "gps_2jm"
     VERSION = "v7.5"
     SEPARATOR = " "
+    MARKER = "2JmGPS-LOG"
+    MARKER_WINDOW = 30
     ENDINGS = [
         "[EOF]",
         "---- End of data ----",
     ]
+    # Blank line between the sections of the log
+    SECTION_BREAK = re.compile(NEWLINE * 2)
 
     FIELDS = [
         "date",
@@ -48,11 +96,21 @@ class GPS2JMParser7_5(GPSHarmonizationMixin, Parser):
         "altitude",
         "distance",
     ]
+    DERIVED_FROM = (
+        "date",
+        "time",
+        "latitude",
+        "latitude_decimal",
+        "n",
+        "longitude",
+        "longitude_decimal",
+        "e",
+    )
     MAPPINGS = {
         GPSHarmonizedColumn.ID: "",
         GPSHarmonizedColumn.TIMESTAMP: None,
-        GPSHarmonizedColumn.LATITUDE: None,
-        GPSHarmonizedColumn.LONGITUDE: None,
+        GPSHarmonizedColumn.LATITUDE: "signed_latitude",
+        GPSHarmonizedColumn.LONGITUDE: "signed_longitude",
         GPSHarmonizedColumn.ALTITUDE: "altitude",
         GPSHarmonizedColumn.SPEED_KM_H: "speed",
         GPSHarmonizedColumn.TYPE: None,
@@ -69,124 +127,94 @@ class GPS2JMParser7_5(GPSHarmonizationMixin, Parser):
     }
 
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file contains the 2JmGPS-LOG marker."""
-        try:
-            with parsable.get_stream(binary=False, errors="backslashreplace") as stream:
-                return stream_chunk_contains(stream, 30, "2JmGPS-LOG")
-        except (UnicodeDecodeError, OSError):
-            return False
-
-    def harmonize_data(self, data):
-        # Call parent harmonization — applies MAPPINGS, enforces GPS schema,
-        # creates geometry, and drops raw source columns
-        result = super().harmonize_data(data)
-
-        # Convert coordinates from degrees + decimal minutes to decimal degrees
-        # before calling super(), so the harmonized lat/lon are in decimal degrees.
-        # Latitude: degrees + (minutes / 60), with direction sign
-        lat_decimal_degrees = (
-            pd.to_numeric(data["latitude"], errors="coerce")
-            + pd.to_numeric(data["latitude_decimal"], errors="coerce") / 60
-        )
-        result["latitude"] = [
-            signed(lat, direction)
-            for lat, direction in zip(lat_decimal_degrees, data["n"], strict=False)
+    def signatures(cls):
+        """The file must contain MARKER within the first MARKER_WINDOW bytes."""
+        return [
+            Signature.marker(cls.MARKER, cls.MARKER_WINDOW, errors="backslashreplace")
         ]
 
-        # Longitude: degrees + (minutes / 60), with direction sign
-        lon_decimal_degrees = (
-            pd.to_numeric(data["longitude"], errors="coerce")
-            + pd.to_numeric(data["longitude_decimal"], errors="coerce") / 60
+    def prepare_data(self, data):
+        # Convert coordinates from degrees + decimal minutes to decimal degrees,
+        # with the direction sign, so the harmonized lat/lon are in decimal degrees
+        data["signed_latitude"] = to_decimal_degrees(
+            data["latitude"], data["latitude_decimal"], data["n"]
+        )
+        data["signed_longitude"] = to_decimal_degrees(
+            data["longitude"], data["longitude_decimal"], data["e"]
         )
-        result["longitude"] = [
-            signed(lon, direction)
-            for lon, direction in zip(lon_decimal_degrees, data["e"], strict=False)
-        ]
 
-        # Build timestamp column before calling super()
         if hasattr(self, "start_date") and self.start_date:
-            result["timestamp"] = pd.to_datetime(
+            data["timestamp"] = pd.to_datetime(
                 self.start_date + " " + data["time"],
                 format="%d.%m.%Y %H:%M:%S",
                 errors="coerce",
             )
         else:
             # Fallback if start_date not available
-            result["timestamp"] = pd.to_datetime(
+            data["timestamp"] = pd.to_datetime(
                 data["date"].astype(str) + " " + data["time"],
                 format="%d %H:%M:%S",
                 errors="coerce",
             )
-
-        # Recreate geometry column now that lat/lon are finalized
-        result = self._create_geometry_column(result)
-
-        return result
-
-    def _fix_content(self, data):
         return data
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
-
-        with self.file.get_stream(binary=False, errors="backslashreplace") as stream:
-            # TODO: check the first byte instead of the whole stream chunk
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_chunk_contains(stream, 30, "2JmGPS-LOG"):
-                self._raise_not_supported("Stream must start with 2JmGPS-LOG")
-
-            full_content = stream.read()
-            groups = full_content.split("\n\n")
-            head = groups.pop(0)
-
-            if self.VERSION not in head:
-                self._raise_not_supported("Version not supported")
-
-            # Extract STARTTIME date from any of the header groups
-            self.start_date = None
-            for group in groups:
-                for line in group.split("\n"):
-                    if "STARTTIME" in line:
-                        # Format: STARTTIME .......: 29.06.2013 20:00:00
-                        parts = line.split(":")
-                        if len(parts) >= 2:
-                            datetime_str = parts[1].strip()
-                            # Extract just the date part (DD.MM.YYYY)
-                            self.start_date = datetime_str.split()[0]
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+
+        head = self.file.head_bytes
+        first_break = self.SECTION_BREAK.search(head)
+        head_end = first_break.start() if first_break else len(head)
+        if self.VERSION not in self._decode(head[:head_end]):
+            self._raise_not_supported("Version not supported")
+
+        self.start_date = self._start_date()
+        self.data_range = self._data_range(first_break.end() if first_break else None)
+        self._check_header()
+        self._read_rows()
+
+    def _start_date(self):
+        """Date of the STARTTIME line of the sections following the head."""
+        _head, _break, sections = self.file.get_head("backslashreplace").partition(
+            "\n\n"
+        )
+        for line in sections.split("\n"):
+            if "STARTTIME" in line:
+                # Format: STARTTIME .......: 29.06.2013 20:00:00
+                parts = line.split(":")
+                if len(parts) >= 2:
+                    datetime_str = parts[1].strip()
+                    # Extract just the date part (DD.MM.YYYY)
+                    return datetime_str.split()[0]
+                return None
+        return None
+
+    def _data_range(self, start):
+        """Byte range of the last section before an ENDINGS one (or the end)."""
+        if start is None:
+            self._raise_not_supported("No data section")
+
+        endings = [ending.encode() for ending in self.ENDINGS]
+        longest = max(len(ending) for ending in endings)
+        data_range = None
+        with self.file.get_view() as view:
+            breaks = list(iter_matches(view, self.SECTION_BREAK, start))
+            starts = [start] + [end for _start, end in breaks]
+            ends = [start for start, _end in breaks] + [None]
+            for section_start, section_end in zip(starts, ends, strict=True):
+                if section_end is not None and section_end - section_start <= longest:
+                    view.seek(section_start)
+                    if view.read(section_end - section_start) in endings:
                         break
-                if self.start_date:
-                    break
-
-            data = None
-            for group in groups:
-                if group in self.ENDINGS:
-                    break
-                data = group
+                data_range = section_start, section_end
 
-            data = self._fix_content(data)
-
-            content = io.StringIO(data)
-
-            reader = csv.reader(
-                content, delimiter=self.SEPARATOR, skipinitialspace=True
-            )
-            header = next(reader)
-            if len(header) != len(self.FIELDS):
-                self._raise_not_supported(
-                    f"Stream have fields different than expected, "
-                    f"{len(header)} != {len(self.FIELDS)}"
-                )
-
-            self.data = pd.read_csv(
-                content,
-                header=0,
-                names=self.FIELDS,
-                sep=self.SEPARATOR,
-                index_col=False,
-            )
+        if data_range is None:
+            self._raise_not_supported("No data section")
+        return data_range
 
 
 regex = re.compile(r"\s{2,10}", re.MULTILINE)
@@ -212,8 +240,8 @@ class GPS2JMParser8(GPS2JMParser7_5):
     MAPPINGS = {
         GPSHarmonizedColumn.ID: "",
         GPSHarmonizedColumn.TIMESTAMP: None,
-        GPSHarmonizedColumn.LATITUDE: None,
-        GPSHarmonizedColumn.LONGITUDE: None,
+        GPSHarmonizedColumn.LATITUDE: "signed_latitude",
+        GPSHarmonizedColumn.LONGITUDE: "signed_longitude",
         GPSHarmonizedColumn.ALTITUDE: "altitude",
         GPSHarmonizedColumn.SPEED_KM_H: "speed",
         GPSHarmonizedColumn.TYPE: None,
@@ -238,7 +266,7 @@ class GPS2JMParser8(GPS2JMParser7_5):
         return regex.sub(" ", data)
 
 
-class GPS2JMParser8Alternative(GPSHarmonizationMixin, Parser):
+class GPS2JMParser8Alternative(DataSectionMixin, GPSHarmonizationMixin, Parser):
     """
     Parser for 2Jm format v8
 
@@ -261,8 +289,20 @@ class GPS2JMParser8Alternative(GPSHarmonizationMixin, Parser):
         "altitude_m",
         "direction_deg",
     ]
+    DERIVED_FROM = (
+        "UTC_date",
+        "UTC_time",
+        "Latitude",
+        "Latitude_dir",
+        "Longitude",
+        "Longitude_dir",
+    )
     VERSION = "v8"
     SEPARATOR = " "
+    MARKER = "************* GPS DATA *************"
+    MARKER_WINDOW = 50
+    # Blank lines between the header and the data
+    SECTION_BREAK = re.compile(NEWLINE * 4)
 
     # TODO: understand the fields first
     MAPPINGS = {
@@ -286,28 +326,20 @@ class GPS2JMParser8Alternative(GPSHarmonizationMixin, Parser):
     }
 
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file contains the GPS DATA marker."""
-        try:
-            with parsable.get_stream(binary=False, errors="backslashreplace") as stream:
-                return stream_chunk_contains(
-                    stream, 50, "************* GPS DATA *************"
-                )
-        except (UnicodeDecodeError, OSError):
-            return False
-
-    def harmonize_data(self, data):
-        # Call parent harmonization — applies MAPPINGS, enforces GPS schema,
-        # creates geometry, and drops raw source columns
-        result = super().harmonize_data(data)
+    def signatures(cls):
+        """The file must contain MARKER within the first MARKER_WINDOW bytes."""
+        return [
+            Signature.marker(cls.MARKER, cls.MARKER_WINDOW, errors="backslashreplace")
+        ]
 
+    def prepare_data(self, data):
         # Build timestamp from raw UTC_date and UTC_time columns
-        result["timestamp"] = pd.to_datetime(
+        data["timestamp"] = pd.to_datetime(
             data["UTC_date"] + " " + data["UTC_time"],
             format="%d.%m.%Y %H:%M:%S",
             errors="coerce",
         )
-        return result
+        return data
 
     def _fix_content(self, data: str):
         """
@@ -317,54 +349,31 @@ class GPS2JMParser8Alternative(GPSHarmonizationMixin, Parser):
         """
         return regex.sub(" ", data)
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
-
-        with self.file.get_stream(binary=False, errors="backslashreplace") as stream:
-            # TODO: check the first byte instead of the whole stream chunk
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_chunk_contains(
-                stream, 50, "************* GPS DATA *************"
-            ):
-                self._raise_not_supported(
-                    "Stream must start with ************* GPS DATA *************"
-                )
-
-            head, data = stream.read().split("\n\n\n\n")
-
-            data = self._fix_content(data)
-
-            content = io.StringIO(data)
-
-            reader = csv.reader(
-                content, delimiter=self.SEPARATOR, skipinitialspace=True
-            )
-            header = next(reader)
-            if len(header) != len(self.FIELDS):
-                self._raise_not_supported(
-                    f"Stream have fields different than expected, "
-                    f"{len(header)} != {len(self.FIELDS)}"
-                )
-
-            df = pd.read_csv(
-                content,
-                header=0,
-                names=self.FIELDS,
-                sep=self.SEPARATOR,
-                index_col=False,
-            )
-
-            df["Latitude"] = [
-                signed(v, d)
-                for v, d in zip(df["Latitude"], df["Latitude_dir"], strict=False)
-            ]
-            df["Longitude"] = [
-                signed(v, d)
-                for v, d in zip(df["Longitude"], df["Longitude_dir"], strict=False)
-            ]
-            self.data = df
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+
+        with self.file.get_view() as view:
+            data_break = next(iter_matches(view, self.SECTION_BREAK), None)
+        if data_break is None:
+            self._raise_not_supported("No data section")
+
+        self.data_range = data_break[1], None
+        self._check_header()
+        self._read_rows()
+
+    def _finish_data(self, data, first_row):
+        data["Latitude"] = to_decimal_degrees(
+            data["Latitude"], hemispheres=data["Latitude_dir"]
+        )
+        data["Longitude"] = to_decimal_degrees(
+            data["Longitude"], hemispheres=data["Longitude_dir"]
+        )
+        return data
 
 
 class GPS2JMParser8Alternative2(GPS2JMParser8Alternative):
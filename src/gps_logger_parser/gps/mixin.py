@@ -8,9 +8,12 @@ GPS_HARMONIZED_COLUMN_TYPES specification.
 
 import geoarrow.pyarrow as ga
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from .columns import GPS_HARMONIZED_COLUMN_TYPES
+from ..parser_base import MAX_SPEED
+from ..quality import Fix, QCFlag, speed_outliers, valid_fixes, valid_positions
+from .columns import GPS_HARMONIZED_COLUMN_TYPES, GPSHarmonizedColumn
 
 
 class GPSHarmonizationMixin:
@@ -21,68 +24,166 @@ class GPSHarmonizationMixin:
     according to the GPS_HARMONIZED_COLUMN_TYPES specification.
     """
 
-    def harmonize_data(self, data):
+    # Coordinate reference system of the geometry column
+    GEOMETRY_CRS = "EPSG:4326"
+    # Highest plausible speed of the fixes, in meters per second
+    MAX_SPEED = MAX_SPEED
+    QUALITY_COLUMNS = (
+        GPSHarmonizedColumn.TIMESTAMP.value,
+        GPSHarmonizedColumn.LATITUDE.value,
+        GPSHarmonizedColumn.LONGITUDE.value,
+    )
+
+    def _derived_columns(self, data, columns=None):
         """
-        Remap values parsed and ensure all GPS harmonized columns exist
-        with correct types
+        Add the geometry column to the harmonized columns
 
         Args:
-            data: DataFrame to harmonize
+            data: prepared DataFrame (see ``prepare_data``)
+            columns: harmonized columns to build, all if None
 
         Returns:
-            Harmonized DataFrame with all GPS columns and correct types
+            Derived columns, with the geometry as a geoarrow point array
         """
-        # First, apply standard column renaming
-        data = super().harmonize_data(data)
+        derived = super()._derived_columns(data, columns)
+        if columns is None or GPSHarmonizedColumn.GEOMETRY.value in columns:
+            derived["geometry"] = self._create_geometry(data)
+        return derived
 
-        # Create geometry column from latitude and longitude (WGS84)
-        # Note: This creates geometry from current lat/lon values
-        # If parsers modify lat/lon after calling super(), they should
-        # call _create_geometry_column() again
-        data = self._create_geometry_column(data)
-        return data
+    def _source_columns(self, columns):
+        """Source columns of the harmonized ``columns``, the geometry's included.
 
-    def _create_geometry_column(self, data):
+        The geometry is built from the sources of the longitude and latitude.
         """
-        Create or update geometry column from latitude and longitude.
+        if columns is not None and GPSHarmonizedColumn.GEOMETRY.value in columns:
+            columns = [
+                *columns,
+                GPSHarmonizedColumn.LONGITUDE.value,
+                GPSHarmonizedColumn.LATITUDE.value,
+            ]
+        return super()._source_columns(columns)
+
+    def _filter_table(self, data, columns):
+        """Harmonized columns filters compare, the geometry as its coordinates.
+
+        No points are built for filters: the geometry is the struct of its x
+        and y (the storage of a geoarrow point), null where either is unknown.
+        """
+        geometry = GPSHarmonizedColumn.GEOMETRY.value
+        table = super()._filter_table(
+            data, [name for name in columns if name != geometry]
+        )
+        if geometry in columns:
+            coordinates = self._geometry_coordinates(data)
+            if coordinates is None:
+                coordinates = np.full(len(data), np.nan), np.full(len(data), np.nan)
+            x, y = (
+                pc.cast(pa.array(values, from_pandas=True), pa.float64())
+                for values in coordinates
+            )
+            unknown = pc.fill_null(pc.or_(pc.is_nan(x), pc.is_nan(y)), True)
+            points = pa.StructArray.from_arrays([x, y], names=["x", "y"], mask=unknown)
+            table = (
+                table.append_column(geometry, points)
+                if table.num_columns
+                else pa.table({geometry: points})
+            )
+        return table
+
+    def _geometry_coordinates(self, data):
+        """
+        Return the (x, y) coordinates of the geometry, or None if unknown.
+
+        Uses the harmonized longitude and latitude (WGS84). Override when the
+        positions are given in another reference system, along with
+        GEOMETRY_CRS.
+        """
+        longitude = self._mapped_source(data, GPSHarmonizedColumn.LONGITUDE)
+        latitude = self._mapped_source(data, GPSHarmonizedColumn.LATITUDE)
+        # Only usable if lat/lon columns exist and have valid (non-null) values
+        if (
+            longitude is None
+            or latitude is None
+            or longitude.isna().all()
+            or latitude.isna().all()
+        ):
+            return None
+        return longitude.values, latitude.values
 
-        This helper method can be called by subclasses after they've
-        finished creating/modifying latitude and longitude columns.
+    def _create_geometry(self, data):
+        """
+        Create the point geometries of the rows.
 
         Args:
-            data: DataFrame with latitude and longitude columns
+            data: prepared DataFrame (see ``prepare_data``)
 
         Returns:
-            DataFrame with geometry column added/updated
+            geoarrow point array, with empty points if positions are unknown
         """
-        # Only create if lat/lon columns exist and have valid (non-null) values
-        if (
-            "latitude" in data.columns
-            and "longitude" in data.columns
-            and not data["latitude"].isna().all()
-            and not data["longitude"].isna().all()
-        ):
-            # Create point geometries from lat/lon coordinates
-            # GeoArrow expects (x, y) which is (longitude, latitude)
-            points = ga.make_point(
-                data["longitude"].values,
-                data["latitude"].values,
-                crs="EPSG:4326",
-            )
-            # Convert to pandas ArrowExtensionArray directly from the Arrow array
-            data["geometry"] = pd.array(points, dtype=pd.ArrowDtype(points.type))
-        else:
-            # Create empty geometry column if lat/lon don't exist or are all null
-            empty_points = ga.make_point(
-                np.full(len(data), np.nan),
-                np.full(len(data), np.nan),
-                crs="EPSG:4326",
-            )
-            data["geometry"] = pd.array(
-                empty_points, dtype=pd.ArrowDtype(empty_points.type)
-            )
+        coordinates = self._geometry_coordinates(data)
+        if coordinates is None:
+            coordinates = np.full(len(data), np.nan), np.full(len(data), np.nan)
+
+        # GeoArrow expects (x, y) which is (longitude, latitude)
+        return ga.make_point(*coordinates, crs=self.GEOMETRY_CRS)
 
-        return data
+    def _quality_flags(self, table, previous=None, following=None):
+        """
+        Flag the fixes reached and left faster than MAX_SPEED.
+
+        Speeds are computed from the harmonized timestamp, latitude and
+        longitude, see ``quality.speed_outliers``.
+
+        Returns:
+            ``QCFlag`` flags of the rows, as uint8
+        """
+        outliers = speed_outliers(
+            *self._fix_columns(table),
+            self.MAX_SPEED,
+            before=self._edge_fix(previous, last=True),
+            after=self._edge_fix(following, last=False),
+        )
+        return pa.array(np.where(outliers, QCFlag.SPEED, 0).astype("uint8"))
+
+    @staticmethod
+    def _fix_columns(table):
+        """Timestamps (datetime64[us]), latitudes and longitudes of a table."""
+        timestamps = table.column(GPSHarmonizedColumn.TIMESTAMP.value)
+        if pa.types.is_timestamp(timestamps.type):
+            # Timezone-aware timestamps are compared as UTC
+            timestamps = timestamps.cast(pa.timestamp("us")).to_numpy()
+        else:
+            timestamps = np.full(len(table), np.datetime64("NaT", "us"))
+        latitudes, longitudes = (
+            pc.cast(table.column(column.value), pa.float64()).to_numpy()
+            for column in (GPSHarmonizedColumn.LATITUDE, GPSHarmonizedColumn.LONGITUDE)
+        )
+        return timestamps, latitudes, longitudes
+
+    def _edge_fix(self, table, last: bool) -> Fix | None:
+        """First or last fix of a table with a timestamp and a position."""
+        if table is None:
+            return None
+        columns = self._fix_columns(table)
+        positions = np.flatnonzero(valid_fixes(*columns))
+        if len(positions) == 0:
+            return None
+        position = positions[-1 if last else 0]
+        return Fix(*(values[position] for values in columns))
+
+    def _bounds(self, table):
+        """Bounding box of the fixes with a known position, see ``Parser.scan``."""
+        _timestamps, latitudes, longitudes = self._fix_columns(table)
+        known = valid_positions(latitudes, longitudes)
+        if not known.any():
+            return None
+        latitudes, longitudes = latitudes[known], longitudes[known]
+        return (
+            float(longitudes.min()),
+            float(latitudes.min()),
+            float(longitudes.max()),
+            float(latitudes.max()),
+        )
 
     def get_harmonization_schema(self):
         """
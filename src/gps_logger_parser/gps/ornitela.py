@@ -5,6 +5,7 @@ from .mixin import GPSHarmonizationMixin
 
 class OrnitelaParser(GPSHarmonizationMixin, CSVParser):
     DATATYPE = "gps_ornitela"
+    TIME_SORTED = True
     FIELDS = [
         "device_id",
         "UTC_datetime",
@@ -1,10 +1,8 @@
-import csv
-import io
+import pyarrow as pa
 
-import pandas as pd
-
-from ..helpers import stream_starts_with
-from ..parser_base import CSVParser, Parsable, Parser
+from ..dispatch import Signature
+from ..parser_base import CSVParser, DetectionContext, Parsable, Parser
+from ..timestamps import from_components
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
 
@@ -31,6 +29,7 @@ class PathtrackParser(GPSHarmonizationMixin, Parser):
         "unknown1",
         "unknown2",
     )
+    DERIVED_FROM = ("year", "month", "day", "hour", "minute", "second")
     SEPARATOR = ","
 
     MAPPINGS = {
@@ -54,63 +53,54 @@ class PathtrackParser(GPSHarmonizationMixin, Parser):
     }
 
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file starts with the expected HEAD bytes."""
-        try:
-            with parsable.get_stream(binary=False) as stream:
-                if not stream.seekable():
-                    return False
-                return stream_starts_with(stream, cls.HEAD)
-        except (UnicodeDecodeError, OSError):
-            return False
-
-    def harmonize_data(self, data):
-        # Combine date and time fields into timestamp
-        data["timestamp"] = pd.to_datetime(
-            "20"
-            + data["year"].astype(str)
-            + "/"
-            + data["month"].astype(str)
-            + "/"
-            + data["day"].astype(str)
-            + " "
-            + data["hour"].astype(str)
-            + ":"
-            + data["minute"].astype(str)
-            + ":"
-            + data["second"].astype(str),
-            format="%Y/%m/%d %H:%M:%S",
+    def signatures(cls):
+        """The file must start with the expected HEAD bytes."""
+        return [Signature.prefix(cls.HEAD)]
+
+    def prepare_data(self, data):
+        # Combine date and time fields into timestamp, years have 2 digits
+        data["timestamp"] = from_components(
+            data["year"],
+            data["month"],
+            data["day"],
+            data["hour"],
+            data["minute"],
+            data["second"],
+            century=2000,
             errors="coerce",
         )
-        return super().harmonize_data(data)
+        return data
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
+    @classmethod
+    def can_parse(cls, parsable: Parsable):
+        """Check the HEAD and the field count of the data section."""
+        if not super().can_parse(parsable):
+            return False
 
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
+        # The row after the one whose field count is checked is not read
+        context = cls._divider_context(parsable, dividers=2, skip_rows=1)
+        if not context or len(context.header) != len(cls.FIELDS):
+            return False
+        return context
 
-            if not stream_starts_with(stream, self.HEAD):
-                self._raise_not_supported("Stream head different than expected")
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self._read_rows()
 
-            _soi, _metadata, data = stream.read().split(self.DIVIDER, 2)
-            content = io.StringIO(data)
-            reader = csv.reader(content, delimiter=self.SEPARATOR)
-            header = next(reader)
-            if len(header) != len(self.FIELDS):
-                self._raise_not_supported(
-                    f"Stream have a number of fields different than expected, "
-                    f"{len(header)} != {len(self.FIELDS)}"
-                )
+    def _csv_options(self):
+        return {
+            "names": self.FIELDS,
+            "separator": self.SEPARATOR,
+            "encoding": self.file.encoding,
+        }
 
-            self.data = pd.read_csv(
-                content,
-                header=0,
-                names=self.FIELDS,
-                sep=self.SEPARATOR,
-                index_col=False,
-            )
+    def _csv_range(self):
+        return self.context.data_offset, None
 
 
 class PathtrackParserNoUnknown(PathtrackParser):
@@ -152,7 +142,9 @@ class CSVPathtrack(GPSHarmonizationMixin, CSVParser):
         "processing_parameterA",
         "processing_parameterB",
     ]
+    DERIVED_FROM = ("year", "month", "day", "hour", "minute", "second")
     SEPARATOR = ";"
+    DECIMAL_POINT = ","
     MAPPINGS = {
         GPSHarmonizedColumn.ID: None,
         GPSHarmonizedColumn.TIMESTAMP: None,
@@ -173,38 +165,28 @@ class CSVPathtrack(GPSHarmonizationMixin, CSVParser):
         GPSHarmonizedColumn.TRIP_NR: None,
     }
 
-    def harmonize_data(self, data):
+    def prepare_data(self, data):
         # Combine date and time fields into a timestamp
-        data["timestamp"] = pd.to_datetime(
-            "20"  # There are just the last 2 digits of the year
-            + data["year"].astype(str)
-            + "/"
-            + data["month"].astype(str)
-            + "/"
-            + data["day"].astype(str)
-            + " "
-            + data["hour"].astype(str)
-            + ":"
-            + data["minute"].astype(str)
-            + ":"
-            + data["second"].astype(str),
-            format="%Y/%m/%d %H:%M:%S",
+        data["timestamp"] = from_components(
+            data["year"],  # There are just the last 2 digits of the year
+            data["month"],
+            data["day"],
+            data["hour"],
+            data["minute"],
+            data["second"],
+            century=2000,
             errors="coerce",
         )
-
-        for column in [
-            "latitude",
-            "longitude",
-            "altitude",
-        ]:
-            try:
-                data[column] = data[column].str.replace(",", ".", regex=False)
-                data[column] = pd.to_numeric(data[column], errors="coerce")
-            except AttributeError:
-                # this fails only when the column is already numeric
-                pass
-
-        return super().harmonize_data(data)
+        return data
+
+    def _csv_options(self):
+        return {
+            **super()._csv_options(),
+            # Decimal numbers even when the first rows only hold integers
+            "column_types": dict.fromkeys(
+                ["latitude", "longitude", "altitude"], pa.float64()
+            ),
+        }
 
 
 PARSERS = [
@@ -1,9 +1,10 @@
 import csv
+import io
 
 import numpy as np
 import pandas as pd
 
-from ..parser_base import CSVParser, Parsable, Parser
+from ..parser_base import CSVParser, DetectionContext, Parsable, Parser
 from .columns import GPSHarmonizedColumn
 from .mixin import GPSHarmonizationMixin
 
@@ -52,17 +53,18 @@ class GPSUnknownFormatParser(GPSHarmonizationMixin, CSVParser):
     DATATYPE = "gps_unknown"
     SEPARATOR = "\t"
     FIELDS = FIELDS
+    DERIVED_FROM = ("Date", "Time")
 
     MAPPINGS = MAPPINGS
 
-    def harmonize_data(self, data):
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
         data["timestamp"] = pd.to_datetime(
             data["Date"] + " " + data["Time"],
             errors="raise",
             format="%d.%m.%Y %H:%M:%S",
         )
-        return super().harmonize_data(data)
+        return data
 
 
 class GPSUnknownFormatParserWithEmptyColumns(GPSHarmonizationMixin, Parser):
@@ -74,6 +76,7 @@ class GPSUnknownFormatParserWithEmptyColumns(GPSHarmonizationMixin, Parser):
     DATATYPE = "gps_unknown"
     SEPARATOR = "\t"
     FIELDS = FIELDS
+    DERIVED_FROM = ("Date", "Time")
     SKIP_INITIAL_SPACE = True
 
     MAPPINGS = MAPPINGS
@@ -82,19 +85,23 @@ class GPSUnknownFormatParserWithEmptyColumns(GPSHarmonizationMixin, Parser):
     def can_parse(cls, parsable):
         """Check if the header (with empty columns filtered) matches FIELDS."""
         try:
-            with parsable.get_stream(binary=False) as stream:
-                if not stream.seekable():
-                    return False
-                reader = csv.reader(
-                    stream, delimiter=cls.SEPARATOR, skipinitialspace=True
-                )
-                header = next(reader)
-                header = [c for c in header if c != ""]
-                return header == cls.FIELDS
+            reader = csv.reader(
+                io.StringIO(parsable.get_head()),
+                delimiter=cls.SEPARATOR,
+                skipinitialspace=True,
+            )
+            header = next(reader)
         except (StopIteration, UnicodeDecodeError):
             return False
 
-    def harmonize_data(self, data):
+        # Filter empty columns
+        header = [c for c in header if c != ""]
+        if header != cls.FIELDS:
+            return False
+        # The row after the header row is not read
+        return cls._header_context(parsable, header, skip_rows=1)
+
+    def prepare_data(self, data):
         # Combine Date and Time columns into timestamp
         data["timestamp"] = pd.to_datetime(
             data["Date"] + " " + data["Time"],
@@ -103,40 +110,28 @@ class GPSUnknownFormatParserWithEmptyColumns(GPSHarmonizationMixin, Parser):
         )
         # this file seem to have been manipulated in excel, using some formulas
         data = data.replace("#VALUE!", np.nan)
-        return super().harmonize_data(data)
-
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            reader = csv.reader(
-                stream,
-                delimiter=self.SEPARATOR,
-                skipinitialspace=self.SKIP_INITIAL_SPACE,
-            )
-            header = next(reader)
-
-            # Filter empty columns
-            header = [c for c in header if c != ""]
-
-            if header != self.FIELDS:
-                self._raise_not_supported(
-                    f"Stream have a header different than expected, "
-                    f"{header} != {self.FIELDS}"
-                )
-
-            stream.seek(0)
-            self.data = pd.read_csv(
-                stream,
-                header=1,
-                names=self.FIELDS,
-                sep=self.SEPARATOR,
-                index_col=False,
-                usecols=list(range(len(self.FIELDS))),
-            )
+        return data
+
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self._read_rows()
+
+    def _csv_options(self):
+        return {
+            "names": self.FIELDS,
+            "separator": self.SEPARATOR,
+            # The empty columns at the end of the rows are left out
+            "usecols": list(range(len(self.FIELDS))),
+            "encoding": self.file.encoding,
+        }
+
+    def _csv_range(self):
+        return self.context.data_offset, None
 
 
 PARSERS = [
@@ -1,5 +1,9 @@
+import io
 import re
 
+import numpy as np
+import pyarrow as pa
+
 
 def stream_starts_with(stream, text):
     position = stream.tell()
@@ -31,3 +35,183 @@ def read_csv(data, separator=",", newline="\n", trailing=""):
                 raise ValueError(f"Line does not end with expected trailing: {line}")
             line = line[: -len(trailing)]
         yield line.split(separator)
+
+
+# Bytes read at a time by iter_matches and ByteRange
+CHUNK_SIZE = 1 << 20
+
+
+def iter_matches(stream, pattern: re.Pattern, start: int = 0, chunk_size=CHUNK_SIZE):
+    """Yield the ``(start, end)`` byte offsets of the matches of a bytes pattern.
+
+    The stream is read a chunk at a time from ``start``, the matches are those
+    ``pattern.finditer`` would find in the whole content, as long as they are
+    shorter than 16 bytes.
+    """
+    overlap = 16
+    stream.seek(start)
+    tail, offset = b"", start
+    while True:
+        chunk = stream.read(chunk_size)
+        data = tail + chunk
+        final = len(chunk) < chunk_size
+        # Matches near the end of the chunk may go on in the next one
+        keep = len(data) if final else len(data) - overlap
+        for match in pattern.finditer(data):
+            if not final and match.end() > keep:
+                keep = min(match.start(), keep)
+                break
+            yield offset + match.start(), offset + match.end()
+            keep = max(keep, match.end())
+        if final:
+            return
+        tail, offset = data[keep:], offset + keep
+
+
+def line_offset(stream, start: int, end: int, line: int, chunk_size=CHUNK_SIZE) -> int:
+    """Byte offset of the start of the ``line``-th line (from 0) after ``start``.
+
+    The line breaks of the stream are counted from ``start`` a chunk at a
+    time, without decoding. Returns ``end`` if the range has fewer lines.
+    """
+    if line <= 0:
+        return start
+    stream.seek(start)
+    position, seen = start, 0
+    while position < end:
+        chunk = stream.read(min(chunk_size, end - position))
+        if not chunk:
+            break
+        breaks = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+        if seen + len(breaks) >= line:
+            return position + int(breaks[line - seen - 1]) + 1
+        seen += len(breaks)
+        position += len(chunk)
+    return end
+
+
+class ByteRange(io.RawIOBase):
+    """Read-only view of the bytes ``start`` to ``end`` of a seekable stream.
+
+    ``end`` None reads to the end of the stream. With ``transform``, blocks
+    of whole lines are passed through it as they are read. ``prefix`` is read
+    before the range, e.g. the header lines of rows read from the middle of a
+    file. With either, the view can only be rewound to its start.
+    """
+
+    def __init__(
+        self,
+        stream,
+        start: int,
+        end: int | None = None,
+        transform=None,
+        prefix: bytes = b"",
+    ):
+        self._stream = stream
+        self.start = start
+        self.end = end
+        self.transform = transform
+        self.prefix = prefix if transform is None or not prefix else transform(prefix)
+        self._position = start
+        self._pending = self.prefix
+        self._offset = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._offset
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence != io.SEEK_SET or (
+            offset and (self.transform is not None or self.prefix)
+        ):
+            raise io.UnsupportedOperation("ByteRange can only seek from its start")
+        self._position = self.start + offset
+        self._pending = self.prefix
+        self._offset = offset
+        return offset
+
+    def readinto(self, buffer):
+        while not self._pending:
+            block = self._read_block(max(len(buffer), CHUNK_SIZE))
+            if block is None:
+                return 0
+            self._pending = block
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._offset += size
+        return size
+
+    def _read_block(self, size):
+        if self.end is not None:
+            size = min(size, self.end - self._position)
+        if size <= 0:
+            return None
+        self._stream.seek(self._position)
+        block = self._stream.read(size)
+        if not block:
+            return None
+
+        if self.transform is not None and len(block) == size:
+            # The last line goes on in the next block
+            cut = block.rfind(b"\n") + 1
+            block = block[:cut] if cut else block
+        self._position += len(block)
+        return block if self.transform is None else self.transform(block)
+
+
+def line_views(buffer: pa.Buffer) -> pa.Array:
+    """Split a text buffer into a ``string_view`` array of its non-empty lines.
+
+    The views point into ``buffer``: lines up to 12 bytes are inlined in their
+    view, longer ones are not copied at all. Lines are split like universal
+    newlines do, and line terminators are excluded.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if len(data) > np.iinfo(np.int32).max:
+        raise ValueError("Buffer too large for string_view offsets")
+
+    # \n, \r\n and \r all end a line, the empty lines in between are dropped
+    newlines = np.flatnonzero((data == ord("\n")) | (data == ord("\r")))
+    starts = np.concatenate(([0], newlines + 1))
+    lengths = np.concatenate((newlines, [len(data)])) - starts
+
+    keep = lengths > 0
+    starts, lengths = starts[keep], lengths[keep]
+
+    # Arrow view layout: int32 length, then either the inlined bytes or a
+    # 4 bytes prefix, the int32 buffer index and the int32 offset
+    views = np.zeros((len(starts), 16), dtype=np.uint8)
+    views[:, 0:4] = lengths.astype("<i4").view(np.uint8).reshape(-1, 4)
+    inline = lengths <= 12
+    for position in range(12):
+        rows = np.flatnonzero(inline & (lengths > position))
+        views[rows, 4 + position] = data[starts[rows] + position]
+    rows = np.flatnonzero(~inline)
+    for position in range(4):
+        views[rows, 4 + position] = data[starts[rows] + position]
+    views[rows, 12:16] = starts[rows].astype("<i4").view(np.uint8).reshape(-1, 4)
+
+    return pa.Array.from_buffers(
+        pa.string_view(), len(starts), [None, pa.py_buffer(views), buffer]
+    )
+
+
+def filter_views(array: pa.Array, mask: np.ndarray) -> pa.Array:
+    """Keep the rows of a ``string_view`` array without nulls where ``mask`` is.
+
+    Arrow has no filter kernel for views: the 16 bytes views of the rows kept
+    are copied, still pointing into the data buffers of ``array``.
+    """
+    _validity, views, *data = array.buffers()
+    views = np.frombuffer(views, dtype=np.uint8).reshape(-1, 16)
+    views = views[array.offset : array.offset + len(array)][mask]
+    return pa.Array.from_buffers(
+        pa.string_view(), len(views), [None, pa.py_buffer(views), *data]
+    )
@@ -0,0 +1,261 @@
+"""
+Manifest of the inputs already written to an output directory.
+
+The manifest is a JSON file kept in the output directory. For each input it
+records what the input looked like (size plus ETag or mtime), which parser
+wrote it, a fingerprint of that parser's code, the schema version of its
+output and the options it was written with. A later run can then skip the
+inputs for which none of these changed. Inputs appended to a dataset also
+record the part files holding their rows, which are removed before the input
+is appended again.
+"""
+
+import ast
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
+import sys
+
+from upath import UPath
+
+from .filters import parse_filters
+from .parser import available_parsers
+from .parser_base import OriginalData, QualityControl
+from .timestamps import as_utc
+
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 1
+
+parsers_by_name = {parser.__name__: parser for parser in available_parsers}
+
+# Modules that decide which parser gets a file, whatever the parser
+DETECTION_MODULES = ("parser", "dispatch", "encoding")
+
+
+def file_fingerprint(path: UPath) -> dict:
+    """Describe the current state of a file without reading its content.
+
+    Object stores expose an ETag that changes with the content, local and
+    other file systems a modification time.
+    """
+    info = path.fs.info(path.path)
+    fingerprint = {"size": info.get("size")}
+    etag = info.get("ETag") or info.get("etag")
+    if etag:
+        fingerprint["etag"] = etag.strip('"')
+    else:
+        mtime = info.get("mtime") or info.get("LastModified")
+        fingerprint["mtime"] = str(mtime) if mtime is not None else None
+    return fingerprint
+
+
+def _package_imports(module_name: str) -> list[str]:
+    """Modules of this package that a module imports, read from its source."""
+    module = sys.modules[module_name]
+    imported = []
+    for node in ast.walk(ast.parse(inspect.getsource(module))):
+        if isinstance(node, ast.Import):
+            imported.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = (
+                importlib.util.resolve_name(
+                    "." * node.level + (node.module or ""), module.__package__
+                )
+                if node.level
+                else node.module
+            )
+            # Names imported from a package may be its submodules
+            imported.append(base)
+            imported.extend(f"{base}.{alias.name}" for alias in node.names)
+    return [
+        name
+        for name in imported
+        if name in sys.modules
+        and (name == __package__ or name.startswith(f"{__package__}."))
+    ]
+
+
+def fingerprint_modules(parser) -> list[str]:
+    """Modules whose source shapes the output of a parser class.
+
+    These are the modules of its classes and every module of this package
+    they import, directly or not (readers, timestamps, column schemas...),
+    along with the detection modules.
+    """
+    modules = dict.fromkeys(
+        cls.__module__
+        for cls in parser.__mro__
+        if cls.__module__.startswith(f"{__package__}.")
+    )
+    pending = list(modules)
+    while pending:
+        for name in _package_imports(pending.pop()):
+            if name not in modules:
+                modules[name] = None
+                pending.append(name)
+    modules.update(dict.fromkeys(f"{__package__}.{name}" for name in DETECTION_MODULES))
+    return list(modules)
+
+
+@functools.cache
+def parser_fingerprint(parser_name: str) -> str | None:
+    """Hash the source of every module a registered parser class depends on.
+
+    See ``fingerprint_modules``. The registry order is part of the
+    fingerprint too, as it decides which parser gets a file. Returns None for
+    names that are no longer registered.
+    """
+    if parser_name not in parsers_by_name:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(",".join(parsers_by_name).encode())
+    for module in fingerprint_modules(parsers_by_name[parser_name]):
+        digest.update(inspect.getsource(sys.modules[module]).encode())
+    return digest.hexdigest()
+
+
+def output_options(
+    dataset: bool = False,
+    original_data: str = OriginalData.JSON,
+    quality_control: str = QualityControl.NONE,
+    time_range: tuple | None = None,
+    columns: list[str] | None = None,
+    filters: list | None = None,
+) -> dict:
+    """Options of ``batch.parse_file`` that change what is written, as JSON.
+
+    Values are normalized so that equivalent options compare equal: filters
+    as their text in sorted order, the ends of time ranges as UTC ISO
+    timestamps. The batch size is left out, as it only changes how the rows
+    are grouped in the parquet files.
+    """
+    return {
+        "dataset": bool(dataset),
+        "original_data": OriginalData(original_data).value,
+        "quality_control": QualityControl(quality_control).value,
+        "time_range": None
+        if time_range is None
+        else [None if end is None else as_utc(end).isoformat() for end in time_range],
+        "columns": None if columns is None else list(columns),
+        "filters": sorted(str(condition) for condition in parse_filters(filters)),
+    }
+
+
+def entry_is_current(
+    entry: dict | None, fingerprint: dict, output: UPath, options: dict | None = None
+) -> bool:
+    """True if a manifest entry still describes the input and the parser code.
+
+    The entry must also have been written with the same ``options``, see
+    ``output_options``; None stands for the default ones.
+    """
+    if entry is None or entry["input"] != fingerprint:
+        return False
+    if entry.get("options") != (output_options() if options is None else options):
+        return False
+
+    parser = parsers_by_name.get(entry["parser"])
+    if parser is None or entry["schema_version"] != parser.SCHEMA_VERSION:
+        return False
+    if entry["code"] != parser_fingerprint(entry["parser"]):
+        return False
+
+    # Dataset outputs are shared by many inputs and have no file of their own
+    return entry["output"] is None or (output / entry["output"]).exists()
+
+
+class Manifest:
+    """Inputs already written to an output directory, keyed by input path."""
+
+    def __init__(self, output: UPath):
+        self.output = output
+        self.path = output / MANIFEST_NAME
+        self.entries = {}
+
+    @classmethod
+    def load(cls, output: UPath) -> "Manifest":
+        manifest = cls(output)
+        if manifest.path.exists():
+            content = json.loads(manifest.path.read_text())
+            if content.get("version") == MANIFEST_VERSION:
+                manifest.entries = content.get("entries", {})
+        return manifest
+
+    def save(self):
+        self.output.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                {"version": MANIFEST_VERSION, "entries": self.entries},
+                indent=2,
+                sort_keys=True,
+            )
+        )
+
+    def is_current(
+        self, source: str, fingerprint: dict, options: dict | None = None
+    ) -> bool:
+        """True if ``source`` was written from the same input, code and options."""
+        return entry_is_current(
+            self.entries.get(source), fingerprint, self.output, options
+        )
+
+    def record(
+        self,
+        source: str,
+        fingerprint: dict,
+        parser_name: str,
+        output: str | None,
+        rows: int,
+        options: dict | None = None,
+    ):
+        """Record that ``source`` was written to ``output`` by ``parser_name``.
+
+        ``options`` are the ones it was written with, see ``output_options``.
+        """
+        self.entries[source] = {
+            "input": fingerprint,
+            "parser": parser_name,
+            "code": parser_fingerprint(parser_name),
+            "schema_version": parsers_by_name[parser_name].SCHEMA_VERSION,
+            "output": output,
+            "rows": rows,
+            "options": output_options() if options is None else options,
+        }
+
+    def record_parts(self, source: str, parts):
+        """Record the dataset files, relative to the output, holding ``source``."""
+        if source in self.entries:
+            self.entries[source]["parts"] = sorted(parts)
+
+    def forget(self, sources) -> tuple[set[str], list[str]]:
+        """Drop the entries of ``sources``, along with their dataset files.
+
+        Dataset files are shared by the inputs written together, so the
+        entries of the other inputs with rows in these files are dropped too,
+        and so on.
+
+        Returns:
+            The inputs dropped, and the dataset files to remove
+        """
+        dropped, parts = set(), set()
+        pending = [source for source in sources if source in self.entries]
+        while pending:
+            source = pending.pop()
+            if source in dropped:
+                continue
+            dropped.add(source)
+            shared = set(self.entries[source].get("parts", ())) - parts
+            parts |= shared
+            if shared:
+                pending.extend(
+                    other
+                    for other, entry in self.entries.items()
+                    if other not in dropped and shared & set(entry.get("parts", ()))
+                )
+
+        for source in dropped:
+            del self.entries[source]
+        return dropped, sorted(parts)
@@ -4,6 +4,7 @@ import traceback
 from upath import UPath
 
 from .accelerometer import PARSERS as ACCELEROMETER_PARSERS
+from .dispatch import DispatchIndex
 from .gps import PARSERS as GPS_PARSERS
 from .other_sensor import PARSERS as OTHER_SENSOR_PARSERS
 from .parser_base import Parsable, ParserNotSupported
@@ -13,19 +14,42 @@ available_parsers = (
     GPS_PARSERS + ACCELEROMETER_PARSERS + TDR_PARSERS + OTHER_SENSOR_PARSERS
 )
 
+dispatch_index = DispatchIndex(available_parsers)
+
 logger = logging.getLogger(__name__)
 
 
-def detect_file(path: UPath, *args, logger=logger, **kwargs):
+def detect_file(
+    path: UPath,
+    *args,
+    logger=logger,
+    index=dispatch_index,
+    columns: list[str] | None = None,
+    **kwargs,
+):
+    """Parser instance for the file at ``path``.
+
+    With ``columns``, the harmonized columns of its tables, only the source
+    columns these need are read (see ``Parser.as_table``).
+    """
     parsable = Parsable(file_path=path)
 
-    for parser in available_parsers:
+    # Parsers matching the indexed signatures and those without one, in the
+    # order they are registered
+    for parser in index.probe_order(parsable):
         try:
-            if not parser.can_parse(parsable):
+            context = parser.can_parse(parsable)
+            if not context:
                 logger.debug(f"Skipped {parser.__name__}: can_parse returned False")
                 continue
-            result = parser(parsable)
+            result = parser(parsable, context=context, columns=columns)
             logger.info(f"Parsed with {parser}")
+            if parsable.encoding_detection:
+                encoding, tier, bytes_read = parsable.encoding_detection
+                logger.debug(
+                    f"Encoding {encoding} decided by the {tier.value} tier "
+                    f"after reading {bytes_read} bytes"
+                )
             return result
         except ParserNotSupported:
             logger.debug("Expected: " + traceback.format_exc())
@@ -1,33 +1,174 @@
+import codecs
 import csv
+import io
 import json
+import locale
+import logging
 import os
 import pathlib
+from collections.abc import Iterator
 from contextlib import contextmanager
+from enum import Enum
+from itertools import chain, islice
+from typing import NamedTuple
 
 import geoarrow.pandas as _  # noqa: F401
 import geoarrow.pyarrow as ga
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.csv as pacsv
 import pyarrow.parquet as pq
-from chardet import UniversalDetector
 from upath import UPath
 
+from .dataset import DatasetWriter
+from .dispatch import Signature
+from .encoding import (
+    ENCODING_SAMPLE_SIZE,
+    EncodingDetection,
+    detect_encoding,
+)
+from .filters import Filter, filter_mask, parse_filters
+from .helpers import ByteRange, filter_views, line_views
+from .reader import iter_csv, read_csv
+from .scan import (
+    SCAN_SIZE,
+    SCAN_WINDOWS,
+    ScanSummary,
+    count_lines,
+    first_value,
+    merge_bounds,
+    whole_lines,
+    window_ranges,
+)
+from .timestamps import FORMATS, as_utc, parse_timestamps, sniff_format
+
+logger = logging.getLogger(__name__)
+
+# fsspec protocols of the files on the local disk, "" for plain paths
+LOCAL_PROTOCOLS = ("", "file", "local")
+
+# Highest plausible speed of the fixes in meters per second, see QualityControl
 MAX_SPEED = float(os.environ.get("MAX_SPEED", default="10"))
+# Rows read, harmonized and written at a time by iter_batches
+BATCH_SIZE = int(os.environ.get("BATCH_SIZE", default=str(64 * 1024)))
 
 
 class ParserNotSupported(Exception):
     pass
 
 
+class OriginalData(str, Enum):
+    """How ``as_table`` retains the source rows in ``_original_data``
+
+    - ``json``: each row serialized as a JSON object
+    - ``struct``: a struct column built from the source columns
+    - ``line``: the raw source line of each row, sliced from the file
+    - ``none``: no ``_original_data`` column
+    """
+
+    JSON = "json"
+    STRUCT = "struct"
+    LINE = "line"
+    NONE = "none"
+
+
+class HarmonizationEngine(str, Enum):
+    """How ``as_table`` builds the harmonized columns
+
+    - ``arrow``: straight into Arrow arrays (``Parser.harmonize_table``)
+    - ``pandas``: through a DataFrame (``Parser.harmonize_data``)
+    """
+
+    ARROW = "arrow"
+    PANDAS = "pandas"
+
+
+class QualityControl(str, Enum):
+    """How ``as_table`` handles the rows failing the checks of ``quality``
+
+    - ``none``: no checks and no ``qc_flags`` column
+    - ``flag``: the checks each row failed are set in a ``qc_flags`` column
+    - ``drop``: the rows failing a check are dropped, the others keep their
+      ``qc_flags``
+    """
+
+    NONE = "none"
+    FLAG = "flag"
+    DROP = "drop"
+
+
+class DetectionContext(NamedTuple):
+    """State gathered by ``can_parse`` and handed to the parser constructor.
+
+    Lets the constructor reuse what detection already read instead of scanning
+    the file again:
+
+    - ``header``: the column header row, as split during detection
+    - ``data_offset``: byte offset where the rows to read start
+    - ``preamble_rows``: number of lines before the header row
+    - ``metadata``: values parsed from the preamble
+    - ``intro``: the raw preamble text
+    """
+
+    header: list | None = None
+    data_offset: int | None = None
+    preamble_rows: int = 0
+    metadata: dict | None = None
+    intro: str = ""
+
+
 class Parsable:
-    def __init__(self, file_path: UPath) -> None:
+    """A logger file to be detected and parsed.
+
+    The first ``sniff_size`` bytes of the file are fetched once and kept both as
+    raw bytes and as decoded text, so that the ``can_parse`` checks of every
+    parser run against the same cached prefix instead of opening the file again.
+    ``read_count`` tracks how many times the underlying file has been opened,
+    which on remote storage (S3) is the number of requests issued.
+
+    Binary reads go through ``get_view``, which memory-maps local files (unless
+    ``MEMORY_MAP=0``) and wraps the buffered, range-reading stream of remote
+    ones.
+    """
+
+    SNIFF_SIZE = int(os.environ.get("SNIFF_SIZE", default=str(64 * 1024)))
+    MEMORY_MAP = os.environ.get("MEMORY_MAP", default="1") != "0"
+
+    def __init__(
+        self,
+        file_path: UPath,
+        sniff_size: int | None = None,
+        encoding_sample_size: int = ENCODING_SAMPLE_SIZE,
+    ) -> None:
         self._file_path = file_path
+        self.sniff_size = sniff_size or self.SNIFF_SIZE
+        self.encoding_sample_size = encoding_sample_size
+        self.read_count = 0
+        self._head_text = {}
+        self._size = None
+        self.encoding_detection = None
 
         if not self._file_path.exists():
             raise ValueError("File does not exists")
 
-        self.encoding = self._detect_encoding()
+        self.head_bytes = self._read_head()
+
+    @property
+    def encoding(self) -> str | None:
+        """Text encoding of the file, detected once on a bounded sample.
+
+        Detection runs on first use, which is the decoding of the cached
+        prefix for dispatch (see ``get_head``).
+        """
+        if self.encoding_detection is None:
+            self.encoding_detection = self._detect_encoding()
+        return self.encoding_detection.encoding
+
+    @property
+    def head_complete(self) -> bool:
+        """True if the cached prefix holds the whole file."""
+        return len(self.head_bytes) < self.sniff_size
 
     @contextmanager
     def get_stream(self, binary=False, errors="strict"):
@@ -36,39 +177,454 @@ class Parsable:
             "encoding": None if binary else self.encoding,
             "errors": errors if not binary else None,
         }
+        self.read_count += 1
         stream = self._file_path.open(**params)
         yield stream
         stream.close()
 
-    def _detect_encoding(self):
-        detector = UniversalDetector()
+    @property
+    def local_path(self) -> str | None:
+        """Path of the file on the local disk, None for remote storage."""
+        if getattr(self._file_path, "protocol", "") not in LOCAL_PROTOCOLS:
+            return None
+        return getattr(self._file_path, "path", None) or os.fspath(self._file_path)
+
+    @contextmanager
+    def get_view(self):
+        """Open the file as a seekable binary ``pyarrow.NativeFile``.
+
+        Local files are memory-mapped, so that pyarrow reads them without a
+        copy through Python buffers. Remote files (and local ones with
+        ``MEMORY_MAP`` off) are read through ``get_stream``.
+        """
+        path = self.local_path
+        if path is None or not self.MEMORY_MAP:
+            with self.get_stream(binary=True) as stream:
+                yield pa.PythonFile(stream, mode="r")
+            return
+
+        self.read_count += 1
+        with pa.memory_map(path) as view:
+            yield view
+
+    def get_head(self, errors="strict") -> str:
+        """Return the cached prefix decoded as text.
+
+        Decoding mirrors a text stream opened with ``get_stream``: the detected
+        encoding is used and universal newlines are translated. A multi-byte
+        character cut by the end of the prefix is dropped rather than raising.
+        """
+        if errors not in self._head_text:
+            encoding = self.encoding or locale.getpreferredencoding(False)
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder(encoding)(errors=errors),
+                translate=True,
+            )
+            self._head_text[errors] = decoder.decode(
+                self.head_bytes, final=self.head_complete
+            )
+        return self._head_text[errors]
+
+    @property
+    def ascii_compatible(self) -> bool:
+        """True if the file can be split into lines on its raw bytes."""
+        encoding = self.encoding or locale.getpreferredencoding(False)
+        return not codecs.lookup(encoding).name.startswith(("utf-16", "utf-32"))
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        if self._size is None:
+            if self.head_complete:
+                self._size = len(self.head_bytes)
+            else:
+                self._size = self._file_path.stat().st_size
+        return self._size
+
+    def read_range(self, start: int, end: int) -> bytes:
+        """Read the bytes ``start`` to ``end`` of the file.
+
+        Bytes of the cached prefix are not read again. Remote files are read
+        with a single range request, instead of the buffered stream of
+        ``get_stream``, which reads ahead a whole block.
+        """
+        if end <= len(self.head_bytes):
+            return self.head_bytes[start:end]
+        if self.local_path is None:
+            self.read_count += 1
+            return self._file_path.fs.cat_file(
+                self._file_path.path, start=start, end=end
+            )
+        with self.get_view() as view:
+            view.seek(start)
+            return view.read(end - start)
+
+    def _read_head(self) -> bytes:
+        with self.get_view() as view:
+            return view.read(self.sniff_size)
+
+    def iter_lines(self, errors="strict"):
+        """Yield ``(start, end, line)`` for each line from the start of the file.
+
+        ``start`` and ``end`` are the byte offsets of the line, and ``line`` is
+        decoded and newline-translated like a text stream would return it.
+        Lines come from the cached prefix first, and the file is only opened
+        when the caller reads past it. Encodings that are not ASCII compatible
+        (UTF-16/32) are read through a text stream, without offsets.
+        """
+        encoding = self.encoding or locale.getpreferredencoding(False)
+
+        if not self.ascii_compatible:
+            with self.get_stream(binary=False, errors=errors) as stream:
+                for line in stream:
+                    yield None, None, line
+            return
+
+        def decode(raw):
+            line = raw.decode(encoding, errors)
+            if line.endswith("\r\n"):
+                return line[:-2] + "\n"
+            if line.endswith("\r"):
+                return line[:-1] + "\n"
+            return line
+
+        lines = self.head_bytes.splitlines(keepends=True)
+        if not self.head_complete and lines:
+            # The last line may be cut by the end of the prefix
+            lines.pop()
+
+        offset = 0
+        for raw in lines:
+            yield offset, offset + len(raw), decode(raw)
+            offset += len(raw)
+
+        if self.head_complete:
+            return
+
         with self.get_stream(binary=True) as stream:
-            for line in stream:
-                detector.feed(line)
-                if detector.done:
-                    break
-            detector.close()
-            return detector.result["encoding"]
+            stream.seek(offset)
+            for raw in stream:
+                yield offset, offset + len(raw), decode(raw)
+                offset += len(raw)
+
+    def _detect_encoding(self) -> EncodingDetection:
+        size = self.encoding_sample_size
+        if len(self.head_bytes) >= size or self.head_complete:
+            sample = self.head_bytes[:size]
+        else:
+            with self.get_view() as view:
+                sample = view.read(size)
+
+        return detect_encoding(sample, complete=len(sample) < size)
 
 
 class Parser:
     DATATYPE = "generic_parser"
+    # Bump when the layout of the as_table output changes, so that incremental
+    # runs rewrite the files written with the previous layout
+    SCHEMA_VERSION = 3
+    # Candidate formats of the timestamp text of the file, in order (see
+    # timestamps.parse_timestamps)
+    TIMESTAMP_FORMATS = FORMATS
+    # Bytes of each window of rows parsed by scan, and windows between the
+    # first and the last one
+    SCAN_SIZE = SCAN_SIZE
+    SCAN_WINDOWS = SCAN_WINDOWS
+    # Rows are written in time order, so that the rows of a time_range are
+    # found by a binary search over the file (see _time_span)
+    TIME_SORTED = False
+    # Bytes read at each step of that search
+    SEARCH_SIZE = 4096
+    # Source columns prepare_data (or _finish_data) derives columns from, read
+    # whatever harmonized columns are requested (see _source_columns)
+    DERIVED_FROM = ()
+    # Harmonized columns the quality checks read (see _quality_flags)
+    QUALITY_COLUMNS = ()
 
-    def __init__(self, parsable: Parsable):
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
         self.file = parsable
-        self.data = []
+        self._data = None
+        # Harmonized columns of as_table, None for all of them
+        self.columns = None if columns is None else list(columns)
+        self.context = self._resolve_context(context)
+        # Format of each timestamp column, sniffed on its first batch
+        self._timestamp_formats = {}
+
+    @property
+    def data(self):
+        """Parsed rows of the file, read on first use if the constructor did not."""
+        if self._data is None:
+            self._data = self.read_data(self._source_columns(self.columns))
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+    def _csv_options(self) -> dict | None:
+        """Options of ``read_csv`` and ``iter_csv`` reading the rows of the file.
+
+        Parsers returning them have their rows read from ``_csv_range``, in
+        batches by ``iter_data`` or whole on first use of ``self.data``. The
+        default, None, is for parsers reading the file their own way in the
+        constructor.
+        """
+        return None
+
+    def _csv_range(self) -> tuple[int, int | None]:
+        """Byte offsets ``(start, end)`` of the rows, end None for the end of file."""
+        return 0, None
+
+    def _csv_transform(self):
+        """Function rewriting the rows before they are read, or None.
+
+        It is handed blocks of whole lines of the ``_csv_range`` bytes, and
+        returns them as bytes in the encoding of ``_csv_options``.
+        """
+        return None
+
+    def _finish_data(self, data, first_row: int):
+        """Complete rows read with ``_csv_options``, from ``first_row`` on."""
+        return data
+
+    @contextmanager
+    def _open_rows(self, span: tuple[int, int] | None = None):
+        """Open the binary stream of the ``_csv_range`` of the file.
+
+        With ``span``, only the bytes ``(start, end)`` of the range are read,
+        behind the header lines of the range.
+        """
+        start, end = self._csv_range()
+        transform = self._csv_transform()
+        prefix = b""
+        if span is not None:
+            prefix = self._header_bytes(start, end, self._csv_options())
+            start, end = span
+        with self.file.get_view() as view:
+            if end is None and transform is None and not prefix:
+                view.seek(start)
+                yield view
+            else:
+                yield ByteRange(view, start, end, transform, prefix)
+
+    def _header_bytes(self, start: int, end: int | None, options: dict) -> bytes | None:
+        """Lines of the range skipped or read as names before the rows.
+
+        Returns None if they do not fit in ``SCAN_SIZE`` bytes.
+        """
+        lines = options.get("skip_rows", 0) + (0 if options.get("names") else 1)
+        end = self.file.size if end is None else end
+        head = self.file.read_range(start, min(start + self.SCAN_SIZE, end))
+        header = head.splitlines(keepends=True)[:lines]
+        # Like universal newlines, \r alone ends a line too
+        if len(header) < lines or not all(
+            line.endswith((b"\n", b"\r")) for line in header
+        ):
+            return None
+        return b"".join(header)
+
+    def _read_rows(self):
+        """Read the rows in the constructor, from ``_csv_options``.
+
+        Files whose rows go past the sniffed prefix are left to ``self.data``
+        and ``iter_data``. The rows of the prefix are still read here, so that
+        a file the reader cannot parse is rejected during detection.
+        """
+        start, end = self._csv_range()
+        if (
+            self.file.head_complete
+            or not self.file.ascii_compatible
+            or (end is not None and end <= len(self.file.head_bytes))
+        ):
+            self.data = self.read_data(self._source_columns(self.columns))
+            return
+
+        head = self.file.head_bytes[start:end]
+        rows = head[: head.rfind(b"\n") + 1]
+        transform = self._csv_transform()
+        if transform is not None:
+            rows = transform(rows)
+        if rows.strip():
+            read_csv(rows, **self._csv_options())
+
+    def read_data(self, include_columns: list[str] | None = None):
+        """Read every row of the file, for parsers that do not in the constructor.
+
+        Only the ``include_columns`` of the file are parsed, all if None.
+        """
+        options = self._read_options(include_columns)
+        if options is None:
+            return []
+
+        with self._open_rows() as stream:
+            return self._finish_data(read_csv(stream, **options), first_row=0)
+
+    def _read_span(self, span, include_columns=None) -> pd.DataFrame:
+        """Read the rows of a ``_time_span``, like ``read_data`` does."""
+        start, end, first_row = span
+        with self._open_rows((start, end)) as stream:
+            data = read_csv(stream, **self._read_options(include_columns))
+        return self._finish_data(data, first_row)
+
+    def _iter_span(
+        self, batch_size: int, span, include_columns=None
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the rows of a ``_time_span``, like ``iter_data`` does."""
+        start, end, first_row = span
+        options = self._read_options(include_columns)
+        with self._open_rows((start, end)) as stream:
+            for data in iter_csv(stream, batch_size, **options):
+                yield self._finish_data(data.reset_index(drop=True), first_row)
+                first_row += len(data)
+
+    def iter_data(
+        self, batch_size: int, include_columns: list[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the parsed rows as DataFrames of at most ``batch_size`` rows.
+
+        Rows not read yet are streamed from the file with ``_csv_options``,
+        so that the whole file is never held in memory, parsing only its
+        ``include_columns`` (all if None). Otherwise ``self.data`` is sliced.
+        """
+        options = self._read_options(include_columns)
+        if self._data is not None or options is None:
+            data = self._rows(include_columns)
+            for start in range(0, len(data), batch_size):
+                yield data.iloc[start : start + batch_size].reset_index(drop=True)
+            return
+
+        first_row = 0
+        with self._open_rows() as stream:
+            for data in iter_csv(stream, batch_size, **options):
+                yield self._finish_data(data.reset_index(drop=True), first_row)
+                first_row += len(data)
+
+    def _file_columns(self) -> list[str] | None:
+        """Columns of the file ``_csv_options`` reads, None if not known ahead."""
+        options = self._csv_options()
+        if options is None or options.get("usecols") is not None:
+            return None
+        return options.get("include_columns") or options.get("names")
+
+    def _read_options(self, include_columns: list[str] | None) -> dict | None:
+        """``_csv_options`` parsing only ``include_columns``, all if None."""
+        options = self._csv_options()
+        if options is None or include_columns is None:
+            return options
+        return {**options, "include_columns": include_columns}
+
+    def _source_columns(self, columns: list[str] | None) -> list[str] | None:
+        """Columns of the file to read for the harmonized ``columns``.
+
+        These are the sources ``MAPPINGS`` gives them (or columns of the same
+        name, see ``_mapped_source``), and the ``DERIVED_FROM`` columns.
+        Returns None, for every column, if ``columns`` is None or the columns
+        of the file are not known before reading it.
+        """
+        file_columns = self._file_columns()
+        if columns is None or file_columns is None:
+            return None
+        sources = set(self.DERIVED_FROM)
+        for harmonized_col, source in self._get_mappings().items():
+            if harmonized_col.value in columns:
+                sources.update([source, harmonized_col.value])
+        return [name for name in file_columns if name in sources]
+
+    def _rows(self, include_columns: list[str] | None) -> pd.DataFrame:
+        """The rows of ``self.data``, with the ``include_columns`` of the file.
+
+        Rows already read without some of these columns (see ``columns``)
+        are read again, those not read yet are read without caching them.
+        """
+        read = self._source_columns(self.columns)
+        if self._csv_options() is None or include_columns == read:
+            return self.data
+        if self._data is None or not (
+            read is None
+            or (include_columns is not None and set(include_columns) <= set(read))
+        ):
+            return self.read_data(include_columns)
+        dropped = set(self._file_columns()) - set(include_columns)
+        return self.data.drop(columns=[c for c in self.data.columns if c in dropped])
+
+    def _resolve_context(self, context):
+        """Return the detection context, running detection if none was handed."""
+        if context is None:
+            context = self.can_parse(self.file)
+        if not context:
+            self._raise_not_supported("can_parse rejected the file")
+        if not isinstance(context, DetectionContext):
+            context = DetectionContext()
+        return context
+
+    @classmethod
+    def signatures(cls) -> list[Signature]:
+        """Declare how files handled by this parser can be recognised.
+
+        Signatures are built from class attributes (header fields, prefixes,
+        markers) and compiled once into the dispatch index used by
+        ``detect_file``. Parsers returning an empty list are only reached
+        through the generic ``can_parse`` fallback loop.
+        """
+        return []
 
     @classmethod
-    def can_parse(cls, parsable: Parsable) -> bool:
+    def can_parse(cls, parsable: Parsable) -> bool | DetectionContext:
         """Lightweight detection: check if this parser can handle the file.
 
-        Subclasses should override this to perform cheap checks (magic bytes,
-        header line) without reading or parsing the entire file. Returns True
-        if the file appears to match, False otherwise.
+        The default implementation checks the parser's ``signatures()`` against
+        the cached file prefix, and returns False for parsers that declare
+        none. Subclasses whose detection cannot be expressed as a signature
+        should override this with their own cheap checks, without reading or
+        parsing the entire file.
 
-        The default implementation returns False — every parser must explicitly
-        implement its own detection logic.
+        Instead of True, a ``DetectionContext`` can be returned to hand what
+        detection read (header row, data offset, preamble metadata) over to
+        the constructor, which then does not need to scan the file again.
         """
+        return any(signature.matches(parsable) for signature in cls.signatures())
+
+    @classmethod
+    def _header_context(cls, parsable: Parsable, header, skip_rows=0):
+        """Build the context of a file whose first line is the header row.
+
+        ``data_offset`` points at the first row read, past the header row and
+        the ``skip_rows`` rows after it.
+        """
+        lines = parsable.iter_lines()
+        _start, end, _line = next(lines)
+        for _start, row_end, _line in islice(lines, skip_rows):
+            end = row_end
+        return DetectionContext(header=header, data_offset=end)
+
+    @classmethod
+    def _divider_context(
+        cls, parsable: Parsable, dividers=1, skip_rows=0, **reader_options
+    ):
+        """Locate the section that follows the n-th ``DIVIDER`` of the file.
+
+        The first row of the section is split as a CSV header with
+        ``SEPARATOR``, and ``data_offset`` points at the first row read, past
+        the header row and the ``skip_rows`` rows after it. Returns False if
+        the file has fewer dividers.
+        """
+        found = 0
+        lines = parsable.iter_lines()
+        for _start, end, line in lines:
+            if found == dividers:
+                reader = csv.reader([line], delimiter=cls.SEPARATOR, **reader_options)
+                header = next(reader, [])
+                for _start, row_end, _line in islice(lines, skip_rows):
+                    end = row_end
+                return DetectionContext(header=header, data_offset=end)
+            # Like str.split, a line ending with DIVIDER counts as a divider
+            if line.endswith(cls.DIVIDER):
+                found += 1
         return False
 
     def _raise_not_supported(self, text):
@@ -81,7 +637,49 @@ class Parser:
             raise NotImplementedError("Subclasses must provide a mapping")
         return mappings
 
-    def harmonize_data(self, data):
+    def prepare_data(self, data):
+        """
+        Derive source columns before MAPPINGS are applied.
+
+        Override in subclasses to build the columns a mapping needs (e.g. a
+        timestamp combined from date and time columns) or to clean values up.
+        Both harmonization engines call it first.
+
+        Args:
+            data: DataFrame to harmonize (self.data)
+
+        Returns:
+            DataFrame holding the source columns of MAPPINGS
+        """
+        return data
+
+    def _parse_timestamps(
+        self, values, name: str, formats=None, errors: str = "raise"
+    ) -> pd.Series:
+        """
+        Parse a column of timestamp text with an exact format.
+
+        The format is sniffed on the first batch holding values and kept for
+        the later batches of the file, so that each column is sniffed once.
+        Rows in another layout are parsed with the other candidate formats
+        writing the day and month in the same order as the sniffed one.
+
+        Args:
+            values: column of timestamp text
+            name: name the sniffed format is kept under
+            formats: candidate formats, TIMESTAMP_FORMATS by default
+            errors: "raise" or "coerce" values no format parses
+
+        Returns:
+            The timestamps, with the index of ``values``
+        """
+        formats = formats or self.TIMESTAMP_FORMATS
+        date_format = self._timestamp_formats.get(name)
+        if date_format is None:
+            date_format = self._timestamp_formats[name] = sniff_format(values, formats)
+        return parse_timestamps(values, formats, date_format, errors)
+
+    def harmonize_data(self, data, columns: list[str] | None = None):
         """
         Remap values parsed using MAPPINGS into harmonized column names.
 
@@ -91,28 +689,128 @@ class Parser:
         subclass), it is preserved.
 
         Args:
-            data: DataFrame to harmonize (a copy of self.data)
+            data: DataFrame to harmonize (self.data)
+            columns: harmonized columns to build, all if None
 
         Returns:
             Harmonized DataFrame with harmonized columns added
         """
+        data = self.prepare_data(data)
+        mappings = self._get_mappings()
+
+        schema = {
+            name: dtype
+            for name, dtype in self.get_harmonization_schema().items()
+            if columns is None or name in columns
+        }
+        df = pd.DataFrame(columns=schema.keys()).astype(schema)
+
+        for harmonized_col in mappings:
+            if harmonized_col.value in schema:
+                df[harmonized_col.value] = self._harmonized_source(data, harmonized_col)
+
+        for name, array in self._derived_columns(data, columns).items():
+            df[name] = pd.array(array, dtype=pd.ArrowDtype(array.type))
+
+        return df
+
+    def harmonize_table(self, data, columns: list[str] | None = None) -> pa.Table:
+        """
+        Remap values parsed using MAPPINGS straight into an Arrow table.
+
+        Same mapping rules and column order as ``harmonize_data``, without the
+        intermediate DataFrame: only the mapped source columns are converted
+        (numeric ones without copying their values) and the derived columns
+        are appended as the Arrow arrays they are built as.
+
+        Args:
+            data: DataFrame to harmonize (self.data)
+            columns: harmonized columns to build, all if None
+
+        Returns:
+            Harmonized table
+        """
+        return self._harmonize_prepared(self.prepare_data(data), columns)
+
+    def _harmonize_prepared(self, data, columns: list[str] | None = None) -> pa.Table:
+        """``harmonize_table`` of rows already through ``prepare_data``."""
+        mappings = self._get_mappings()
+
+        # Columns without a source keep the type declared in the schema
+        arrays = {
+            field.name: pa.nulls(len(data), field.type)
+            for field in self._harmonization_arrow_schema()
+            if columns is None or field.name in columns
+        }
+        for harmonized_col in mappings:
+            if harmonized_col.value not in arrays:
+                continue
+            source = self._harmonized_source(data, harmonized_col)
+            arrays[harmonized_col.value] = (
+                pa.nulls(len(data))
+                if source is None
+                else pa.array(source, from_pandas=True)
+            )
+        arrays.update(self._derived_columns(data, columns))
+
+        return pa.table(arrays)
+
+    def _get_mappings(self) -> dict:
         mappings = getattr(self, "MAPPINGS", {})
 
         if not mappings:
             raise NotImplementedError("Subclasses must provide a mapping")
+        return mappings
 
-        schema = self.get_harmonization_schema()
-        df = pd.DataFrame(columns=schema.keys()).astype(schema)
+    def _mapped_source(self, data, harmonized_col) -> pd.Series | None:
+        """Return the source column of a harmonized column, or None if missing."""
+        source_col = self.MAPPINGS[harmonized_col]
+        if source_col is not None and source_col in data.columns:
+            return data[source_col]
+        if harmonized_col.value in data.columns:
+            return data[harmonized_col.value]
+        return None
 
-        for harmonized_col, source_col in mappings.items():
-            if source_col is not None and source_col in data.columns:
-                df[harmonized_col.value] = data[source_col]
-            elif harmonized_col.value in data.columns:
-                df[harmonized_col.value] = data[harmonized_col.value]
-            else:
-                df[harmonized_col.value] = None
+    def _harmonized_source(self, data, harmonized_col) -> pd.Series | None:
+        """Return the source column of a harmonized column, see ``_mapped_source``.
 
-        return df
+        Text mapped to a column the schema types as datetimes is parsed into
+        timestamps, with the format sniffed by ``_parse_timestamps``. Text
+        with a UTC offset (e.g. Interrex's trailing Z) is converted to naive
+        UTC, like the timestamps of the other formats.
+        """
+        source = self._mapped_source(data, harmonized_col)
+        if (
+            source is not None
+            and pd.api.types.is_string_dtype(source.dtype)
+            and str(self.get_harmonization_schema()[harmonized_col.value]).startswith(
+                "datetime64"
+            )
+        ):
+            # Values left as text by the parser (e.g. Ornitela's UTC_timestamp)
+            timestamps = self._parse_timestamps(
+                source, harmonized_col.value, errors="coerce"
+            )
+            if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+                timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+            return timestamps
+        return source
+
+    def _derived_columns(self, data, columns=None) -> dict[str, pa.Array]:
+        """
+        Harmonized columns that are not copied from a source column.
+
+        Override in mixins to compute columns (e.g. a geometry) from the
+        prepared data, when they are among ``columns`` (or it is None).
+        """
+        return {}
+
+    def _harmonization_arrow_schema(self) -> pa.Schema:
+        """Arrow types of the empty typed frame ``harmonize_data`` starts from."""
+        schema = self.get_harmonization_schema()
+        return pa.Schema.from_pandas(
+            pd.DataFrame(columns=schema.keys()).astype(schema), preserve_index=False
+        )
 
     def get_harmonization_schema(self) -> dict:
         """
@@ -125,23 +823,437 @@ class Parser:
             "Subclasses must implement get_harmonization_schema()"
         )
 
-    def as_table(self, geometry_encoding: str = "wkb") -> pa.Table:
-        # Build JSON array directly from row iteration to avoid materializing
-        # both a list-of-dicts and a list-of-JSON-strings simultaneously
-        original_json = pa.array(
+    def as_table(
+        self,
+        geometry_encoding: str = "wkb",
+        original_data: str = OriginalData.JSON,
+        engine: str = HarmonizationEngine.ARROW,
+        quality_control: str = QualityControl.NONE,
+        time_range: tuple | None = None,
+        columns: list[str] | None = None,
+        filters: list | None = None,
+    ) -> pa.Table:
+        columns = self.columns if columns is None else columns
+        filters = self._parse_filters(filters)
+        harmonized = self._harmonized_columns(columns, time_range, quality_control)
+        include_columns = self._include_columns(harmonized, filters)
+        span = None
+        if OriginalData(original_data) == OriginalData.LINE:
+            # Rejects the files without source lines before reading any row.
+            # The lines are sliced from the file as a whole, not from a span
+            self._line_range()
+        elif time_range is not None:
+            span = self._time_span(*time_range)
+        data = (
+            self._rows(include_columns)
+            if span is None
+            else self._read_span(span, include_columns)
+        )
+        table = self._build_table(
+            data,
+            geometry_encoding,
+            original_data,
+            engine,
+            columns=harmonized,
+            filters=filters,
+        )
+        table = self._time_filter(table, time_range)
+        if len(table) == 0:
+            raise ValueError("Harmonized data is empty, cannot create table")
+        table = self._quality_control(table, quality_control)
+        return self._select_columns(table, columns)
+
+    def iter_batches(
+        self, batch_size: int = BATCH_SIZE, **kwargs
+    ) -> Iterator[pa.RecordBatch]:
+        """Yield the ``as_table`` output as record batches of ``batch_size`` rows.
+
+        Each batch is read, harmonized and converted on its own, so parsers
+        that read their file in chunks (see ``iter_data``) only hold one batch
+        in memory. Empty columns of later batches are cast to the type of the
+        first batch, other type changes (e.g. from rows read by pandas, which
+        types each batch on its own) raise ``pyarrow.ArrowInvalid``. With
+        ``quality_control``, a batch is checked once the next one is built, so
+        that the rows on both sides of a batch edge are compared. With
+        ``time_range``, only the rows of that period are read, see
+        ``_time_span``, and with ``columns`` only the columns they need. With
+        ``filters``, the rows of each batch are filtered as they are read, see
+        ``_build_table``.
+
+        Args:
+            batch_size: number of rows of each batch
+            kwargs: options of ``as_table``
+
+        Yields:
+            Record batches of the harmonized table
+        """
+        if OriginalData(kwargs.get("original_data", OriginalData.JSON)) == (
+            OriginalData.LINE
+        ):
+            # Source lines are sliced from the file as a whole
+            yield from self.as_table(**kwargs).to_batches(batch_size)
+            return
+
+        quality_control = QualityControl(
+            kwargs.pop("quality_control", QualityControl.NONE)
+        )
+        columns = kwargs.pop("columns", None)
+        columns = self.columns if columns is None else columns
+        filters = self._parse_filters(kwargs.pop("filters", None))
+        harmonized = self._harmonized_columns(
+            columns, kwargs.get("time_range"), quality_control
+        )
+        tables = self._iter_tables(
+            batch_size, columns=harmonized, filters=filters, **kwargs
+        )
+        if quality_control == QualityControl.NONE:
+            for table in tables:
+                table = self._select_columns(table, columns)
+                yield from table.combine_chunks().to_batches(batch_size)
+            return
+
+        previous = table = None
+        for following in chain(tables, [None]):
+            if table is not None:
+                checked = self._quality_control(
+                    table, quality_control, previous, following
+                )
+                checked = self._select_columns(checked, columns)
+                yield from checked.combine_chunks().to_batches(batch_size)
+            previous, table = table, following
+
+    def _iter_tables(
+        self,
+        batch_size: int,
+        time_range: tuple | None = None,
+        columns: list[str] | None = None,
+        filters: list[Filter] | None = None,
+        **kwargs,
+    ) -> Iterator[pa.Table]:
+        """Build the tables of the batches of ``iter_data``, with one schema."""
+        include_columns = self._include_columns(columns, filters)
+        span = None if time_range is None else self._time_span(*time_range)
+        batches = (
+            self.iter_data(batch_size, include_columns)
+            if span is None
+            else self._iter_span(batch_size, span, include_columns)
+        )
+        schema = None
+        for data in batches:
+            if len(data) == 0:
+                continue
+            table = self._build_table(data, columns=columns, filters=filters, **kwargs)
+            table = self._time_filter(table, time_range)
+            if len(table) == 0:
+                continue
+            if schema is None:
+                schema = table.schema
+            elif not table.schema.equals(schema):
+                table = self._cast_batch(table, schema)
+            yield table
+
+        if schema is None:
+            raise ValueError("Harmonized data is empty, cannot create table")
+
+    def _harmonized_columns(
+        self,
+        columns: list[str] | None,
+        time_range: tuple | None = None,
+        quality_control: str = QualityControl.NONE,
+    ) -> list[str] | None:
+        """Harmonized columns to build for the ``columns`` of a table.
+
+        These are the requested columns, and the ones the ``time_range`` filter
+        and the quality checks read, in the order of the harmonization schema.
+        Returns None, for all of them, if ``columns`` is None.
+        """
+        if columns is None:
+            return None
+        schema = self._check_columns(columns)
+        needed = set(columns)
+        if time_range is not None:
+            needed.add("timestamp")
+        if QualityControl(quality_control) != QualityControl.NONE:
+            needed.update(self.QUALITY_COLUMNS)
+        return [name for name in schema if name in needed]
+
+    def _check_columns(self, columns: list[str]) -> dict:
+        """Raise a ValueError for names that are not harmonized columns.
+
+        Returns:
+            The harmonization schema
+        """
+        schema = self.get_harmonization_schema()
+        unknown = [name for name in columns if name not in schema]
+        if unknown:
+            raise ValueError(
+                f"{self.__class__.__name__}: unknown columns {unknown}, "
+                f"expected some of {list(schema)}"
+            )
+        return schema
+
+    def _parse_filters(self, filters) -> list[Filter]:
+        """Read the ``filters`` of a table, see ``filters.parse_filters``."""
+        filters = parse_filters(filters)
+        self._check_columns([condition.column for condition in filters])
+        return filters
+
+    def _include_columns(
+        self, columns: list[str] | None, filters: list[Filter] | None
+    ) -> list[str] | None:
+        """Source columns to read for the harmonized ``columns`` and ``filters``."""
+        if columns is not None and filters:
+            columns = [*columns, *(condition.column for condition in filters)]
+        return self._source_columns(columns)
+
+    def _filter_table(self, data, columns: list[str]) -> pa.Table:
+        """
+        Harmonized ``columns`` of prepared rows, as the filters compare them.
+
+        Override in mixins to give filters a cheaper stand-in for a derived
+        column (e.g. the coordinates of a geometry).
+        """
+        return self._harmonize_prepared(data, columns)
+
+    @staticmethod
+    def _select_columns(table: pa.Table, columns: list[str] | None) -> pa.Table:
+        """Keep the ``columns`` of a table, with ``qc_flags`` and the ``_`` ones."""
+        if columns is None:
+            return table
+        return table.select(
+            [
+                name
+                for name in table.column_names
+                if name in columns or name == "qc_flags" or name.startswith("_")
+            ]
+        )
+
+    def _time_filter(self, table: pa.Table, time_range: tuple | None) -> pa.Table:
+        """Keep the rows from ``start`` (included) to ``end`` (excluded).
+
+        Rows without a timestamp are dropped. Either end can be None, and
+        timestamps without a timezone are taken as UTC.
+        """
+        if time_range is None:
+            return table
+        timestamps = table.column("timestamp")
+        if not pa.types.is_timestamp(timestamps.type):
+            return table.slice(0, 0)
+        timestamps = timestamps.cast(pa.timestamp("us"))
+        start, end = (
+            None if value is None else pa.scalar(as_utc(value), pa.timestamp("us"))
+            for value in time_range
+        )
+        keep = pc.is_valid(timestamps)
+        if start is not None:
+            keep = pc.and_(keep, pc.greater_equal(timestamps, start))
+        if end is not None:
+            keep = pc.and_(keep, pc.less(timestamps, end))
+        return table.filter(keep)
+
+    def _time_span(self, start, end) -> tuple[int, int, int] | None:
+        """
+        Locate the rows from ``start`` to ``end`` in the file.
+
+        For ``TIME_SORTED`` parsers reading their rows with ``_csv_options``,
+        the ``_csv_range`` is binary searched: each step reads
+        ``SEARCH_SIZE`` bytes at an offset, skips to the next line and parses
+        its timestamp. The span found holds a few rows on either side, which
+        ``_time_filter`` drops.
+
+        Returns:
+            ``(start, end, first_row)``: the byte span of the rows and the
+            index of its first row (0 when unknown), or None to read every
+            row instead
+        """
+        options = self._csv_options()
+        if (
+            not self.TIME_SORTED
+            or options is None
+            or self._data is not None
+            or not self.file.ascii_compatible
+        ):
+            return None
+        range_start, range_end = self._csv_range()
+        if range_end is None:
+            range_end = self.file.size
+        header = self._header_bytes(range_start, range_end, options)
+        if header is None:
+            return None
+
+        def probe(offset):
+            return self._probe_timestamp(
+                offset, range_start + len(header), range_end, header, options
+            )
+
+        low, high = range_start + len(header), range_end
+        if start is not None:
+            low = self._search_offset(low, high, as_utc(start), probe, upper=False)
+        if end is not None:
+            high = self._search_offset(low, high, as_utc(end), probe, upper=True)
+        return low, high, 0
+
+    def _search_offset(self, low: int, high: int, timestamp, probe, upper: bool):
+        """Binary search the lines from ``low`` to ``high`` for a timestamp.
+
+        Returns the start of a line before the first row at or after
+        ``timestamp``, or with ``upper`` the start of a line after the last
+        row before it. The search stops once the offsets are ``SEARCH_SIZE``
+        apart, or when a step finds no timestamp in the range.
+        """
+        while high - low > self.SEARCH_SIZE:
+            middle = (low + high) // 2
+            found = probe(middle)
+            if found is None or found[0] >= high:
+                break
+            line_start, line_timestamp = found
+            if line_timestamp < timestamp:
+                low = middle if upper else line_start
+            else:
+                high = line_start if upper else middle
+        return high if upper else low
+
+    def _probe_timestamp(self, offset, data_start, data_end, header, options):
+        """The start and timestamp of the first line after ``offset`` with one."""
+        block = self.file.read_range(offset, min(offset + self.SEARCH_SIZE, data_end))
+        if offset > data_start:
+            # Resynchronize on the start of the next line
+            skip = block.find(b"\n") + 1
+            if skip == 0:
+                return None
+            offset, block = offset + skip, block[skip:]
+
+        for line in block.splitlines(keepends=True):
+            if not line.endswith(b"\n") and offset + len(line) < data_end:
+                # Cut by the end of the block
+                return None
+            try:
+                data = self._scan_rows(header + line, options)
+            except (pa.ArrowInvalid, ValueError):
+                data = []
+            if len(data):
+                timestamps = self._row_timestamps(self._finish_data(data, 0))
+                if timestamps is not None and timestamps.notna().any():
+                    return offset, as_utc(timestamps.dropna().iloc[0])
+            offset += len(line)
+        return None
+
+    def _row_timestamps(self, data) -> pd.Series | None:
+        """Harmonized timestamps of rows, without building the other columns."""
+        data = self.prepare_data(data)
+        for harmonized_col in self._get_mappings():
+            if harmonized_col.value == "timestamp":
+                return self._harmonized_source(data, harmonized_col)
+        return None
+
+    def _quality_control(
+        self,
+        table: pa.Table,
+        quality_control: str,
+        previous: pa.Table | None = None,
+        following: pa.Table | None = None,
+    ) -> pa.Table:
+        """Flag or drop the rows of a built table failing the quality checks.
+
+        The ``qc_flags`` column is added before the ``_original_data`` and
+        metadata columns. Parsers without checks are left unchanged.
+
+        Args:
+            table: table built by ``_build_table``
+            quality_control: ``QualityControl`` mode
+            previous: table of the batch before, if any
+            following: table of the batch after, if any
+        """
+        quality_control = QualityControl(quality_control)
+        if quality_control == QualityControl.NONE:
+            return table
+        flags = self._quality_flags(table, previous, following)
+        if flags is None:
+            return table
+
+        index = next(
             (
-                json.dumps(row, default=str)
-                for row in self.data.to_dict(orient="records")
+                index
+                for index, name in enumerate(table.column_names)
+                if name.startswith("_")
             ),
-            type=pa.json_(pa.large_utf8()),
+            table.num_columns,
         )
+        table = table.add_column(index, "qc_flags", flags)
+        if quality_control == QualityControl.DROP:
+            table = table.filter(pc.equal(flags, 0))
+        return table
 
-        harmonized_data = self.harmonize_data(self.data)
+    def _quality_flags(
+        self,
+        table: pa.Table,
+        previous: pa.Table | None = None,
+        following: pa.Table | None = None,
+    ) -> pa.Array | None:
+        """
+        Return the ``quality.QCFlag`` flags of the rows of a built table.
 
-        if len(harmonized_data) == 0:
-            raise ValueError("Harmonized data is empty, cannot create table")
+        Override in mixins whose data can be checked (e.g. GPS fixes), None
+        for no checks. ``previous`` and ``following`` are the tables of the
+        neighbouring batches, when the table is one of ``iter_batches``.
+        """
+        return None
+
+    def _cast_batch(self, table: pa.Table, schema: pa.Schema) -> pa.Table:
+        for field, expected in zip(table.schema, schema, strict=False):
+            if not field.equals(expected) and not pa.types.is_null(field.type):
+                raise pa.ArrowInvalid(
+                    f"{self.__class__.__name__}: column {field.name} is "
+                    f"{field.type} in a batch, {expected.type} in the first one"
+                )
+        return table.cast(schema)
+
+    def _build_table(
+        self,
+        data,
+        geometry_encoding: str = "wkb",
+        original_data: str = OriginalData.JSON,
+        engine: str = HarmonizationEngine.ARROW,
+        columns: list[str] | None = None,
+        filters: list[Filter] | None = None,
+    ) -> pa.Table:
+        """
+        Harmonize rows as read into the table of ``as_table``.
+
+        The ``filters`` are evaluated on the prepared rows first, with only
+        the columns they compare harmonized, so that the rows they reject get
+        no original data, geometry or other columns built. The rows kept are
+        not prepared again.
+        """
+        mode = OriginalData(original_data)
+        prepared = keep = None
+        if filters:
+            prepared = self.prepare_data(data.copy(deep=False))
+            compared = list(dict.fromkeys(condition.column for condition in filters))
+            keep = filter_mask(
+                self._filter_table(prepared, compared), filters
+            ).to_numpy(zero_copy_only=False)
+            prepared = prepared[keep].reset_index(drop=True)
+            if mode != OriginalData.LINE:
+                data = data[keep].reset_index(drop=True)
 
-        table = pa.Table.from_pandas(harmonized_data, preserve_index=False)
+        # Built before harmonization, which adds columns to the data
+        original = self._original_data(data, mode)
+        if keep is not None and mode == OriginalData.LINE:
+            # Source lines are sliced for all the rows of the file
+            original = filter_views(original, keep)
+            data = data[keep].reset_index(drop=True)
+
+        if HarmonizationEngine(engine) == HarmonizationEngine.ARROW:
+            table = (
+                self.harmonize_table(data, columns)
+                if prepared is None
+                else self._harmonize_prepared(prepared, columns)
+            )
+        else:
+            table = pa.Table.from_pandas(
+                self.harmonize_data(data, columns), preserve_index=False
+            )
 
         if geometry_encoding == "wkb" and "geometry" in table.column_names:
             geometry_index = table.column_names.index("geometry")
@@ -151,10 +1263,8 @@ class Parser:
                 ga.as_wkb(table.column("geometry")),
             )
 
-        table = table.append_column(
-            "_original_data",
-            original_json,
-        )
+        if original is not None:
+            table = table.append_column("_original_data", original)
         table = table.append_column(
             "_datatype", pa.array([self.DATATYPE] * len(table), pa.string())
         )
@@ -167,17 +1277,284 @@ class Parser:
         )
         return table
 
-    def write_parquet(self, path: pathlib.Path, filename: str | None = None, **kwargs):
+    def _original_data(self, data, mode: OriginalData) -> pa.Array | None:
+        if mode == OriginalData.JSON:
+            # Build JSON array directly from row iteration to avoid materializing
+            # both a list-of-dicts and a list-of-JSON-strings simultaneously
+            return pa.array(
+                (
+                    json.dumps(row, default=str)
+                    for row in data.to_dict(orient="records")
+                ),
+                type=pa.json_(pa.large_utf8()),
+            )
+        if mode == OriginalData.STRUCT:
+            return self._original_struct(data)
+        if mode == OriginalData.LINE:
+            return self._original_lines(data)
+        return None
+
+    def _original_struct(self, data) -> pa.StructArray:
+        arrays = []
+        for column in data.columns:
+            values = data[column]
+            try:
+                array = pa.array(values, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Object columns mixing types are kept as text
+                array = pa.array(values.astype("string"), from_pandas=True)
+            # Columns read in several blocks are backed by chunked arrays
+            if isinstance(array, pa.ChunkedArray):
+                array = array.combine_chunks()
+            arrays.append(array)
+        return pa.StructArray.from_arrays(
+            arrays, names=[str(column) for column in data.columns]
+        )
+
+    def _line_range(self) -> tuple[int, int | None]:
+        """Byte range ``(start, end)`` of the source lines of the rows.
+
+        It is the ``_csv_range`` past the lines the reader skips or reads as
+        names. Raises ValueError for the files ``original_data='line'`` is not
+        available for: parsers that do not read their rows with
+        ``_csv_options`` and files that are not UTF-8 (or ASCII).
+        """
+        options = self._csv_options()
+        if options is None:
+            raise ValueError(
+                f"{self.__class__.__name__}: original_data='line' needs the "
+                f"byte range of the data rows, which this parser does not record"
+            )
+
+        encoding = codecs.lookup(self.file.encoding or "ascii").name
+        if encoding not in ("ascii", "utf-8", "utf-8-sig"):
+            raise ValueError(
+                f"{self.__class__.__name__}: original_data='line' needs UTF-8 "
+                f"data, the file is {encoding}"
+            )
+
+        start, end = self._csv_range()
+        header = self._header_bytes(start, end, options)
+        if header is None:
+            raise ValueError(
+                f"{self.__class__.__name__}: original_data='line' found no "
+                f"data rows after the header lines"
+            )
+        return start + len(header), end
+
+    def _kept_lines(self, lines: pa.Array) -> pa.Array:
+        """The source lines the reader reads a row from.
+
+        Empty lines are already left out. Override for parsers whose reader
+        drops other lines, e.g. with an ``invalid_row_handler``.
+        """
+        return lines
+
+    def _original_lines(self, data) -> pa.Array:
+        """Slice the source line of each row out of the file.
+
+        The lines are those of ``_line_range``, each non-empty line holding
+        exactly one row.
+        """
+        start, end = self._line_range()
+        with self.file.get_view() as view:
+            view.seek(start)
+            buffer = view.read_buffer(None if end is None else end - start)
+        lines = self._kept_lines(line_views(buffer))
+
+        if len(lines) != len(data):
+            raise ValueError(
+                f"{self.__class__.__name__}: original_data='line' found "
+                f"{len(lines)} source lines for {len(data)} rows"
+            )
+        return lines
+
+    def write_parquet(
+        self,
+        path: pathlib.Path,
+        filename: str | None = None,
+        batch_size: int | None = None,
+        **kwargs,
+    ) -> int:
+        """Write the ``as_table`` output to ``<path>/<filename>.parquet``.
+
+        With ``batch_size``, the table is written through ``iter_batches``, a
+        row group per batch, instead of being built whole. If a batch does not
+        fit the types of the first ones, the file is written again from
+        ``as_table``.
+
+        Returns:
+            The number of rows written
+        """
         if filename:
             filename = pathlib.Path(filename)
         else:
             filename = self.file._file_path.name
+        target = str(path / f"{filename}.parquet")
 
-        pq.write_table(self.as_table(**kwargs), str(path / f"{filename}.parquet"))
+        if batch_size is not None:
+            try:
+                return self._write_parquet_batches(target, batch_size, **kwargs)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as error:
+                logger.debug(f"Batches do not share a schema, writing whole: {error}")
+
+        table = self.as_table(**kwargs)
+        pq.write_table(table, target)
+        return len(table)
+
+    def _write_parquet_batches(self, target: str, batch_size: int, **kwargs) -> int:
+        writer = None
+        rows = 0
+        try:
+            for batch in self.iter_batches(batch_size, **kwargs):
+                if writer is None:
+                    writer = pq.ParquetWriter(target, batch.schema)
+                writer.write_batch(batch)
+                rows += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    def write_dataset(self, path: UPath, device: str | None = None, **kwargs):
+        """Append the table to the hive-partitioned dataset rooted at ``path``."""
+        with DatasetWriter(path) as writer:
+            writer.write(self.as_table(**kwargs), device=device)
 
     def write_csv(self, path, **kwargs):
         pacsv.write_csv(self.as_table(**kwargs), str(path))
 
+    def scan(self, count_rows: bool = False) -> ScanSummary:
+        """Summarize the file without reading all of its rows.
+
+        Parsers reading their rows with ``_csv_options`` only have the rows of
+        a few windows of ``_csv_range`` parsed (see ``scan.window_ranges``),
+        each behind the header lines of the range, so that they are read like
+        the whole range would be. The first and last timestamps come from the
+        first and last windows, the bounding box from all of them, and the
+        number of rows is estimated from the bytes per row of the windows.
+        Files read whole by the constructor, ranges the windows would cover
+        and the other parsers are summarized from every row instead.
+
+        Args:
+            count_rows: count the lines of the range instead of estimating
+                the number of rows, which reads the whole range but parses
+                none of it
+
+        Returns:
+            The ``ScanSummary`` of the file
+        """
+        options = self._csv_options()
+        if self._data is None and options is not None and self.file.ascii_compatible:
+            try:
+                summary = self._scan_windows(options, count_rows)
+            except (pa.ArrowInvalid, ValueError) as error:
+                logger.debug(f"Windows could not be read, scanning every row: {error}")
+                summary = None
+            if summary is not None:
+                return summary
+
+        tables = self._iter_tables(BATCH_SIZE, original_data=OriginalData.NONE)
+        return self._scan_summary(tables, exact=True)
+
+    def _scan_windows(self, options: dict, count_rows: bool) -> ScanSummary | None:
+        """Summarize the file from windows of its rows, None to read them all."""
+        start, end = self._csv_range()
+        if end is None:
+            end = self.file.size
+
+        header = self._header_bytes(start, end, options)
+        if header is None:
+            return None
+        data_start = start + len(header)
+        windows = window_ranges(data_start, end, self.SCAN_SIZE, self.SCAN_WINDOWS)
+        if windows is None:
+            return None
+        # The first window ends with the cached prefix, not to read it again
+        first_start, first_end = windows[0]
+        if first_start < len(self.file.head_bytes) < first_end:
+            windows[0] = first_start, len(self.file.head_bytes)
+
+        blocks = [
+            whole_lines(
+                self.file.read_range(window_start, window_end),
+                first=window_start == data_start,
+                last=window_end == end,
+            )
+            for window_start, window_end in windows
+        ]
+        frames = [self._scan_rows(header + block, options) for block in blocks]
+        parsed = sum(len(data) for data in frames)
+        if parsed == 0:
+            return None
+
+        bytes_per_row = sum(len(block) for block in blocks) / parsed
+        if count_rows:
+            with self.file.get_view() as view:
+                rows = count_lines(view, data_start, end)
+        else:
+            rows = round((end - data_start) / bytes_per_row)
+
+        tables = []
+        for (window_start, _end), data in zip(windows, frames, strict=True):
+            if len(data) == 0:
+                continue
+            # Row of the file the window starts at, for _finish_data
+            if window_start == data_start:
+                first_row = 0
+            elif window_start == windows[-1][0]:
+                first_row = max(rows - len(data), 0)
+            else:
+                first_row = round((window_start - data_start) / bytes_per_row)
+            data = self._finish_data(data.reset_index(drop=True), first_row)
+            tables.append(self._build_table(data, original_data=OriginalData.NONE))
+        return self._scan_summary(tables, rows=rows, exact=False)
+
+    def _scan_rows(self, rows: bytes, options: dict) -> pd.DataFrame:
+        transform = self._csv_transform()
+        if transform is not None:
+            rows = transform(rows)
+        return read_csv(rows, **options)
+
+    def _scan_summary(
+        self, tables, rows: int | None = None, exact: bool = False
+    ) -> ScanSummary:
+        """Summarize built tables, in file order, counting their rows if None."""
+        first = last = device = bounds = None
+        counted = 0
+        for table in tables:
+            counted += len(table)
+            bounds = merge_bounds(bounds, self._bounds(table))
+            timestamp = first_value(table, "timestamp", last=True)
+            if timestamp is not None:
+                first = first_value(table, "timestamp") if first is None else first
+                last = timestamp
+            if device is None:
+                device = first_value(table, "id")
+        if device is None:
+            # Like the device partition of write_dataset
+            device = pathlib.PurePosixPath(self.file._file_path.name).stem
+
+        return ScanSummary(
+            path=str(self.file._file_path),
+            parser=self.__class__.__name__,
+            datatype=self.DATATYPE,
+            device=str(device),
+            first_timestamp=first,
+            last_timestamp=last,
+            rows=counted if rows is None else rows,
+            bbox=bounds,
+            exact=exact,
+        )
+
+    def _bounds(self, table: pa.Table) -> tuple[float, float, float, float] | None:
+        """
+        Bounding box of the rows of a built table, for ``scan``.
+
+        Override in mixins of located data (e.g. GPS fixes), None otherwise.
+        """
+        return None
+
 
 class CSVParser(Parser):
     DATATYPE = "generic_csv"
@@ -185,54 +1562,37 @@ class CSVParser(Parser):
     SEPARATOR = ","
     SKIP_INITIAL_SPACE = True
     HEADER = 0
+    DECIMAL_POINT = "."
 
-    def _check_headers(self, header):
-        if header != self.FIELDS:
-            self._raise_not_supported(
-                f"Stream have a header different than expected, "
-                f"{header} != {self.FIELDS}"
-            )
+    @classmethod
+    def signatures(cls):
+        """The CSV header must match FIELDS."""
+        return [Signature.header(cls.FIELDS, cls.SEPARATOR, cls.SKIP_INITIAL_SPACE)]
 
     @classmethod
-    def can_parse(cls, parsable: Parsable) -> bool:
-        """Check if the CSV header matches FIELDS without reading the full file."""
-        try:
-            with parsable.get_stream(binary=False) as stream:
-                if not stream.seekable():
-                    return False
-                reader = csv.reader(
-                    stream,
-                    delimiter=cls.SEPARATOR,
-                    skipinitialspace=cls.SKIP_INITIAL_SPACE,
-                )
-                header = next(reader)
-                return header == cls.FIELDS
-        except (StopIteration, UnicodeDecodeError):
+    def can_parse(cls, parsable: Parsable):
+        """Check the CSV header against FIELDS, keeping it for the constructor."""
+        if not super().can_parse(parsable):
             return False
+        return cls._header_context(parsable, list(cls.FIELDS))
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self._read_rows()
 
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            reader = csv.reader(
-                stream,
-                delimiter=self.SEPARATOR,
-                skipinitialspace=self.SKIP_INITIAL_SPACE,
-            )
-            header = next(reader)
-            self._check_headers(header)
-            stream.seek(0)
-
-            self.data = pd.read_csv(
-                stream,
-                header=self.HEADER,
-                names=self.FIELDS,
-                sep=self.SEPARATOR,
-                index_col=False,
-            )
+    def _csv_options(self) -> dict:
+        return {
+            "names": self.FIELDS,
+            "separator": self.SEPARATOR,
+            "skip_rows": self.HEADER + 1,
+            "decimal_point": self.DECIMAL_POINT,
+            "encoding": self.file.encoding,
+        }
 
 
 class ExcelParser(Parser):
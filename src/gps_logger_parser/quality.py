@@ -0,0 +1,134 @@
+"""
+Quality control of GPS fixes.
+
+Checks are computed with NumPy over whole columns, in a single pass, and
+reported as bit flags (``QCFlag``) in the ``qc_flags`` column of the table.
+"""
+
+import enum
+from typing import NamedTuple
+
+import numpy as np
+
+# Mean radius of the Earth, in meters
+EARTH_RADIUS = 6_371_008.8
+
+
+class QCFlag(enum.IntFlag):
+    """Checks a fix failed, combined in ``qc_flags``
+
+    - ``SPEED``: reaching the fix and leaving it both imply a speed above
+      ``MAX_SPEED``
+    """
+
+    SPEED = 1
+
+
+class Fix(NamedTuple):
+    """A fix outside the checked columns, e.g. the last one of a batch"""
+
+    timestamp: np.datetime64
+    latitude: float
+    longitude: float
+
+
+def haversine(latitude1, longitude1, latitude2, longitude2) -> np.ndarray:
+    """Great-circle distances in meters between positions in degrees."""
+    latitude1, longitude1, latitude2, longitude2 = (
+        np.radians(values) for values in (latitude1, longitude1, latitude2, longitude2)
+    )
+    a = (
+        np.sin((latitude2 - latitude1) / 2) ** 2
+        + np.cos(latitude1)
+        * np.cos(latitude2)
+        * np.sin((longitude2 - longitude1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def valid_positions(latitudes, longitudes) -> np.ndarray:
+    """Mask of the positions that are known.
+
+    Loggers write 0, 0 for fixes without a position, which are not known.
+    """
+    return ~(
+        np.isnan(latitudes)
+        | np.isnan(longitudes)
+        | ((latitudes == 0) & (longitudes == 0))
+    )
+
+
+def valid_fixes(timestamps, latitudes, longitudes) -> np.ndarray:
+    """Mask of the fixes with a timestamp and a known position."""
+    return ~np.isnat(timestamps) & valid_positions(latitudes, longitudes)
+
+
+def speed_outliers(
+    timestamps,
+    latitudes,
+    longitudes,
+    max_speed: float,
+    before: Fix | None = None,
+    after: Fix | None = None,
+) -> np.ndarray:
+    """Flag the fixes only reachable at an impossible speed.
+
+    Speeds are implied by the distance and time between each fix and the
+    previous one with a timestamp and a position. A fix is an outlier when
+    both reaching it and leaving it are faster than ``max_speed``, so that a
+    single wrong fix does not take the next one with it. The first and last
+    fixes only have one of these speeds: they are outliers when it is too
+    fast while their neighbour's other speed is not, so that the wrong fix
+    is told apart from the good one at the end.
+
+    Args:
+        timestamps: datetime64 timestamps of the fixes, in time order
+        latitudes: latitudes in degrees
+        longitudes: longitudes in degrees
+        max_speed: highest plausible speed, in meters per second
+        before: last fix before these ones, e.g. from the previous batch
+        after: first fix after these ones, e.g. from the next batch
+
+    Returns:
+        Boolean mask of the outliers, False for fixes that cannot be checked
+    """
+    timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+    latitudes = np.asarray(latitudes, dtype="float64")
+    longitudes = np.asarray(longitudes, dtype="float64")
+    outliers = np.zeros(len(timestamps), dtype=bool)
+
+    positions = np.flatnonzero(valid_fixes(timestamps, latitudes, longitudes))
+    before, after = ([] if fix is None else [fix] for fix in (before, after))
+
+    def column(values, field):
+        return np.concatenate(
+            [
+                np.array([getattr(fix, field) for fix in before], values.dtype),
+                values[positions],
+                np.array([getattr(fix, field) for fix in after], values.dtype),
+            ]
+        )
+
+    times = column(timestamps, "timestamp").astype("int64")
+    latitudes = column(latitudes, "latitude")
+    longitudes = column(longitudes, "longitude")
+    if len(times) < 2:
+        return outliers
+
+    distances = haversine(
+        latitudes[:-1], longitudes[:-1], latitudes[1:], longitudes[1:]
+    )
+    seconds = np.abs(np.diff(times)) / 1_000_000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Fixes apart without time in between are infinitely fast
+        too_fast = distances / seconds > max_speed
+
+    # Speed reaching each fix and leaving it, the ends have only one
+    reaching = np.concatenate([[False], too_fast])
+    leaving = np.concatenate([too_fast, [False]])
+    flagged = reaching & leaving
+    if len(too_fast) > 1:
+        flagged[0] = too_fast[0] and not too_fast[1]
+        flagged[-1] = too_fast[-1] and not too_fast[-2]
+    outliers[positions] = flagged[len(before) : len(before) + len(positions)]
+    return outliers
@@ -0,0 +1,444 @@
+"""
+CSV reading layer shared by the text parsers.
+
+Rows are read with ``pyarrow.csv``, on all cores (``use_threads``) and in
+blocks of ``block_size`` bytes, then handed to the parsers as a DataFrame
+typed the way ``pd.read_csv`` types it:
+
+- dates and times stay text, the parsers build timestamps themselves
+- empty columns are float NaN
+- empty strings are missing values
+- numbers are read with the ``decimal_point`` of the file (e.g. ``70,387``)
+
+Rows pyarrow cannot read (e.g. a field count that does not match the
+columns) fall back to ``pd.read_csv`` with the same options, which is more
+lenient: short rows are padded and long ones truncated. Parsers relying on
+the read failing to reject a file pass ``fallback=False``. The pandas engine
+can also be selected for every read with ``CSV_ENGINE=pandas``.
+"""
+
+import io
+import logging
+import os
+from collections.abc import Iterator
+from enum import Enum
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+logger = logging.getLogger(__name__)
+
+
+class CSVEngine(str, Enum):
+    """Library that reads the CSV rows"""
+
+    PYARROW = "pyarrow"
+    PANDAS = "pandas"
+
+
+CSV_ENGINE = CSVEngine(os.environ.get("CSV_ENGINE", default=CSVEngine.PYARROW))
+CSV_BLOCK_SIZE = int(os.environ.get("CSV_BLOCK_SIZE", default=str(1 << 20)))
+CSV_USE_THREADS = os.environ.get("CSV_USE_THREADS", default="1") != "0"
+
+# Extra column of the rows ending with a separator
+TRAILING_COLUMN = "_trailing"
+
+# The missing value markers of pd.read_csv
+NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+def read_csv(
+    source,
+    names: list[str] | None = None,
+    separator: str = ",",
+    skip_rows: int = 0,
+    usecols: list[int] | None = None,
+    include_columns: list[str] | None = None,
+    column_types: dict | None = None,
+    decimal_point: str = ".",
+    encoding: str | None = None,
+    invalid_row_handler=None,
+    trailing_separator: bool = False,
+    fallback: bool = True,
+    engine: str | None = None,
+    block_size: int = CSV_BLOCK_SIZE,
+    use_threads: bool = CSV_USE_THREADS,
+) -> pd.DataFrame:
+    """Read CSV rows into a DataFrame.
+
+    Args:
+        source: binary stream positioned at the first row to read, or the
+            text itself (``str`` or ``bytes``)
+        names: column names; None reads them from the first row
+        separator: field delimiter
+        skip_rows: rows skipped before the names or the data
+        usecols: positions of the columns to keep, named after ``names``
+        include_columns: names of the columns to keep, the missing ones are
+            added empty
+        column_types: pyarrow types of some columns, instead of inferred ones
+        decimal_point: decimal separator of the numbers, "," for files
+            written in a European locale
+        encoding: text encoding of a binary source, defaults to UTF-8
+        invalid_row_handler: called with the ``pyarrow.csv.InvalidRow`` of
+            each row whose field count does not match, returns "skip" to drop
+            it or "error" to fail; pandas pads or truncates those rows instead
+        trailing_separator: accept rows ending with an extra separator
+        fallback: read with pandas when pyarrow fails
+        engine: ``CSVEngine`` to read with, defaults to ``CSV_ENGINE``
+        block_size: bytes handed to each pyarrow parsing task
+        use_threads: parse the blocks on all cores
+
+    Returns:
+        The rows, typed like ``pd.read_csv`` does
+    """
+    if isinstance(source, str):
+        source, encoding = io.BytesIO(source.encode()), "utf-8"
+    elif isinstance(source, bytes):
+        source = io.BytesIO(source)
+    position = source.tell()
+
+    options = {
+        "names": names,
+        "separator": separator,
+        "skip_rows": skip_rows,
+        "usecols": usecols,
+        "include_columns": include_columns,
+        "column_types": column_types,
+        "decimal_point": decimal_point,
+        "encoding": encoding,
+        "invalid_row_handler": invalid_row_handler,
+    }
+    if CSVEngine(engine or CSV_ENGINE) == CSVEngine.PANDAS:
+        return _read_pandas(source, **options)
+
+    try:
+        try:
+            table = _read_pyarrow(source, block_size, use_threads, **options)
+        except pa.ArrowInvalid:
+            if not trailing_separator or names is None or usecols is not None:
+                raise
+            source.seek(position)
+            table = _read_pyarrow(
+                source,
+                block_size,
+                use_threads,
+                **{
+                    **options,
+                    "names": [*names, TRAILING_COLUMN],
+                    "include_columns": include_columns or names,
+                },
+            )
+    except pa.ArrowInvalid as error:
+        if not fallback:
+            raise
+        logger.debug(f"pyarrow could not read the rows, using pandas: {error}")
+        source.seek(position)
+        return _read_pandas(source, **options)
+
+    return _to_pandas(table)
+
+
+def iter_csv(
+    source,
+    batch_size: int,
+    names: list[str] | None = None,
+    separator: str = ",",
+    skip_rows: int = 0,
+    usecols: list[int] | None = None,
+    include_columns: list[str] | None = None,
+    column_types: dict | None = None,
+    decimal_point: str = ".",
+    encoding: str | None = None,
+    invalid_row_handler=None,
+    fallback: bool = True,
+    engine: str | None = None,
+    block_size: int = CSV_BLOCK_SIZE,
+    use_threads: bool = CSV_USE_THREADS,
+) -> Iterator[pd.DataFrame]:
+    """Read CSV rows as DataFrames of at most ``batch_size`` rows.
+
+    Takes the options of ``read_csv``, but only holds a few blocks of the
+    source at a time. Column types are inferred from the first block and
+    enforced on the next ones: a later value that does not fit raises
+    ``pyarrow.ArrowInvalid`` (the pandas engine types each batch on its own).
+    The pandas fallback only applies when the first block cannot be read.
+
+    Args:
+        source: binary stream positioned at the first row to read, or the
+            text itself (``str`` or ``bytes``)
+        batch_size: number of rows of each DataFrame
+
+    Yields:
+        The rows, typed like ``pd.read_csv`` does
+    """
+    if isinstance(source, str):
+        source, encoding = io.BytesIO(source.encode()), "utf-8"
+    elif isinstance(source, bytes):
+        source = io.BytesIO(source)
+    position = source.tell()
+
+    options = {
+        "names": names,
+        "separator": separator,
+        "skip_rows": skip_rows,
+        "usecols": usecols,
+        "include_columns": include_columns,
+        "column_types": column_types,
+        "decimal_point": decimal_point,
+        "encoding": encoding,
+        "invalid_row_handler": invalid_row_handler,
+    }
+    if CSVEngine(engine or CSV_ENGINE) == CSVEngine.PANDAS:
+        yield from _read_pandas(source, chunksize=batch_size, **options)
+        return
+
+    batches = _iter_pyarrow(source, batch_size, block_size, use_threads, **options)
+    try:
+        first = next(batches, None)
+    except pa.ArrowInvalid as error:
+        if not fallback:
+            raise
+        logger.debug(f"pyarrow could not read the rows, using pandas: {error}")
+        source.seek(position)
+        yield from _read_pandas(source, chunksize=batch_size, **options)
+        return
+
+    if first is not None:
+        yield first
+        yield from batches
+
+
+def join_decimal_parts(integers, fractions) -> np.ndarray:
+    """Combine numbers split in two columns at their decimal comma.
+
+    Files using a comma both as decimal point and as separator have each
+    decimal number read as two fields. The number is rebuilt with integer
+    arithmetic, as ``(integer * 10**digits + fraction) / 10**digits``, which
+    rounds to the same float as parsing the decimal text would.
+
+    Args:
+        integers: integer parts as text, so that "-0" keeps its sign
+        fractions: digits after the decimal comma as text, so that leading
+            zeros are counted
+
+    Returns:
+        The numbers as float64, NaN where a part is missing
+    """
+    integers = pa.array(integers, pa.string(), from_pandas=True)
+    fractions = pa.array(fractions, pa.string(), from_pandas=True)
+    scale = pc.power(10, pc.cast(pc.utf8_length(fractions), pa.int64()))
+    magnitude = pc.add(
+        pc.multiply(pc.abs(pc.cast(integers, pa.int64())), scale),
+        pc.cast(fractions, pa.int64()),
+    )
+    values = pc.divide(pc.cast(magnitude, pa.float64()), pc.cast(scale, pa.float64()))
+    values = pc.if_else(pc.starts_with(integers, "-"), pc.negate(values), values)
+    return values.to_numpy(zero_copy_only=False)
+
+
+def _read_pyarrow(source, block_size, use_threads, names, usecols, **options):
+    read_options, parse_options, convert_options = _pyarrow_options(
+        block_size, names=names, usecols=usecols, **options
+    )
+
+    # Dates and times are inferred from the first block: read those columns
+    # as text. A column first found temporal past that block is read again.
+    position = source.tell()
+    temporal = _temporal_columns(
+        _first_block_schema(source, read_options, parse_options, convert_options)
+    )
+
+    table = None
+    while table is None or temporal:
+        source.seek(position)
+        convert_options.column_types = {
+            **dict.fromkeys(temporal, pa.string()),
+            **convert_options.column_types,
+        }
+        table = pacsv.read_csv(
+            source,
+            read_options=read_options(use_threads),
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        temporal = _temporal_columns(table.schema)
+
+    return _rename(table, names, usecols)
+
+
+def _iter_pyarrow(
+    source, batch_size, block_size, use_threads, names, usecols, **options
+):
+    read_options, parse_options, convert_options = _pyarrow_options(
+        block_size, names=names, usecols=usecols, **options
+    )
+
+    # Column types are inferred from the first block and kept for the next
+    # ones: dates and times are read as text and empty columns as float
+    position = source.tell()
+    schema = _first_block_schema(source, read_options, parse_options, convert_options)
+    source.seek(position)
+    convert_options.column_types = {
+        **dict.fromkeys(_temporal_columns(schema), pa.string()),
+        **{
+            field.name: pa.float64() for field in schema if pa.types.is_null(field.type)
+        },
+        **convert_options.column_types,
+    }
+
+    with pacsv.open_csv(
+        source,
+        read_options=read_options(use_threads),
+        parse_options=parse_options,
+        convert_options=convert_options,
+    ) as reader:
+        pending = []
+        rows = 0
+        for record_batch in reader:
+            pending.append(record_batch)
+            rows += len(record_batch)
+            while rows >= batch_size:
+                table = pa.Table.from_batches(pending, reader.schema)
+                yield _to_pandas(_rename(table.slice(0, batch_size), names, usecols))
+                pending = table.slice(batch_size).to_batches()
+                rows -= batch_size
+        if rows:
+            table = pa.Table.from_batches(pending, reader.schema)
+            yield _to_pandas(_rename(table, names, usecols))
+
+
+def _pyarrow_options(
+    block_size,
+    names,
+    separator,
+    skip_rows,
+    usecols,
+    include_columns,
+    column_types,
+    decimal_point,
+    encoding,
+    invalid_row_handler,
+):
+    if usecols is not None:
+        # Positions are selected from the generated names f0, f1, ...
+        include_columns = [f"f{position}" for position in usecols]
+
+    def read_options(threaded):
+        return pacsv.ReadOptions(
+            use_threads=threaded,
+            block_size=block_size,
+            skip_rows=skip_rows,
+            column_names=names if usecols is None else None,
+            autogenerate_column_names=usecols is not None,
+            encoding=encoding or "utf8",
+        )
+
+    parse_options = pacsv.ParseOptions(
+        delimiter=separator, invalid_row_handler=invalid_row_handler
+    )
+    convert_options = pacsv.ConvertOptions(
+        column_types=column_types or {},
+        decimal_point=decimal_point,
+        null_values=NA_VALUES,
+        strings_can_be_null=True,
+        include_columns=include_columns or [],
+        include_missing_columns=include_columns is not None,
+    )
+    return read_options, parse_options, convert_options
+
+
+def _first_block_schema(source, read_options, parse_options, convert_options):
+    with pacsv.open_csv(
+        source,
+        read_options=read_options(threaded=False),
+        parse_options=parse_options,
+        convert_options=convert_options,
+    ) as reader:
+        return reader.schema
+
+
+def _rename(table: pa.Table, names, usecols) -> pa.Table:
+    return table if usecols is None else table.rename_columns(names)
+
+
+def _temporal_columns(schema: pa.Schema) -> list[str]:
+    return [field.name for field in schema if pa.types.is_temporal(field.type)]
+
+
+def _to_pandas(table: pa.Table) -> pd.DataFrame:
+    # pd.read_csv types empty columns as float
+    for index, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(
+                index, field.name, pa.nulls(len(table), pa.float64())
+            )
+    return table.to_pandas()
+
+
+def _read_pandas(
+    source,
+    names,
+    separator,
+    skip_rows,
+    usecols,
+    include_columns,
+    column_types,
+    decimal_point,
+    encoding,
+    invalid_row_handler,
+    chunksize=None,
+):
+    # The last skipped row is read as a header replaced by the names, as the
+    # parsers did before this layer, so that pandas rejects the same files
+    header = 0 if names is None or skip_rows else None
+    if usecols is None and set(include_columns or ()) & set(names or ()):
+        # Other columns are not converted, the missing ones are added below.
+        # Without a column to keep, pandas would not count the rows either.
+        usecols = set(include_columns).__contains__
+    data = pd.read_csv(
+        io.TextIOWrapper(source, encoding=encoding or "utf-8"),
+        header=header,
+        names=names,
+        skiprows=skip_rows - 1 if names is not None and skip_rows else skip_rows,
+        sep=separator,
+        decimal=decimal_point,
+        index_col=False,
+        usecols=usecols,
+        dtype={
+            name: type_.to_pandas_dtype()
+            for name, type_ in (column_types or {}).items()
+        },
+        chunksize=chunksize,
+    )
+    if chunksize is not None:
+        return (_include(chunk, include_columns) for chunk in data)
+    return _include(data, include_columns)
+
+
+def _include(data: pd.DataFrame, include_columns) -> pd.DataFrame:
+    if include_columns is not None:
+        data = data.reindex(columns=include_columns)
+    return data
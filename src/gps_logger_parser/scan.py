@@ -0,0 +1,126 @@
+"""
+Metadata-only summaries of logger files.
+
+``Parser.scan`` summarizes a file without reading all of its rows: only the
+rows of a few windows of its bytes are parsed, the start of the data, the end
+of the file and a few evenly spaced in between. The windows are read with
+range requests (``Parsable.read_range``), so scanning a large remote file
+costs a handful of small reads, and the number of rows is estimated from the
+bytes per row of the windows.
+"""
+
+import datetime
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from .helpers import CHUNK_SIZE
+
+# Bytes of each window of rows parsed by Parser.scan
+SCAN_SIZE = int(os.environ.get("SCAN_SIZE", default=str(64 * 1024)))
+# Windows between the first and the last one, for the bounding box
+SCAN_WINDOWS = int(os.environ.get("SCAN_WINDOWS", default="4"))
+
+
+class ScanSummary(NamedTuple):
+    """Summary of a logger file, see ``Parser.scan``
+
+    - ``device``: the first ``id`` of the rows, else the stem of the file name
+    - ``first_timestamp``, ``last_timestamp``: timestamps of the first and last
+      rows that have one, in file order
+    - ``rows``: number of rows, estimated unless ``exact``
+    - ``bbox``: ``(min_longitude, min_latitude, max_longitude, max_latitude)``
+      of the GPS fixes with a position, None for other loggers
+    - ``exact``: every row was read; otherwise ``rows`` is estimated (or
+      counted from line breaks) and ``bbox`` only covers the windows read
+    """
+
+    path: str
+    parser: str
+    datatype: str
+    device: str | None
+    first_timestamp: datetime.datetime | None
+    last_timestamp: datetime.datetime | None
+    rows: int
+    bbox: tuple[float, float, float, float] | None
+    exact: bool
+
+    def to_dict(self) -> dict:
+        """The summary as JSON types, with ISO 8601 timestamps."""
+        summary = self._asdict()
+        for name in ("first_timestamp", "last_timestamp"):
+            if summary[name] is not None:
+                summary[name] = summary[name].isoformat()
+        if summary["bbox"] is not None:
+            summary["bbox"] = list(summary["bbox"])
+        return summary
+
+
+def window_ranges(
+    start: int, end: int, size: int = SCAN_SIZE, windows: int = SCAN_WINDOWS
+) -> list[tuple[int, int]] | None:
+    """Byte ranges of the windows of ``start`` to ``end`` read by a scan.
+
+    The first window starts at ``start``, the last one ends at ``end`` and
+    ``windows`` more are evenly spaced in between. Returns None if the
+    windows would cover the whole range, which is then better read whole.
+    """
+    if end - start <= size * (windows + 2):
+        return None
+    centers = np.linspace(start, end, windows + 2)[1:-1].astype("int64")
+    return (
+        [(start, start + size)]
+        + [(int(center) - size // 2, int(center) + size // 2) for center in centers]
+        + [(end - size, end)]
+    )
+
+
+def whole_lines(block: bytes, first: bool, last: bool) -> bytes:
+    """Trim the lines a window cut at either end.
+
+    ``first`` and ``last`` tell that the window starts at the start of a line
+    and ends at the end of the range, so that nothing is cut there.
+    """
+    if not first:
+        block = block[block.find(b"\n") + 1 :] if b"\n" in block else b""
+    if not last:
+        block = block[: block.rfind(b"\n") + 1]
+    return block
+
+
+def count_lines(view, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> int:
+    """Count the lines of the bytes ``start`` to ``end`` of a binary stream."""
+    view.seek(start)
+    lines, position, last = 0, start, b"\n"
+    while position < end:
+        chunk = view.read(min(chunk_size, end - position))
+        if not chunk:
+            break
+        lines += np.count_nonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n"))
+        position += len(chunk)
+        last = chunk[-1:]
+    # A last line without a line break
+    return lines + (last != b"\n")
+
+
+def first_value(table, column: str, last: bool = False):
+    """First (or last) non-null value of a column of a table, or None."""
+    if column not in table.column_names:
+        return None
+    values = table.column(column).drop_null()
+    if len(values) == 0:
+        return None
+    return values[-1 if last else 0].as_py()
+
+
+def merge_bounds(bounds, other):
+    """Bounding box of two ``(min_x, min_y, max_x, max_y)`` boxes, or None."""
+    if bounds is None or other is None:
+        return bounds or other
+    return (
+        min(bounds[0], other[0]),
+        min(bounds[1], other[1]),
+        max(bounds[2], other[2]),
+        max(bounds[3], other[3]),
+    )
@@ -1,22 +1,23 @@
-import csv
-import io
-
-import pandas as pd
 import pyarrow as pa
-import pyarrow.csv as pacsv
+import pyarrow.compute as pc
 
-from ..helpers import stream_chunk_match, stream_starts_with
-from ..parser_base import CSVParser, Parsable, Parser
+from ..dispatch import Signature
+from ..helpers import filter_views
+from ..parser_base import CSVParser, DetectionContext, Parsable, Parser
+from ..reader import TRAILING_COLUMN, join_decimal_parts
+from ..timestamps import from_components
 from .columns import TDRHarmonizedColumn
 from .mixin import TDRHarmonizationMixin
 
 ENDLINES = ["No Fast Log Data", "No Fast Data"]
 
 
+def skipped(text):
+    return not text or text in ENDLINES
+
+
 def skip(row):
-    if not row.text or row.text in ENDLINES:
-        return "skip"
-    return "error"
+    return "skip" if skipped(row.text) else "error"
 
 
 class TDRParser(TDRHarmonizationMixin, Parser):
@@ -25,7 +26,10 @@ class TDRParser(TDRHarmonizationMixin, Parser):
     SEPARATOR = ","
     ALLOWED_META = ["Resolution"]
     HEAD = "\n?Comment\\s:-"
+    HEAD_WINDOW = 200
     MAX_READ = 1000
+    # Header row to look for, when it differs from the FIELDS that are read
+    HEADER_FIELDS = None
     MAPPINGS = {
         TDRHarmonizedColumn.TIMESTAMP: "Date/Time Stamp",
         TDRHarmonizedColumn.PRESSURE: "Pressure",
@@ -34,86 +38,94 @@ class TDRParser(TDRHarmonizationMixin, Parser):
     }
 
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file matches the expected HEAD regex pattern."""
-        try:
-            with parsable.get_stream(binary=False) as stream:
-                if not stream.seekable():
-                    return False
-                return bool(stream_chunk_match(stream, 200, cls.HEAD))
-        except (UnicodeDecodeError, OSError):
+    def signatures(cls):
+        """The file must match the expected HEAD regex pattern."""
+        return [Signature.pattern(cls.HEAD, cls.HEAD_WINDOW)]
+
+    @classmethod
+    def can_parse(cls, parsable: Parsable):
+        """Scan the preamble for the header row, collecting its metadata."""
+        if not super().can_parse(parsable):
             return False
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
         meta = {}
-        row_count = 0
-
-        expected_row = self.SEPARATOR.join(self.FIELDS)
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_chunk_match(stream, 200, self.HEAD):
-                self._raise_not_supported("Stream head different than expected")
-
-            for row in stream:
-                if row.strip() == expected_row:
-                    break
+        expected_row = cls.SEPARATOR.join(cls.HEADER_FIELDS or cls.FIELDS)
+
+        for row_count, (_start, end, row) in enumerate(parsable.iter_lines()):
+            if row.strip() == expected_row:
+                return DetectionContext(
+                    header=list(cls.HEADER_FIELDS or cls.FIELDS),
+                    data_offset=end,
+                    preamble_rows=row_count,
+                    metadata=meta,
+                )
+
+            if "=" in row:
+                key, value = row.split("=")
+                if key in cls.ALLOWED_META:
+                    meta[key.strip()] = value.strip()
+
+            if row_count + 1 > cls.MAX_READ:
+                break
+
+        return False
+
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self.names = self._probe_names()
+        self._read_rows()
+
+    def _probe_names(self) -> list[str]:
+        """Name the columns of the data rows from the fields of the first one.
+
+        Rows ending with a separator have an extra field, named
+        ``TRAILING_COLUMN`` and left out when reading, so that the rows are
+        parsed once with the right columns instead of read again on error.
+        """
+        for start, _end, line in self.file.iter_lines():
+            if start is None or start < self.context.data_offset:
+                continue
+            row = line.rstrip("\r\n")
+            if skipped(row):
+                continue
+
+            fields = len(row.split(self.SEPARATOR))
+            if fields == len(self.FIELDS):
+                return list(self.FIELDS)
+            if fields == len(self.FIELDS) + 1:
+                return [*self.FIELDS, TRAILING_COLUMN]
+            self._raise_not_supported(
+                f"Data rows have {fields} fields, expected {len(self.FIELDS)}"
+            )
+        return list(self.FIELDS)
 
-                row_count += 1
-                if "=" in row:
-                    key, value = row.split("=")
-                    if key in self.ALLOWED_META:
-                        meta[key.strip()] = value.strip()
+    def _csv_options(self):
+        return {
+            "names": self.names,
+            "separator": self.SEPARATOR,
+            "include_columns": self.FIELDS,
+            "encoding": self.file.encoding,
+            "invalid_row_handler": skip,
+            "fallback": False,
+        }
 
-                if row_count > self.MAX_READ:
-                    self._raise_not_supported(
-                        f"Stream data not found after {self.MAX_READ} lines"
-                    )
+    def _csv_range(self):
+        return self.context.data_offset, None
 
-        parse_options = pacsv.ParseOptions(
-            delimiter=self.SEPARATOR, invalid_row_handler=skip
-        )
-        read_options = pacsv.ReadOptions(
-            skip_rows=row_count + 1,
-            column_names=self.FIELDS,
-        )
-        convert_options = pacsv.ConvertOptions(
-            include_columns=self.FIELDS,
-            include_missing_columns=True,
-        )
-        with self.file.get_stream(binary=True) as stream:
-            try:
-                self.data = pacsv.read_csv(
-                    stream,
-                    parse_options=parse_options,
-                    read_options=read_options,
-                    convert_options=convert_options,
-                ).to_pandas()
-            except pa.lib.ArrowInvalid:
-                pass
-            else:
-                for key, value in meta.items():
-                    self.data[key] = [value] * len(self.data)
-                return
-
-        # Retry with an extra column to handle trailing comma in data rows
-        read_options = pacsv.ReadOptions(
-            skip_rows=row_count + 1,
-            column_names=self.FIELDS + ["_trailing"],
-        )
-        with self.file.get_stream(binary=True) as stream:
-            self.data = pacsv.read_csv(
-                stream,
-                parse_options=parse_options,
-                read_options=read_options,
-                convert_options=convert_options,
-            ).to_pandas()
+    def _kept_lines(self, lines):
+        """Drop the ENDLINES lines, which ``skip`` drops from the rows."""
+        ended = pc.is_in(lines.cast(pa.string()), value_set=pa.array(ENDLINES))
+        return filter_views(lines, ~ended.to_numpy(zero_copy_only=False))
 
-        for key, value in meta.items():
-            self.data[key] = [value] * len(self.data)
+    def _finish_data(self, data, first_row):
+        for key, value in self.context.metadata.items():
+            data[key] = [value] * len(data)
+        return data
 
 
 class TDR2Parser(TDRParser):
@@ -148,6 +160,7 @@ class TDR2EuropeanDecimalParser(TDRParser):
         "Temp_int",
         "Temp_dec",
     ]
+    DERIVED_FROM = ("Pressure_int", "Pressure_dec", "Temp_int", "Temp_dec")
     MAPPINGS = {
         TDRHarmonizedColumn.TIMESTAMP: "Time Stamp",
         TDRHarmonizedColumn.PRESSURE: "Pressure",
@@ -155,76 +168,34 @@ class TDR2EuropeanDecimalParser(TDRParser):
         TDRHarmonizedColumn.DEPTH_M: None,
     }
 
-    def __init__(self, parsable: Parsable):
-        # Override to use HEADER_FIELDS for header detection but FIELDS for reading
-        Parser.__init__(self, parsable)
-        meta = {}
-        row_count = 0
-
-        expected_row = self.SEPARATOR.join(self.HEADER_FIELDS)
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_chunk_match(stream, 200, self.HEAD):
-                self._raise_not_supported("Stream head different than expected")
-
-            for row in stream:
-                if row.strip() == expected_row:
-                    break
-
-                row_count += 1
-                if "=" in row:
-                    key, value = row.split("=")
-                    if key in self.ALLOWED_META:
-                        meta[key.strip()] = value.strip()
-
-                if row_count > self.MAX_READ:
-                    self._raise_not_supported(
-                        f"Stream data not found after {self.MAX_READ} lines"
-                    )
-
-        parse_options = pacsv.ParseOptions(
-            delimiter=self.SEPARATOR, invalid_row_handler=skip
-        )
-        read_options = pacsv.ReadOptions(
-            skip_rows=row_count + 1,
-            column_names=self.FIELDS,
-        )
-        # Read integer parts as strings to preserve signs (e.g. "-0")
-        convert_options = pacsv.ConvertOptions(
-            column_types={
-                "Pressure_int": pa.string(),
-                "Temp_int": pa.string(),
-            },
-        )
+    def _csv_options(self):
+        return {
+            **super()._csv_options(),
+            # Parts are read as text to keep the sign of "-0" and the leading
+            # zeros of the decimals
+            "column_types": dict.fromkeys(
+                ["Pressure_int", "Pressure_dec", "Temp_int", "Temp_dec"], pa.string()
+            ),
+        }
+
+    def _read_rows(self):
         try:
-            with self.file.get_stream(binary=True) as stream:
-                self.data = pacsv.read_csv(
-                    stream,
-                    parse_options=parse_options,
-                    read_options=read_options,
-                    convert_options=convert_options,
-                ).to_pandas()
+            super()._read_rows()
         except pa.lib.ArrowInvalid as error:
             self._raise_not_supported(
                 f"CSV data does not match expected 5-column European decimal "
                 f"format: {error}"
             )
 
-        for key, value in meta.items():
-            self.data[key] = [value] * len(self.data)
+    def _finish_data(self, data, first_row):
+        data = super()._finish_data(data, first_row)
 
         # Recombine split decimal columns into proper float values
-        # by concatenating the integer and decimal parts as strings
-        self.data["Pressure"] = (
-            self.data["Pressure_int"] + "." + self.data["Pressure_dec"].astype(str)
-        ).astype(float)
-        self.data["Temp"] = (
-            self.data["Temp_int"] + "." + self.data["Temp_dec"].astype(str)
-        ).astype(float)
-        self.data = self.data.drop(
+        data["Pressure"] = join_decimal_parts(
+            data["Pressure_int"], data["Pressure_dec"]
+        )
+        data["Temp"] = join_decimal_parts(data["Temp_int"], data["Temp_dec"])
+        return data.drop(
             columns=["Pressure_int", "Pressure_dec", "Temp_int", "Temp_dec"]
         )
 
@@ -247,6 +218,7 @@ class PathtrackPressParser(TDRHarmonizationMixin, Parser):
         "depth_m",
         "depth_m_decimal",
     )
+    DERIVED_FROM = FIELDS
     OUTLIERS = None
     SEPARATOR = ","
     MAPPINGS = {
@@ -257,58 +229,57 @@ class PathtrackPressParser(TDRHarmonizationMixin, Parser):
     }
 
     @classmethod
-    def can_parse(cls, parsable):
-        """Check if the file starts with the expected HEAD bytes."""
-        try:
-            with parsable.get_stream(binary=False) as stream:
-                if not stream.seekable():
-                    return False
-                return stream_starts_with(stream, cls.HEAD)
-        except (UnicodeDecodeError, OSError):
-            return False
-
-    def harmonize_data(self, data):
-        data["timestamp"] = pd.to_datetime(
-            {
-                "year": 2000 + data["year"],
-                "month": data["month"],
-                "day": data["day"],
-                "hour": data["hour"],
-                "minute": data["minute"],
-                "second": data["second"],
-            }
+    def signatures(cls):
+        """The file must start with the expected HEAD bytes."""
+        return [Signature.prefix(cls.HEAD)]
+
+    def prepare_data(self, data):
+        data["timestamp"] = from_components(
+            data["year"],
+            data["month"],
+            data["day"],
+            data["hour"],
+            data["minute"],
+            data["second"],
+            century=2000,
         )
         data["temperature_float"] = (
             data["temperature"] + data["temperature_decimal"] / 100
         )
         data["depth_mbar_float"] = data["depth_mbar"] + data["depth_mbar_decimal"] / 100
         data["depth_m_float"] = data["depth_m"] + data["depth_m_decimal"] / 100
-        return super().harmonize_data(data)
+        return data
 
-    def __init__(self, parsable: Parsable):
-        super().__init__(parsable)
-
-        with self.file.get_stream(binary=False) as stream:
-            if not stream.seekable():
-                self._raise_not_supported("Stream not seekable")
-
-            if not stream_starts_with(stream, self.HEAD):
-                self._raise_not_supported("Stream head different than expected")
-
-            _soi, _metadata, data = stream.read().split(self.DIVIDER, 2)
-
-        content = io.StringIO(data)
-        reader = csv.reader(content, delimiter=self.SEPARATOR)
-        header = next(reader)
-        if len(header) != len(self.FIELDS):
-            self._raise_not_supported(
-                f"Stream have a number of fields different than expected, "
-                f"{len(header)} != {len(self.FIELDS)}"
-            )
+    @classmethod
+    def can_parse(cls, parsable: Parsable):
+        """Check the HEAD and the field count of the data section."""
+        if not super().can_parse(parsable):
+            return False
 
-        self.data = pd.read_csv(
-            content, header=0, names=self.FIELDS, sep=self.SEPARATOR, index_col=False
-        )
+        # The row after the one whose field count is checked is not read
+        context = cls._divider_context(parsable, dividers=2, skip_rows=1)
+        if not context or len(context.header) != len(cls.FIELDS):
+            return False
+        return context
+
+    def __init__(
+        self,
+        parsable: Parsable,
+        context: DetectionContext | None = None,
+        columns: list[str] | None = None,
+    ):
+        super().__init__(parsable, context, columns)
+        self._read_rows()
+
+    def _csv_options(self):
+        return {
+            "names": self.FIELDS,
+            "separator": self.SEPARATOR,
+            "encoding": self.file.encoding,
+        }
+
+    def _csv_range(self):
+        return self.context.data_offset, None
 
 
 class SimpleTDR(TDRHarmonizationMixin, CSVParser):
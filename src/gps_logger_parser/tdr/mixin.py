@@ -6,6 +6,7 @@ harmonized columns exist with correct types according to the
 TDR_HARMONIZED_COLUMN_TYPES specification.
 """
 
+from ..timestamps import DAY_FIRST_FORMATS
 from .columns import TDR_HARMONIZED_COLUMN_TYPES
 
 
@@ -17,6 +18,9 @@ class TDRHarmonizationMixin:
     according to the TDR_HARMONIZED_COLUMN_TYPES specification.
     """
 
+    # TDR loggers write the day first (05/07/16 is the 5th of July)
+    TIMESTAMP_FORMATS = DAY_FIRST_FORMATS
+
     def get_harmonization_schema(self) -> dict:
         return {
             harmonized_col.value: pd_dtype
@@ -0,0 +1,223 @@
+import json
+import os
+import pathlib
+import shutil
+
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+import yaml
+
+from .. import manifest
+from ..batch import parse_many, read_list_file, resolve_sources
+from ..manifest import MANIFEST_NAME, fingerprint_modules, parser_fingerprint
+
+TESTS_DATA_PATH = pathlib.Path("tests")
+TEST_CONFIG_PATH = TESTS_DATA_PATH / "config.yaml"
+
+CONFIG = yaml.safe_load(TEST_CONFIG_PATH.open("r"))
+
+GPX_FILES = sorted(
+    filename for filename in CONFIG.get("files", {}) if filename.endswith(".gpx")
+)
+
+
+def test_resolve_sources_expands_globs_and_directories(tmp_path):
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "a.csv").write_text("a")
+    (tmp_path / "b.csv").write_text("b")
+
+    resolved = resolve_sources(
+        [str(tmp_path / "*.csv"), str(tmp_path), str(tmp_path / "b.csv")]
+    )
+    names = [pathlib.Path(path).relative_to(tmp_path).as_posix() for path in resolved]
+    assert names == ["b.csv", "nested/a.csv"]
+
+
+def test_read_list_file(tmp_path):
+    list_file = tmp_path / "sources.txt"
+    list_file.write_text("# nightly\n\ntests/files/*.gpx\n  s3://bucket/logs/ \n")
+    assert read_list_file(str(list_file)) == [
+        "tests/files/*.gpx",
+        "s3://bucket/logs/",
+    ]
+
+
+@pytest.mark.timeout(30)
+@pytest.mark.parametrize("batch_size", [None, 10])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many(tmp_path, workers, batch_size):
+    broken = tmp_path / "broken.txt"
+    broken.write_text("not a logger file\n")
+
+    summary = parse_many(
+        [str(TESTS_DATA_PATH / "files" / "*.gpx"), str(broken)],
+        str(tmp_path),
+        workers=workers,
+        batch_size=batch_size,
+    )
+
+    assert [pathlib.Path(result.path).name for result in summary.succeeded] == (
+        GPX_FILES
+    )
+    assert [result.path for result in summary.failed] == [str(broken)]
+    assert summary.failed[0].error.startswith("NotImplementedError")
+
+    for result in summary.succeeded:
+        name = pathlib.Path(result.path).name
+        table = pq.read_table(tmp_path / f"{name}.parquet")
+        assert table.num_rows == result.rows == CONFIG["files"][name]["expected_rows"]
+
+    assert summary.rows == sum(result.rows for result in summary.succeeded)
+    assert summary.files_per_second > 0
+
+
+def test_parse_many_creates_output(tmp_path):
+    output = tmp_path / "new" / "output"
+    summary = parse_many(
+        [str(TESTS_DATA_PATH / "files" / GPX_FILES[0])], str(output), workers=1
+    )
+    assert not summary.failed
+    assert (output / f"{GPX_FILES[0]}.parquet").exists()
+
+
+def test_parse_many_columns(tmp_path):
+    summary = parse_many(
+        [str(TESTS_DATA_PATH / "files" / GPX_FILES[0])],
+        str(tmp_path),
+        workers=1,
+        columns=["timestamp", "latitude", "longitude"],
+    )
+    table = pq.read_table(tmp_path / f"{GPX_FILES[0]}.parquet")
+    assert table.num_rows == summary.rows
+    assert table.column_names[:3] == ["timestamp", "latitude", "longitude"]
+    assert "geometry" not in table.column_names
+
+
+def test_parse_many_filters(tmp_path):
+    path = TESTS_DATA_PATH / "files" / GPX_FILES[0]
+    summary = parse_many(
+        [str(path)], str(tmp_path), workers=1, filters=["speed_km_h > 0.1"]
+    )
+    table = pq.read_table(tmp_path / f"{GPX_FILES[0]}.parquet")
+    assert table.num_rows == summary.rows
+    assert 0 < summary.rows < CONFIG["files"][GPX_FILES[0]]["expected_rows"]
+    assert pc.all(pc.greater(table.column("speed_km_h"), 0.1)).as_py()
+
+
+def test_parse_many_skips_unchanged_files(tmp_path):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    for filename in GPX_FILES:
+        shutil.copy(TESTS_DATA_PATH / "files" / filename, inputs)
+    output = tmp_path / "output"
+    output.mkdir()
+
+    first = parse_many([str(inputs)], str(output), workers=1)
+    assert len(first.succeeded) == len(GPX_FILES)
+    assert (output / MANIFEST_NAME).exists()
+
+    second = parse_many([str(inputs)], str(output), workers=1)
+    assert not second.succeeded
+    assert len(second.skipped) == len(GPX_FILES)
+
+    # A changed input, a removed output and a stale parser fingerprint
+    changed, removed, stale = (str(inputs / filename) for filename in GPX_FILES)
+    os.utime(changed, (0, 0))
+    (output / f"{GPX_FILES[1]}.parquet").unlink()
+    manifest = json.loads((output / MANIFEST_NAME).read_text())
+    manifest["entries"][stale]["code"] = "outdated"
+    (output / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    third = parse_many([str(inputs)], str(output), workers=1)
+    assert sorted(result.path for result in third.succeeded) == sorted(
+        [changed, removed, stale]
+    )
+
+    forced = parse_many([str(inputs)], str(output), workers=1, incremental=False)
+    assert len(forced.succeeded) == len(GPX_FILES)
+
+
+def test_parse_many_reparses_on_other_options(tmp_path):
+    source = str(TESTS_DATA_PATH / "files" / GPX_FILES[0])
+    output = tmp_path / "output"
+    written = output / f"{GPX_FILES[0]}.parquet"
+    expected_rows = CONFIG["files"][GPX_FILES[0]]["expected_rows"]
+    columns = ["timestamp", "latitude", "longitude"]
+
+    narrow = parse_many(
+        [source], str(output), workers=1, columns=columns, filters=["speed_km_h > 0.1"]
+    )
+    assert len(narrow.succeeded) == 1
+    # The same filter, written differently, leaves the file as it is
+    again = parse_many(
+        [source], str(output), workers=1, columns=columns, filters=["speed_km_h>0.1"]
+    )
+    assert len(again.skipped) == 1
+
+    full = parse_many([source], str(output), workers=1)
+    assert len(full.succeeded) == 1
+    table = pq.read_table(written)
+    assert table.num_rows == full.rows == expected_rows
+    assert "geometry" in table.column_names
+
+    # Time ranges are compared as UTC
+    start = parse_many(
+        [source], str(output), workers=1, time_range=("2000-01-01", None)
+    )
+    assert len(start.succeeded) == 1
+    same_start = ("2000-01-01T01:00+01:00", None)
+    again = parse_many([source], str(output), workers=1, time_range=same_start)
+    assert len(again.skipped) == 1
+
+
+def test_parser_fingerprint_covers_imported_modules(monkeypatch):
+    """Helper modules a parser imports, even indirectly, are fingerprinted."""
+    modules = fingerprint_modules(manifest.parsers_by_name["GPS2JMParser8"])
+    for name in ("reader", "timestamps", "coordinates", "quality", "gps.columns"):
+        assert f"gps_logger_parser.{name}" in modules
+
+    parser_fingerprint.cache_clear()
+    before = parser_fingerprint("GPS2JMParser8")
+    getsource = manifest.inspect.getsource
+    monkeypatch.setattr(
+        manifest.inspect,
+        "getsource",
+        lambda module: (
+            getsource(module)
+            + ("# changed" if module.__name__.endswith(".coordinates") else "")
+        ),
+    )
+    parser_fingerprint.cache_clear()
+    try:
+        assert parser_fingerprint("GPS2JMParser8") != before
+    finally:
+        monkeypatch.undo()
+        parser_fingerprint.cache_clear()
+
+
+def test_parse_many_keeps_same_named_files_apart(tmp_path):
+    inputs = tmp_path / "inputs"
+    for directory, filename in zip("ab", GPX_FILES[:2], strict=True):
+        (inputs / directory).mkdir(parents=True)
+        shutil.copy(TESTS_DATA_PATH / "files" / filename, inputs / directory / "x.gpx")
+    output = tmp_path / "output"
+
+    summary = parse_many([str(inputs)], str(output), workers=1)
+    assert len(summary.succeeded) == 2
+    for directory, filename in zip("ab", GPX_FILES[:2], strict=True):
+        table = pq.read_table(output / directory / "x.gpx.parquet")
+        assert table.num_rows == CONFIG["files"][filename]["expected_rows"]
+
+    again = parse_many([str(inputs)], str(output), workers=1)
+    assert len(again.skipped) == 2
+
+    # Files given one by one are told apart by a hash of their path
+    separate = tmp_path / "separate"
+    files = [str(inputs / directory / "x.gpx") for directory in "ab"]
+    summary = parse_many(files, str(separate), workers=1)
+    outputs = [result.output for result in summary.succeeded]
+    assert len(set(outputs)) == 2
+    for output_name, filename in zip(outputs, GPX_FILES[:2], strict=True):
+        table = pq.read_table(separate / output_name)
+        assert table.num_rows == CONFIG["files"][filename]["expected_rows"]
@@ -1,9 +1,15 @@
 import pathlib
 
+import gpxpy
+import pandas as pd
 import pytest
 import yaml
 
-from ..parser import detect_file
+from .. import reader
+from ..dispatch import DispatchIndex
+from ..gps.gpx import GPXParser
+from ..parser import available_parsers, detect_file
+from ..parser_base import CSVParser, Parsable
 
 TESTS_DATA_PATH = pathlib.Path("tests")
 TEST_CONFIG_PATH = TESTS_DATA_PATH / "config.yaml"
@@ -40,3 +46,180 @@ def test_bench_detect_and_harmonize(benchmark, path, config):
     table = benchmark(detect_and_harmonize)
     assert table
     assert "_original_data" in table.column_names
+
+
+@pytest.mark.parametrize("original_data", ["json", "struct", "line", "none"])
+@pytest.mark.parametrize("path,config", test_files)
+def test_bench_original_data(benchmark, path, config, original_data):
+    """Benchmark as_table() for each _original_data retention mode.
+
+    Harmonization adds columns to the parser data, so each round gets a fresh
+    parser instance; detection is not part of the measure.
+    """
+    if original_data == "line" and detect_file(path)._csv_options() is None:
+        # Parsers not reading their rows from a byte range have no source
+        # lines, they are rejected before any row is read
+        def rejected(parser_instance):
+            with pytest.raises(ValueError, match="byte range of the data rows"):
+                parser_instance.as_table(original_data="line")
+
+        benchmark.pedantic(
+            rejected, setup=lambda: ((detect_file(path),), {}), rounds=20
+        )
+        return
+
+    table = benchmark.pedantic(
+        lambda parser_instance: parser_instance.as_table(original_data=original_data),
+        setup=lambda: ((detect_file(path),), {}),
+        rounds=20,
+    )
+    assert len(table) == config["expected_rows"]
+
+
+@pytest.mark.parametrize("engine", ["arrow", "pandas"])
+@pytest.mark.parametrize("path,config", test_files)
+def test_bench_harmonization_engine(benchmark, path, config, engine):
+    """Benchmark as_table() with each harmonization engine."""
+    table = benchmark.pedantic(
+        lambda parser_instance: parser_instance.as_table(
+            original_data="none", engine=engine
+        ),
+        setup=lambda: ((detect_file(path),), {}),
+        rounds=20,
+    )
+    assert len(table) == config["expected_rows"]
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "pandas"])
+@pytest.mark.parametrize("path,config", test_files)
+def test_bench_csv_engine(benchmark, monkeypatch, path, config, engine):
+    """Benchmark detect_file() with each CSV reader engine."""
+    monkeypatch.setattr(reader, "CSV_ENGINE", engine)
+    result = benchmark(detect_file, path)
+    assert result.DATATYPE == config["type"]
+
+
+ACCELEROMETER_PATH = (
+    TESTS_DATA_PATH / "files" / "ES-SK-F-19011-295827-20200702-X27_Acc.txt"
+)
+
+
+@pytest.fixture(scope="module")
+def large_accelerometer(tmp_path_factory):
+    """An accelerometer file of 500 000 samples, 83 minutes at 100 Hz."""
+    path = tmp_path_factory.mktemp("large") / ACCELEROMETER_PATH.name
+    path.write_text(ACCELEROMETER_PATH.read_text() + "-.08, .01, 1.05,\n" * 500_000)
+    return path
+
+
+def test_bench_accelerometer_large(benchmark, large_accelerometer):
+    """Benchmark detect_file() + as_table() on a long accelerometer log."""
+    table = benchmark.pedantic(
+        lambda: detect_file(large_accelerometer).as_table(original_data="none"),
+        rounds=5,
+    )
+    assert len(table) > 500_000
+
+
+TDR_PATHS = {
+    "plain": TESTS_DATA_PATH / "files" / "CG_DI_A08918_02-07-12.CSV",
+    "trailing_separator": TESTS_DATA_PATH / "files" / "A15153_20-10-2021.csv",
+}
+
+
+@pytest.fixture(scope="module", params=list(TDR_PATHS))
+def large_tdr(request, tmp_path_factory):
+    """A TDR file of 500 000 rows, ending with a separator or not."""
+    source = TDR_PATHS[request.param]
+    lines = source.read_text().splitlines(keepends=True)
+    header = next(
+        index for index, line in enumerate(lines) if line.startswith(("Date", "Time"))
+    )
+    path = tmp_path_factory.mktemp("large") / source.name
+    path.write_text("".join(lines[: header + 1]) + lines[header + 1] * 500_000)
+    return path
+
+
+def test_bench_tdr_large(benchmark, large_tdr):
+    """Benchmark detect_file() + as_table() on a long TDR log."""
+    table = benchmark.pedantic(
+        lambda: detect_file(large_tdr).as_table(original_data="none"),
+        rounds=5,
+    )
+    assert len(table) == 500_000
+
+
+GPX_PATHS = sorted((TESTS_DATA_PATH / "files").glob("*.gpx"))
+
+
+@pytest.fixture(scope="module", params=GPX_PATHS, ids=[path.name for path in GPX_PATHS])
+def large_gpx(request, tmp_path_factory):
+    """A GPX track of about 100 000 points, from the points of a sample file."""
+    content = request.param.read_text()
+    start = content.index("<trkpt")
+    end = content.rindex("</trkpt>") + len("</trkpt>")
+    copies = 100_000 // content[start:end].count("<trkpt")
+    path = tmp_path_factory.mktemp("large") / request.param.name
+    path.write_text(content[:start] + content[start:end] * copies + content[end:])
+    return path
+
+
+def test_bench_gpx_large(benchmark, large_gpx):
+    """Benchmark reading a large GPX track with the streaming reader."""
+    data = benchmark.pedantic(lambda: detect_file(large_gpx).data, rounds=3)
+    assert len(data) > 90_000
+
+
+def test_bench_gpx_gpxpy_large(benchmark, large_gpx):
+    """Reference for test_bench_gpx_large: the gpxpy object tree it replaced."""
+
+    def read_gpxpy():
+        with large_gpx.open() as stream:
+            gpx = gpxpy.parse(stream)
+        points = [
+            tuple(getattr(point, field) for field in GPXParser.FIELDS)
+            for track in gpx.tracks
+            for segment in track.segments
+            for point in segment.points
+        ]
+        return pd.DataFrame(points, columns=GPXParser.FIELDS)
+
+    data = benchmark.pedantic(read_gpxpy, rounds=3)
+    assert len(data) > 90_000
+
+
+def _synthetic_parsers(count):
+    """CSV parsers with unique headers, to grow the registry artificially."""
+    return [
+        type(
+            f"SyntheticParser{index}",
+            (CSVParser,),
+            {"FIELDS": [f"column_{index}_{field}" for field in range(8)]},
+        )
+        for index in range(count)
+    ]
+
+
+SCALING_PATH = TESTS_DATA_PATH / "files" / "A15153_20-10-2021.csv"
+
+
+@pytest.mark.parametrize("registered", [0, 100, 400, 1600])
+@pytest.mark.parametrize("strategy", ["index", "linear"])
+def test_bench_detect_scaling(benchmark, strategy, registered):
+    """Benchmark candidate lookup as the number of registered parsers grows.
+
+    Synthetic parsers are registered before the real ones, so a linear probe
+    has to reject all of them before reaching the TDR parsers.
+    """
+    parsers = _synthetic_parsers(registered) + list(available_parsers)
+    parsable = Parsable(file_path=SCALING_PATH)
+
+    if strategy == "index":
+        index = DispatchIndex(parsers)
+        result = benchmark(index.candidates, parsable)
+    else:
+        result = benchmark(
+            lambda: [parser for parser in parsers if parser.can_parse(parsable)]
+        )
+
+    assert [parser.DATATYPE for parser in result][0] == "tdr"
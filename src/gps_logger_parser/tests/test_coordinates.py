@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from ..coordinates import decimal_degrees, signed_degrees, to_decimal_degrees
+
+
+def test_decimal_degrees():
+    degrees = decimal_degrees(pd.Series([69, 15]), pd.Series([3.9617, 30.0]))
+    np.testing.assert_allclose(degrees, [69 + 3.9617 / 60, 15.5])
+
+
+def test_signed_degrees():
+    values = signed_degrees([1.5, 2.5, 3.5, 4.5, 5.5], ["N", "S", "E", "W", None])
+    np.testing.assert_array_equal(values, [1.5, -2.5, 3.5, -4.5, 5.5])
+
+
+def test_to_decimal_degrees():
+    data = pd.DataFrame(
+        {
+            "degrees": ["69", "015", "x"],
+            "minutes": [3.9617, 10.4777, 1.0],
+            "hemisphere": ["S", "W", "N"],
+        }
+    )
+    values = to_decimal_degrees(data["degrees"], data["minutes"], data["hemisphere"])
+    np.testing.assert_allclose(values[:2], [-(69 + 3.9617 / 60), -(15 + 10.4777 / 60)])
+    # Values that are not numbers are missing
+    assert np.isnan(values[2])
@@ -0,0 +1,136 @@
+import os
+import pathlib
+import shutil
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+import yaml
+from upath import UPath
+
+from ..batch import parse_many
+from ..dataset import PARTITIONING, DatasetWriter
+from ..parser import detect_file
+
+TESTS_DATA_PATH = pathlib.Path("tests")
+TEST_CONFIG_PATH = TESTS_DATA_PATH / "config.yaml"
+
+CONFIG = yaml.safe_load(TEST_CONFIG_PATH.open("r"))
+
+GPX_FILES = sorted(
+    filename for filename in CONFIG.get("files", {}) if filename.endswith(".gpx")
+)
+GPX_ROWS = sum(CONFIG["files"][filename]["expected_rows"] for filename in GPX_FILES)
+
+
+def _read(path):
+    return ds.dataset(
+        path, format="parquet", partitioning="hive", exclude_invalid_files=True
+    ).to_table()
+
+
+@pytest.mark.timeout(10)
+def test_dataset_writer_partitions(tmp_path):
+    with DatasetWriter(UPath(tmp_path)) as writer:
+        for filename in GPX_FILES:
+            writer.write(detect_file(TESTS_DATA_PATH / "files" / filename).as_table())
+
+    assert writer.written_rows == GPX_ROWS
+    table = _read(tmp_path)
+    assert len(table) == GPX_ROWS
+    assert set(PARTITIONING) <= set(table.column_names)
+    assert set(table.column("_datatype").to_pylist()) == {"gps_gpx"}
+    assert set(table.column("device").to_pylist()) == {
+        pathlib.Path(filename).stem for filename in GPX_FILES
+    }
+
+    for path in tmp_path.rglob("*.parquet"):
+        partitions = [part.split("=")[0] for part in path.relative_to(tmp_path).parts]
+        assert partitions[:-1] == PARTITIONING
+
+
+def test_dataset_device_is_logger_id(tmp_path):
+    """The files of one logger share its device partition."""
+    source = TESTS_DATA_PATH / "files" / "232772_20231115_12030_Ornitela_gpslogger.csv"
+    with DatasetWriter(UPath(tmp_path / "dataset")) as writer:
+        for name in ("part1.csv", "part2.csv"):
+            path = tmp_path / name
+            path.write_bytes(source.read_bytes())
+            writer.write(detect_file(path).as_table())
+
+    table = _read(tmp_path / "dataset")
+    # Hive partitioning reads the numeric id back as a number
+    assert set(table.column("device").to_pylist()) == {232772}
+    assert set(table.column("_logger_file").to_pylist()) == {"part1.csv", "part2.csv"}
+
+
+@pytest.mark.timeout(10)
+def test_dataset_writer_rolls_files_over(tmp_path):
+    table = detect_file(TESTS_DATA_PATH / "files" / GPX_FILES[0]).as_table()
+    with DatasetWriter(UPath(tmp_path), max_rows_per_file=10, rows_per_group=5) as w:
+        w.write(table, device="tag")
+
+    files = list(tmp_path.rglob("*.parquet"))
+    assert len(files) > 1
+    for path in files:
+        metadata = pq.ParquetFile(path).metadata
+        assert metadata.num_rows <= 10
+        assert all(
+            metadata.row_group(index).num_rows <= 5
+            for index in range(metadata.num_row_groups)
+        )
+    assert len(_read(tmp_path)) == len(table)
+
+
+@pytest.mark.timeout(30)
+def test_parse_many_dataset(tmp_path):
+    summary = parse_many(
+        [str(TESTS_DATA_PATH / "files" / "*.gpx")],
+        str(tmp_path),
+        workers=2,
+        dataset=True,
+    )
+    assert len(summary.succeeded) == len(GPX_FILES)
+    assert len(_read(tmp_path)) == GPX_ROWS
+
+    # Unchanged inputs are not appended a second time
+    summary = parse_many(
+        [str(TESTS_DATA_PATH / "files" / "*.gpx")],
+        str(tmp_path),
+        workers=2,
+        dataset=True,
+    )
+    assert len(summary.skipped) == len(GPX_FILES)
+    assert len(_read(tmp_path)) == GPX_ROWS
+
+
+@pytest.mark.timeout(30)
+def test_parse_many_dataset_replaces_changed_inputs(tmp_path):
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    for filename in GPX_FILES:
+        shutil.copy(TESTS_DATA_PATH / "files" / filename, inputs)
+    output = tmp_path / "output"
+
+    parse_many([str(inputs)], str(output), workers=1, dataset=True)
+    assert len(_read(output)) == GPX_ROWS
+
+    # The inputs written together share their files: all are appended again
+    os.utime(inputs / GPX_FILES[0], (0, 0))
+    summary = parse_many([str(inputs)], str(output), workers=1, dataset=True)
+    assert len(summary.succeeded) == len(GPX_FILES)
+    assert len(_read(output)) == GPX_ROWS
+
+    # Inputs written on their own: only the changed one is appended again
+    separate = tmp_path / "separate"
+    for filename in GPX_FILES:
+        parse_many([str(inputs / filename)], str(separate), workers=1, dataset=True)
+    os.utime(inputs / GPX_FILES[1], (10, 10))
+    summary = parse_many([str(inputs)], str(separate), workers=1, dataset=True)
+    assert [result.path for result in summary.succeeded] == [str(inputs / GPX_FILES[1])]
+    assert len(summary.skipped) == len(GPX_FILES) - 1
+    assert len(_read(separate)) == GPX_ROWS
+
+    # Inputs appended again with incremental off replace their rows too
+    parse_many([str(inputs)], str(output), workers=1, dataset=True, incremental=False)
+    assert len(_read(output)) == GPX_ROWS
@@ -0,0 +1,47 @@
+import codecs
+
+import pytest
+
+from ..encoding import EncodingTier, detect_encoding
+from ..parser_base import Parsable
+
+
+@pytest.mark.parametrize(
+    "sample,complete,encoding,tier",
+    [
+        (codecs.BOM_UTF8 + b"UUID,Temperature\n", True, "UTF-8-SIG", EncodingTier.BOM),
+        (
+            codecs.BOM_UTF16_LE + "a,b\n".encode("utf-16-le"),
+            True,
+            "UTF-16",
+            EncodingTier.BOM,
+        ),
+        (b"Date,Time,Latitude\n", True, "ascii", EncodingTier.ASCII),
+        (b"Date,Time,Latitude\n", False, "utf-8", EncodingTier.ASCII),
+        ("Røst,Latitude\n".encode(), True, "utf-8", EncodingTier.UTF8),
+        # A multi-byte character cut at the end of a partial sample
+        ("Røst,Latitude\nø".encode()[:-1], False, "utf-8", EncodingTier.UTF8),
+    ],
+)
+def test_detect_encoding_tiers(sample, complete, encoding, tier):
+    detection = detect_encoding(sample, complete=complete)
+    assert detection.encoding == encoding
+    assert detection.tier == tier
+
+
+def test_detect_encoding_falls_back_to_chardet():
+    sample = "Température,Lufttrykk,Høyde\n".encode("latin-1") * 20
+    detection = detect_encoding(sample, complete=True)
+    assert detection.tier == EncodingTier.CHARDET
+    assert detection.bytes_read == len(sample)
+    assert sample.decode(detection.encoding).startswith("Température")
+
+
+def test_parsable_encoding_sample_is_bounded(tmp_path):
+    path = tmp_path / "large.csv"
+    path.write_bytes(b"a,b,c\n" + b"1,2,3\n" * 100_000)
+
+    parsable = Parsable(file_path=path, encoding_sample_size=1024)
+    assert parsable.encoding_detection is None
+    assert parsable.encoding == "utf-8"
+    assert parsable.encoding_detection.bytes_read == 1024
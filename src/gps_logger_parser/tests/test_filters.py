@@ -0,0 +1,83 @@
+import datetime
+
+import pyarrow as pa
+import pytest
+
+from ..filters import Filter, filter_mask, parse_filters
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("hdop <= 5", Filter("hdop", "<=", 5)),
+        ("satellites_count>=4", Filter("satellites_count", ">=", 4)),
+        ("hdop < 2.5", Filter("hdop", "<", 2.5)),
+        ("type = GPS", Filter("type", "==", "GPS")),
+        ("id != '12 34'", Filter("id", "!=", "12 34")),
+        ("geometry not null", Filter("geometry", "not null")),
+        ("hdop IS NOT NULL", Filter("hdop", "not null")),
+        ("hdop is null", Filter("hdop", "null")),
+    ],
+)
+def test_parse(text, expected):
+    assert Filter.parse(text) == expected
+    assert Filter.parse(str(expected)) == expected
+
+
+@pytest.mark.parametrize("text", ["hdop", "hdop <", "<= 5", "hdop ~ 5"])
+def test_parse_invalid(text):
+    with pytest.raises(ValueError, match="Invalid filter"):
+        Filter.parse(text)
+
+
+def test_parse_filters():
+    assert parse_filters(None) == []
+    assert parse_filters("hdop <= 5") == [Filter("hdop", "<=", 5)]
+    assert parse_filters(["hdop <= 5", ("id", "null")]) == [
+        Filter("hdop", "<=", 5),
+        Filter("id", "null"),
+    ]
+
+
+def test_evaluate():
+    values = pa.array([1.5, 5.0, None, 7.0])
+    assert Filter("hdop", "<=", 5).evaluate(values).to_pylist() == [
+        True,
+        True,
+        None,
+        False,
+    ]
+    assert Filter("hdop", "null").evaluate(values).to_pylist() == [
+        False,
+        False,
+        True,
+        False,
+    ]
+    # Columns without a source compare as unknown
+    assert Filter("hdop", "<", 5).evaluate(pa.nulls(2)).to_pylist() == [None, None]
+
+
+def test_evaluate_timestamps():
+    values = pa.array(
+        [datetime.datetime(2022, 12, 31, 23), datetime.datetime(2023, 1, 1, 1)],
+        pa.timestamp("us", tz="UTC"),
+    )
+    assert Filter("timestamp", ">=", "2023-01-01").evaluate(values).to_pylist() == [
+        False,
+        True,
+    ]
+    assert Filter("timestamp", ">=", "2023-01-01T00:00+01:00").evaluate(
+        values
+    ).to_pylist() == [True, True]
+
+    with pytest.raises(ValueError, match="cannot compare"):
+        Filter("timestamp", ">=", "tomorrow-ish").evaluate(values)
+    with pytest.raises(ValueError, match="cannot compare"):
+        Filter("hdop", "<", "low").evaluate(pa.array([1.0]))
+
+
+def test_filter_mask():
+    table = pa.table({"hdop": [1.0, None, 3.0, 9.0], "satellites_count": [8, 8, 3, 8]})
+    mask = filter_mask(table, parse_filters(["hdop <= 5", "satellites_count >= 4"]))
+    assert mask.to_pylist() == [True, False, False, False]
+    assert filter_mask(table, []).to_pylist() == [True] * 4
@@ -1,12 +1,20 @@
+import datetime
 import pathlib
 
 import geoarrow.pyarrow as ga
+import pandas as pd
 import pyarrow as pa
 import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import pytest
 import yaml
+from upath import UPath
 
-from ..parser import detect_file
+from .. import parser_base, reader
+from ..dispatch import DispatchIndex, Signature
+from ..gps.gpx import GPXParser
+from ..parser import available_parsers, detect_file, dispatch_index
+from ..parser_base import CSVParser, Parsable, ParserNotSupported
 
 TESTS_DATA_PATH = pathlib.Path("tests")
 TEST_CONFIG_PATH = TESTS_DATA_PATH / "config.yaml"
@@ -85,6 +93,734 @@ def test_harmonizing(file, path, config):
         )
 
 
+@pytest.mark.timeout(2)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_can_parse_uses_cached_head(file, path, config):
+    """can_parse() of every parser must run on the cached prefix only."""
+    parsable = Parsable(file_path=path)
+    read_count = parsable.read_count
+    for parser in available_parsers:
+        parser.can_parse(parsable)
+    assert parsable.read_count == read_count
+
+
+@pytest.mark.timeout(2)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_dispatch_index_matches_can_parse(file, path, config):
+    """The dispatch index must return exactly the parsers whose signature matches."""
+    parsable = Parsable(file_path=path)
+    expected = [
+        parser
+        for parser in available_parsers
+        if any(signature.matches(parsable) for signature in parser.signatures())
+    ]
+    assert dispatch_index.candidates(parsable) == expected
+
+
+def test_dispatch_probe_order_keeps_registry_order(tmp_path):
+    """Parsers without a signature are probed at their registry position."""
+
+    class Indexed:
+        @classmethod
+        def signatures(cls):
+            return [Signature.prefix("date,")]
+
+    class Fallback:
+        @classmethod
+        def signatures(cls):
+            return []
+
+    class LaterIndexed(Indexed):
+        pass
+
+    class Unmatched:
+        @classmethod
+        def signatures(cls):
+            return [Signature.prefix("time,")]
+
+    path = tmp_path / "log.csv"
+    path.write_text("date,latitude\n2020-01-01,62.0\n")
+    index = DispatchIndex([Indexed, Fallback, Unmatched, LaterIndexed])
+    assert index.probe_order(Parsable(file_path=path)) == [
+        Indexed,
+        Fallback,
+        LaterIndexed,
+    ]
+
+
+@pytest.mark.timeout(2)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_constructor_reuses_detection_context(file, path, config, monkeypatch):
+    """A parser handed the context of can_parse must not run detection again."""
+    parser = type(detect_file(path))
+    parsable = Parsable(file_path=path)
+    context = parser.can_parse(parsable)
+    assert context
+
+    def fail(cls, parsable):
+        pytest.fail(f"{cls.__name__}.can_parse called by the constructor")
+
+    monkeypatch.setattr(parser, "can_parse", classmethod(fail))
+    instance = parser(parsable, context=context)
+    assert len(instance.data) == config["expected_rows"]
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "41422_all_data.pos",
+        "Obs250823_130741_Tag47649Press.txt",
+        "020719_BK_An_6199165_CC6_GPS.csv",
+    ],
+)
+def test_divider_context_points_at_first_row(filename):
+    """The data offset of a divider section is the first row that is read."""
+    path = TESTS_DATA_PATH / "files" / filename
+    parser_instance = detect_file(path)
+    rows = path.read_bytes()[parser_instance.context.data_offset :].splitlines()
+    assert len([row for row in rows if row]) == len(parser_instance.data)
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_original_data_modes(file, path, config):
+    """Every retention mode keeps one value per row, or none at all."""
+    parser_instance = detect_file(path)
+    columns = [str(column) for column in parser_instance.data.columns]
+
+    table = parser_instance.as_table(original_data="struct")
+    original = table.column("_original_data")
+    assert [field.name for field in original.type] == columns
+    assert len(original) == config["expected_rows"]
+
+    table = detect_file(path).as_table(original_data="none")
+    assert "_original_data" not in table.column_names
+    assert len(table) == config["expected_rows"]
+
+    parser_instance = detect_file(path)
+    if parser_instance._csv_options() is None:
+        # Parsers not reading their rows from a byte range have no source lines
+        with pytest.raises(ValueError, match="byte range of the data rows"):
+            parser_instance.as_table(original_data="line")
+        return
+
+    table = parser_instance.as_table(original_data="line")
+    original = table.column("_original_data")
+    assert original.type == pa.string_view()
+    assert len(original) == config["expected_rows"]
+    # One line of the file per row, in the order of the file
+    lines = iter(path.read_text(encoding=parser_instance.file.encoding).splitlines())
+    assert all(line in lines for line in original.to_pylist())
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_harmonization_engines_match(file, path, config):
+    """The Arrow engine builds the same table as the pandas one."""
+    arrow = detect_file(path).as_table(engine="arrow")
+    pandas = detect_file(path).as_table(engine="pandas")
+    assert arrow.schema.remove_metadata() == pandas.schema.remove_metadata()
+    # WKB geometries compare equal even with NaN coordinates
+    assert arrow.equals(pandas.replace_schema_metadata(None))
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_write_parquet_in_batches(file, path, config, tmp_path):
+    """Writing batch by batch gives the same file as writing the whole table."""
+    rows = detect_file(path).write_parquet(tmp_path, filename="whole")
+    assert rows == config["expected_rows"]
+
+    rows = detect_file(path).write_parquet(tmp_path, filename="batches", batch_size=7)
+    assert rows == config["expected_rows"]
+    assert pq.read_table(tmp_path / "batches.parquet").equals(
+        pq.read_table(tmp_path / "whole.parquet")
+    )
+
+
+# Metadata columns kept whatever columns are requested
+METADATA = ("_datatype", "_parser", "_logger_file")
+
+
+@pytest.mark.timeout(10)
+@pytest.mark.parametrize("file,path,config", test_files)
+def test_column_projection(file, path, config):
+    """Each harmonized column comes out the same when it is the only one read."""
+    full = detect_file(path).as_table(original_data="none")
+    for column in detect_file(path).get_harmonization_schema():
+        table = detect_file(path, columns=[column]).as_table(original_data="none")
+        assert table.equals(
+            full.select(
+                [name for name in full.column_names if name in (column, *METADATA)]
+            )
+        ), column
+
+
+ORNITELA_PATH = (
+    TESTS_DATA_PATH / "files" / "232772_20231115_12030_Ornitela_gpslogger.csv"
+)
+
+
+@pytest.fixture(scope="module")
+def large_ornitela(tmp_path_factory):
+    """An Ornitela file of 200 000 rows (35 MB), much larger than a batch."""
+    header, *lines = ORNITELA_PATH.read_text().splitlines(keepends=True)
+    path = tmp_path_factory.mktemp("large") / ORNITELA_PATH.name
+    with path.open("w") as stream:
+        stream.write(header)
+        for _ in range(200_000 // len(lines)):
+            stream.writelines(lines)
+    return path, len(lines) * (200_000 // len(lines))
+
+
+def test_iter_batches_streams_large_files(large_ornitela):
+    path, expected_rows = large_ornitela
+    parser_instance = detect_file(path)
+    assert isinstance(parser_instance, CSVParser)
+    # Detection only read the first rows
+    assert parser_instance._data is None
+
+    sizes = [len(batch) for batch in parser_instance.iter_batches(batch_size=30_000)]
+    assert sum(sizes) == expected_rows
+    assert max(sizes) == 30_000
+    assert parser_instance._data is None
+
+
+@pytest.mark.limit_memory("60 MB")
+def test_write_parquet_in_batches_bounded_memory(large_ornitela, tmp_path):
+    """Peak memory follows the batch size, not the file size.
+
+    Only checked with ``pytest --memray``: written whole, the file peaks
+    above 400 MB.
+    """
+    path, expected_rows = large_ornitela
+    rows = detect_file(path).write_parquet(tmp_path, batch_size=10_000)
+    assert rows == expected_rows
+    assert pq.ParquetFile(tmp_path / f"{path.name}.parquet").metadata.num_rows == (
+        expected_rows
+    )
+
+
+def test_column_projection_reads_sources(large_ornitela):
+    """Only the source columns of the requested columns are parsed."""
+    path, expected_rows = large_ornitela
+    columns = ["id", "timestamp", "geometry"]
+    parser_instance = detect_file(path, columns=columns)
+    batches = parser_instance.iter_batches(
+        batch_size=50_000, original_data="struct", quality_control="flag"
+    )
+    table = pa.Table.from_batches(list(batches))
+    assert parser_instance._data is None
+    assert len(table) == expected_rows
+    assert table.column_names == [*columns, "qc_flags", "_original_data", *METADATA]
+    assert [field.name for field in table.column("_original_data").type] == [
+        "device_id",
+        "Latitude",
+        "Longitude",
+        "UTC_timestamp",
+    ]
+
+
+def test_column_projection_rereads_rows():
+    """Rows read for some columns are read again for others."""
+    parser_instance = detect_file(ORNITELA_PATH, columns=["latitude"])
+    assert list(parser_instance._data.columns) == ["Latitude"]
+    assert parser_instance.as_table(columns=["hdop"]).column_names == [
+        "hdop",
+        "_original_data",
+        *METADATA,
+    ]
+    table = parser_instance.as_table(columns=["latitude"], quality_control="drop")
+    assert table.column_names[:2] == ["latitude", "qc_flags"]
+    assert list(parser_instance._data.columns) == ["Latitude"]
+
+    with pytest.raises(ValueError, match="unknown columns"):
+        parser_instance.as_table(columns=["pressure"])
+
+
+def test_timestamp_format_sniffed_once(large_ornitela, monkeypatch):
+    """Text timestamps are parsed with the format sniffed on the first batch."""
+    path, _expected_rows = large_ornitela
+    sniffed = []
+    sniff_format = parser_base.sniff_format
+    monkeypatch.setattr(
+        parser_base,
+        "sniff_format",
+        lambda *args, **kwargs: sniffed.append(args) or sniff_format(*args, **kwargs),
+    )
+
+    parser_instance = detect_file(path)
+    batches = parser_instance.iter_batches(batch_size=50_000, original_data="none")
+    timestamps = pa.Table.from_batches(list(batches)).column("timestamp")
+    assert len(sniffed) == 1
+    assert parser_instance._timestamp_formats == {"timestamp": "ISO8601"}
+    assert timestamps.type == pa.timestamp("us")
+    assert timestamps.null_count == 0
+
+
+ACCELEROMETER_PATH = (
+    TESTS_DATA_PATH / "files" / "ES-SK-F-19011-295827-20200702-X27_Acc.txt"
+)
+
+
+def test_scan_large_file(large_ornitela, monkeypatch):
+    """A scan only parses windows of the rows, and agrees with a full read."""
+    path, expected_rows = large_ornitela
+    parser_instance = detect_file(path)
+    summary = parser_instance.scan()
+    assert parser_instance._data is None
+    assert not summary.exact
+    assert summary.rows == pytest.approx(expected_rows, rel=0.01)
+    assert parser_instance.scan(count_rows=True).rows == expected_rows
+
+    # Windows covering the whole file read every row
+    monkeypatch.setattr(parser_base.Parser, "SCAN_WINDOWS", 1_000)
+    exact = detect_file(path).scan()
+    assert exact.exact
+    assert exact.rows == expected_rows
+    assert summary._replace(rows=exact.rows, exact=True) == exact
+
+
+def test_scan_small_file():
+    path = TESTS_DATA_PATH / "files" / "41422_all_data.pos"
+    table = detect_file(path).as_table()
+    summary = detect_file(path).scan()
+    assert summary.exact
+    assert summary.device == "41422_all_data"
+    assert summary.rows == len(table)
+    assert summary.first_timestamp == table.column("timestamp")[0].as_py()
+    assert summary.last_timestamp == table.column("timestamp")[-1].as_py()
+    # The fixes at 0, 0 are left out
+    assert summary.bbox == (5.49705, 62.392794, 5.65712, 62.550145)
+
+
+def test_scan_remote_file(large_ornitela):
+    """Remote files are scanned with a range request per window."""
+    path, _expected_rows = large_ornitela
+    remote = UPath("memory://logs") / path.name
+    remote.write_bytes(path.read_bytes())
+    try:
+        parser_instance = detect_file(remote)
+        reads = parser_instance.file.read_count
+        summary = parser_instance.scan()
+        windows = parser_base.Parser.SCAN_WINDOWS + 1
+        assert parser_instance.file.read_count - reads == windows
+        assert summary == detect_file(path).scan()._replace(path=str(remote))
+    finally:
+        remote.unlink()
+
+
+def test_accelerometer_datetime_across_batches(tmp_path):
+    """Samples read in batches are dated from their position in the file."""
+    content = ACCELEROMETER_PATH.read_text()
+    path = tmp_path / ACCELEROMETER_PATH.name
+    path.write_text(content + "-.08, 0, 1.05,\n" * 20_000)
+
+    parser_instance = detect_file(path)
+    assert parser_instance._data is None
+    batches = parser_instance.iter_batches(batch_size=3_000, original_data="none")
+    timestamps = pa.Table.from_batches(list(batches)).column("timestamp")
+
+    whole = detect_file(path)
+    whole.data = whole.read_data()
+    assert timestamps.equals(whole.as_table().column("timestamp"))
+    # 10 msec/point from the START DATE and START TIME of the preamble
+    assert timestamps[0].as_py().isoformat() == "2020-07-01T13:44:35"
+    assert timestamps[-1].as_py() - timestamps[-2].as_py() == datetime.timedelta(
+        milliseconds=10
+    )
+
+
+@pytest.fixture(scope="module")
+def sorted_ornitela(tmp_path_factory):
+    """An Ornitela file of 50 000 rows, a fix every 30 s from 2023-01-01."""
+    header, *lines = ORNITELA_PATH.read_text().splitlines(keepends=True)
+    path = tmp_path_factory.mktemp("sorted") / ORNITELA_PATH.name
+    start = datetime.datetime(2023, 1, 1)
+    with path.open("w") as stream:
+        stream.write(header)
+        for row in range(50_000):
+            fields = lines[row % len(lines)].split(",")
+            time = start + datetime.timedelta(seconds=30 * row)
+            fields[1] = fields[23] = f"{time:%Y-%m-%d %H:%M:%S}"
+            fields[2], fields[3] = f"{time:%Y-%m-%d}", f"{time:%H:%M:%S}"
+            stream.write(",".join(fields))
+    return path
+
+
+def _in_range(table, start, end):
+    timestamps = table.column("timestamp")
+    return table.filter(
+        pc.and_(
+            pc.greater_equal(timestamps, pa.scalar(start, timestamps.type)),
+            pc.less(timestamps, pa.scalar(end, timestamps.type)),
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [
+        (datetime.datetime(2023, 1, 5, 12), datetime.datetime(2023, 1, 6)),
+        (datetime.datetime(2022, 12, 1), datetime.datetime(2023, 1, 1, 1)),
+        (datetime.datetime(2023, 1, 17, 8), datetime.datetime(2024, 1, 1)),
+        (datetime.datetime(2023, 1, 5, 12, 0, 10), datetime.datetime(2023, 1, 6)),
+    ],
+)
+def test_time_range_sorted_file(sorted_ornitela, start, end):
+    """The rows of a time range are found by searching the file, not reading it."""
+    expected = _in_range(detect_file(sorted_ornitela).as_table(), start, end)
+    assert len(expected) > 0
+
+    parser_instance = detect_file(sorted_ornitela)
+    span_start, span_end, _first_row = parser_instance._time_span(start, end)
+    assert span_end - span_start < parser_instance.file.size / 10
+    assert parser_instance.as_table(time_range=(start, end)).equals(expected)
+    assert parser_instance._data is None
+
+    batches = detect_file(sorted_ornitela).iter_batches(
+        batch_size=100, time_range=(start, end)
+    )
+    assert pa.Table.from_batches(list(batches)).equals(expected)
+
+
+def test_time_range_open_ended(sorted_ornitela):
+    start = datetime.datetime(2023, 1, 17, 8, tzinfo=datetime.timezone.utc)
+    table = detect_file(sorted_ornitela).as_table(time_range=(start, None))
+    assert table.column("timestamp")[0].as_py() == start.replace(tzinfo=None)
+    assert len(table) == 50_000 - 16 * 2880 - 8 * 120
+
+    with pytest.raises(ValueError):
+        detect_file(sorted_ornitela).as_table(
+            time_range=(datetime.datetime(2024, 1, 1), None)
+        )
+
+
+def test_time_range_unsorted_file():
+    """Files not known to be in time order are read whole and filtered."""
+    path = TESTS_DATA_PATH / "files" / "41422_all_data.pos"
+    start, end = datetime.datetime(2016, 1, 1), datetime.datetime(2030, 1, 1)
+    parser_instance = detect_file(path)
+    assert parser_instance._time_span(start, end) is None
+    expected = _in_range(detect_file(path).as_table(), start, end)
+    assert parser_instance.as_table(time_range=(start, end)).equals(expected)
+
+
+@pytest.mark.parametrize("engine", ["arrow", "pandas"])
+@pytest.mark.parametrize(
+    "filename,first",
+    [
+        (
+            "1d00000229.65520.-LocationData-Interrex_gpslogger.csv",
+            datetime.datetime(2023, 5, 23, 12, 52, 26),
+        ),
+        (
+            "1d0000021e.65509.-EnvironmentData-Environment.csv",
+            datetime.datetime(2023, 5, 23, 12, 47, 42),
+        ),
+    ],
+)
+def test_timestamps_with_offsets_are_naive_utc(filename, first, engine):
+    """Interrex writes times as 2023-05-23T12:52:26Z, harmonized without a tz."""
+    table = detect_file(TESTS_DATA_PATH / "files" / filename).as_table(engine=engine)
+    timestamps = table.column("timestamp")
+    assert timestamps.type.tz is None
+    assert timestamps[0].as_py() == first
+
+
+def test_accelerometer_time_range(tmp_path):
+    """Accelerometer rows are found from the start time and the frequency."""
+    content = ACCELEROMETER_PATH.read_text()
+    path = tmp_path / ACCELEROMETER_PATH.name
+    path.write_text(content + "-.08, 0, 1.05,\n" * 20_000)
+    start = datetime.datetime(2020, 7, 1, 13, 44, 40, 5000)
+    end = datetime.datetime(2020, 7, 1, 13, 45, 50)
+
+    whole = detect_file(path)
+    whole.data = whole.read_data()
+    expected = _in_range(whole.as_table(original_data="none"), start, end)
+    assert len(expected) == 7_500 - 501
+
+    parser_instance = detect_file(path)
+    _span_start, _span_end, first_row = parser_instance._time_span(start, end)
+    assert first_row == 501
+    table = parser_instance.as_table(original_data="none", time_range=(start, end))
+    assert table.equals(expected)
+
+
+@pytest.mark.parametrize(
+    "filename,names",
+    [
+        ("CG_DI_A08918_02-07-12.CSV", ["Date/Time Stamp", "Pressure", "Temp"]),
+        ("A15153_20-10-2021.csv", ["Time Stamp", "Pressure", "Temp", "_trailing"]),
+    ],
+)
+def test_tdr_rows_parsed_once(filename, names, monkeypatch):
+    """The column count is probed up front instead of retried on error."""
+    calls = []
+    read_pyarrow = reader._read_pyarrow
+    monkeypatch.setattr(
+        reader,
+        "_read_pyarrow",
+        lambda *args, **kwargs: calls.append(kwargs) or read_pyarrow(*args, **kwargs),
+    )
+
+    parser_instance = detect_file(TESTS_DATA_PATH / "files" / filename)
+    assert parser_instance.names == names
+    assert [call["names"] for call in calls] == [names]
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "41422_all_data.pos",
+        "Obs250823_130741_Tag47649Press.txt",
+        "020719_BK_An_6199165_CC6_GPS.csv",
+        "20160710-6217930-OBS.csv",
+        "BK_AN_161_PT_020713.LOG",
+        "G199_120708.TXT",
+    ],
+)
+def test_data_section_streams(filename, tmp_path):
+    """The rows after a divider or a blank line are read from their byte range."""
+    source = TESTS_DATA_PATH / "files" / filename
+    start, end = detect_file(source)._csv_range()
+    content = source.read_bytes()
+    section = content[start:end].splitlines(keepends=True)
+    # Repeat the first data row past the sniffed prefix
+    path = tmp_path / filename
+    path.write_bytes(
+        content[:start]
+        + b"".join(section[:3] + section[2:3] * 5_000 + section[3:])
+        + (content[end:] if end is not None else b"")
+    )
+
+    parser_instance = detect_file(path)
+    assert type(parser_instance) is type(detect_file(source))
+    assert parser_instance._data is None
+    batches = parser_instance.iter_batches(batch_size=1_000, original_data="none")
+    table = pa.Table.from_batches(list(batches))
+
+    whole = detect_file(path)
+    whole.data = whole.read_data()
+    assert table.equals(whole.as_table(original_data="none"))
+    assert len(table) == len(detect_file(source).as_table()) + 5_000
+
+
+GPX_PATH = TESTS_DATA_PATH / "files" / "20170622-102857.gpx"
+
+
+def _scaled_gpx(source, copies):
+    """The GPX document with its track points repeated ``copies`` times."""
+    content = source.read_text()
+    start = content.index("<trkpt")
+    end = content.rindex("</trkpt>") + len("</trkpt>")
+    return content[:start] + content[start:end] * copies + content[end:]
+
+
+def test_gpx_track_points_in_batches(tmp_path):
+    path = tmp_path / GPX_PATH.name
+    path.write_text(_scaled_gpx(GPX_PATH, 500))
+
+    parser_instance = detect_file(path)
+    assert parser_instance._data is None
+    batches = list(parser_instance.iter_data(batch_size=1_000))
+    assert max(len(batch) for batch in batches) == 1_000
+
+    whole = detect_file(path)
+    whole.data = whole.read_data()
+    assert pd.concat(batches, ignore_index=True).equals(whole.data)
+    assert len(whole.data) == len(detect_file(GPX_PATH).data) * 500
+
+
+def test_gpx_11_extension_fields(tmp_path):
+    """Speed and course are GPX 1.0 elements, extensions in GPX 1.1."""
+    path = tmp_path / "track.gpx"
+    path.write_text(
+        '<?xml version="1.0"?>\n'
+        '<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"><trk><trkseg>'
+        '<trkpt lat="1.5" lon="-2"><ele>3</ele><time>2020-01-01T02:00:00+02:00</time>'
+        "<speed>4</speed><sat>6</sat><hdop>0.9</hdop><type>fix</type></trkpt>"
+        '<trkpt lat="1.6" lon="-2.1"/>'
+        "</trkseg></trk></gpx>"
+    )
+    data = detect_file(path).data
+    assert data["latitude"].tolist() == [1.5, 1.6]
+    assert data["elevation"].iloc[0] == 3
+    assert data["satellites"].iloc[0] == 6
+    assert data["type"].tolist() == ["fix", None]
+    assert data["speed"].isna().all()
+    assert data["time"].iloc[0] == pd.Timestamp("2020-01-01T00:00:00Z")
+    assert data["time"].isna().iloc[1]
+
+
+def test_gpx_parser_rejects_other_xml(tmp_path):
+    path = tmp_path / "other.xml"
+    path.write_text('<?xml version="1.0"?>\n<kml><Document/></kml>')
+    with pytest.raises(ParserNotSupported, match="root element"):
+        GPXParser(Parsable(file_path=path))
+
+
+def test_local_files_are_memory_mapped(monkeypatch):
+    maps = []
+    memory_map = pa.memory_map
+    monkeypatch.setattr(
+        pa, "memory_map", lambda path: maps.append(path) or memory_map(path)
+    )
+
+    path = TESTS_DATA_PATH / "files" / "41422_all_data.pos"
+    table = detect_file(path).as_table()
+    assert maps
+    assert set(maps) == {str(path)}
+
+    monkeypatch.setattr(Parsable, "MEMORY_MAP", False)
+    maps.clear()
+    assert detect_file(path).as_table().equals(table)
+    assert maps == []
+
+
+def test_remote_files_are_streamed():
+    """Files that are not on the local disk are read through fsspec."""
+    path = TESTS_DATA_PATH / "files" / "41422_all_data.pos"
+    remote = UPath("memory://logs") / path.name
+    remote.write_bytes(path.read_bytes())
+    try:
+        parsable = Parsable(file_path=remote)
+        assert parsable.local_path is None
+        table = detect_file(remote).as_table(original_data="none")
+        assert table.equals(detect_file(path).as_table(original_data="none"))
+    finally:
+        remote.unlink()
+
+
+def test_original_data_line():
+    """Line mode slices the data rows out of the file, without terminators."""
+    path = TESTS_DATA_PATH / "files" / "An12_PC.txt"
+    lines = path.read_text().splitlines()[1:]
+    table = detect_file(path).as_table(original_data="line")
+    assert table.column("_original_data").to_pylist() == [
+        line for line in lines if line
+    ]
+
+    # Lines are sliced for all the rows, then filtered with them
+    median = sorted(table.column("latitude").to_pylist())[len(table) // 2]
+    filtered = detect_file(path).as_table(
+        original_data="line", filters=f"latitude < {median}"
+    )
+    kept = [latitude < median for latitude in table.column("latitude").to_pylist()]
+    assert filtered.drop_columns("_original_data").equals(
+        table.drop_columns("_original_data").filter(kept)
+    )
+    assert filtered.column("_original_data").to_pylist() == [
+        line
+        for line, keep in zip(
+            table.column("_original_data").to_pylist(), kept, strict=True
+        )
+        if keep
+    ]
+    assert 0 < len(filtered) < len(table)
+
+
+def test_original_data_line_needs_byte_range(monkeypatch):
+    """Parsers without source lines are rejected before any row is read."""
+    path = TESTS_DATA_PATH / "files" / "20170622-102857.gpx"
+    parser_instance = detect_file(path)
+    monkeypatch.setattr(
+        type(parser_instance), "_rows", lambda *args: pytest.fail("rows read")
+    )
+    with pytest.raises(ValueError, match="byte range of the data rows"):
+        parser_instance.as_table(original_data="line")
+
+
+def test_original_data_line_skips_dropped_lines():
+    """Lines the reader drops, like the TDR end markers, have no row."""
+    path = TESTS_DATA_PATH / "files" / "A15153_20-10-2021.csv"
+    *rows, end_marker = [line for line in path.read_text().splitlines() if line]
+    assert end_marker == "No Fast Data"
+    table = detect_file(path).as_table(original_data="line")
+    lines = table.column("_original_data").to_pylist()
+    assert lines == rows[-len(lines) :]
+
+
+def test_quality_control():
+    path = TESTS_DATA_PATH / "files" / "41422_all_data.pos"
+    table = detect_file(path).as_table()
+    assert "qc_flags" not in table.column_names
+
+    flagged = detect_file(path).as_table(quality_control="flag")
+    flags = flagged.column("qc_flags")
+    assert flagged.column_names.index("qc_flags") < flagged.column_names.index(
+        "_original_data"
+    )
+    assert flagged.drop_columns("qc_flags").equals(table)
+    assert 0 < pc.sum(pc.not_equal(flags, 0)).as_py() < len(flagged)
+
+    dropped = detect_file(path).as_table(quality_control="drop")
+    assert dropped.equals(flagged.filter(pc.equal(flags, 0)))
+
+    # Fixes at the edges of a batch are compared with the neighbouring batches
+    batches = detect_file(path).iter_batches(batch_size=7, quality_control="flag")
+    assert pa.Table.from_batches(batches).equals(flagged)
+
+
+def test_filters(monkeypatch):
+    """Rows are filtered before their other columns are built."""
+    table = detect_file(ORNITELA_PATH).as_table()
+    keep = pc.and_(
+        pc.less_equal(table.column("hdop"), 2),
+        pc.greater_equal(table.column("satellites_count"), 6),
+    )
+    expected = table.filter(keep)
+    assert 0 < len(expected) < len(table)
+
+    built = []
+    harmonize_prepared = CSVParser._harmonize_prepared
+    monkeypatch.setattr(
+        CSVParser,
+        "_harmonize_prepared",
+        lambda self, data, columns=None: (
+            built.append((len(data), columns))
+            or harmonize_prepared(self, data, columns)
+        ),
+    )
+    filters = ["hdop <= 2", "satellites_count >= 6"]
+    assert detect_file(ORNITELA_PATH).as_table(filters=filters).equals(expected)
+    assert built == [
+        (len(table), ["hdop", "satellites_count"]),
+        (len(expected), None),
+    ]
+
+    batches = detect_file(ORNITELA_PATH).iter_batches(batch_size=7, filters=filters)
+    assert pa.Table.from_batches(batches).equals(expected)
+
+    projected = detect_file(ORNITELA_PATH, columns=["timestamp"]).as_table(
+        original_data="none", filters=filters
+    )
+    assert projected.column_names == ["timestamp", *METADATA]
+    assert projected.column("timestamp").equals(expected.column("timestamp"))
+
+
+def test_filter_geometry():
+    """The geometry is null where the longitude or latitude is missing."""
+    path = TESTS_DATA_PATH / "files" / "110708210243 BKAN 199 ZE.LOG"
+    table = detect_file(path).as_table(original_data="struct")
+    filtered = detect_file(path).as_table(
+        original_data="struct", filters="geometry not null"
+    )
+    assert filtered.equals(
+        table.filter(pc.invert(pc.is_null(table.column("longitude"), nan_is_null=True)))
+    )
+    assert len(filtered) == len(table) - 1
+
+
+def test_filters_unknown_columns():
+    parser_instance = detect_file(ORNITELA_PATH)
+    with pytest.raises(ValueError, match="unknown columns"):
+        parser_instance.as_table(filters=["pressure > 1000"])
+    with pytest.raises(ValueError, match="Invalid filter"):
+        parser_instance.as_table(filters=["hdop"])
+
+
 gps_test_files = [
     (filename, TESTS_DATA_PATH / "files" / filename, conf)
     for filename, conf in CONFIG.get("files", {}).items()
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from ..quality import Fix, haversine, speed_outliers
+
+# One fix a minute along a meridian, 300 m apart (5 m/s)
+TIMESTAMPS = np.datetime64("2020-06-17T12:00") + np.arange(6) * np.timedelta64(1, "m")
+LATITUDES = 62.0 + np.arange(6) * 300 / 111_195
+LONGITUDES = np.full(6, 5.5)
+
+
+def test_haversine():
+    # A degree of latitude, and a quarter of the equator
+    assert haversine(0, 0, 1, 0) == pytest.approx(111_195, rel=1e-4)
+    assert haversine(0, 0, 0, 90) == pytest.approx(10_007_543, rel=1e-4)
+    assert haversine(62.0, 5.5, 62.0, 5.5) == 0
+
+
+def test_speed_outliers_flag_the_spike_only():
+    latitudes = LATITUDES.copy()
+    latitudes[3] = 63.0
+    outliers = speed_outliers(TIMESTAMPS, latitudes, LONGITUDES, max_speed=10)
+    assert outliers.tolist() == [False, False, False, True, False, False]
+
+
+@pytest.mark.parametrize("position", [0, 5])
+def test_speed_outliers_ends(position):
+    latitudes = LATITUDES.copy()
+    latitudes[position] = 63.0
+    outliers = speed_outliers(TIMESTAMPS, latitudes, LONGITUDES, max_speed=10)
+    assert np.flatnonzero(outliers).tolist() == [position]
+
+
+@pytest.mark.parametrize("position", [1, 4])
+def test_speed_outliers_spare_the_ends(position):
+    """An outlier next to the first or last fix does not flag it."""
+    latitudes = LATITUDES.copy()
+    latitudes[position] = 63.0
+    outliers = speed_outliers(TIMESTAMPS, latitudes, LONGITUDES, max_speed=10)
+    assert np.flatnonzero(outliers).tolist() == [position]
+
+
+def test_speed_outliers_two_fixes():
+    """With a single speed, the wrong fix of the two is unknown."""
+    outliers = speed_outliers(
+        TIMESTAMPS[:2], [62.0, 63.0], LONGITUDES[:2], max_speed=10
+    )
+    assert not outliers.any()
+
+
+def test_speed_outliers_skip_fixes_without_position():
+    latitudes = LATITUDES.copy()
+    longitudes = LONGITUDES.copy()
+    latitudes[1] = np.nan
+    latitudes[2] = longitudes[2] = 0
+    timestamps = TIMESTAMPS.copy()
+    timestamps[4] = np.datetime64("NaT")
+    outliers = speed_outliers(timestamps, latitudes, longitudes, max_speed=10)
+    assert not outliers.any()
+
+
+def test_speed_outliers_neighbours():
+    """Fixes of the neighbouring batches are compared with the ends."""
+    latitudes = LATITUDES.copy()
+    latitudes[0] = 63.0
+    outliers = speed_outliers(TIMESTAMPS, latitudes, LONGITUDES, max_speed=10)
+    assert outliers[0]
+
+    before = Fix(TIMESTAMPS[0] - np.timedelta64(1, "m"), 63.0, 5.5)
+    outliers = speed_outliers(
+        TIMESTAMPS, latitudes, LONGITUDES, max_speed=10, before=before
+    )
+    assert not outliers[0]
+
+    after = Fix(TIMESTAMPS[-1] + np.timedelta64(1, "m"), 63.0, 5.5)
+    outliers = speed_outliers(
+        TIMESTAMPS, LATITUDES, LONGITUDES, max_speed=10, after=after
+    )
+    assert not outliers.any()
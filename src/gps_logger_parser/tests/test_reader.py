@@ -0,0 +1,141 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from .. import reader
+from ..reader import CSVEngine, iter_csv, join_decimal_parts, read_csv
+
+ROWS = (
+    b"device,datetime,date,time,latitude,empty\n"
+    b"1,2023-04-28 09:47:40,2023-04-28,09:47:40,63.4,\n"
+    b"1,2023-04-28 09:58:51,2023-04-28,09:58:51,63.5,\n"
+)
+
+
+@pytest.mark.parametrize("engine", list(CSVEngine))
+def test_read_csv_types_like_pandas(engine):
+    """Dates and times stay text and empty columns are float, whatever the engine."""
+    data = read_csv(io.BytesIO(ROWS), engine=engine)
+    assert list(data.columns) == [
+        "device",
+        "datetime",
+        "date",
+        "time",
+        "latitude",
+        "empty",
+    ]
+    assert data["datetime"].tolist() == ["2023-04-28 09:47:40", "2023-04-28 09:58:51"]
+    assert data["time"].tolist() == ["09:47:40", "09:58:51"]
+    assert data["empty"].dtype == "float64"
+    assert data["device"].dtype == "int64"
+
+
+@pytest.mark.parametrize("engine", list(CSVEngine))
+def test_iter_csv_batches(engine):
+    """Batches hold the rows of read_csv, typed the same way."""
+    rows = ROWS.splitlines(keepends=True)
+    rows = rows[0] + b"".join(rows[1:] * 500)
+    whole = read_csv(rows, engine=engine)
+
+    batches = list(iter_csv(rows, 300, engine=engine, block_size=1024))
+    assert [len(batch) for batch in batches] == [300, 300, 300, 100]
+    for batch in batches:
+        assert batch.dtypes.to_dict() == whole.dtypes.to_dict()
+    assert pd.concat(batches, ignore_index=True).equals(whole)
+
+
+def test_iter_csv_keeps_first_block_types():
+    rows = b"a,b\n" + b"1,\n" * 2000 + b"2,text\n"
+    with pytest.raises(pa.ArrowInvalid):
+        list(iter_csv(rows, 100, block_size=1024))
+
+
+def test_read_csv_temporal_past_first_block():
+    """A column first holding dates after the first block is still read as text."""
+    rows = b"a,b\n" + b"1,\n" * 2000 + b"2,2023-04-28\n"
+    data = read_csv(rows, block_size=1024)
+    assert data["b"].iloc[-1] == "2023-04-28"
+
+
+def test_read_csv_names_and_positions():
+    rows = b"skipped\nA,B,,\n1,2,,\n3,4,,\n"
+    data = read_csv(rows, names=["a", "b"], skip_rows=2, usecols=[0, 1])
+    assert data.to_dict(orient="list") == {"a": [1, 3], "b": [2, 4]}
+
+
+@pytest.mark.parametrize("engine", list(CSVEngine))
+def test_read_csv_include_columns(engine):
+    data = read_csv(
+        ROWS,
+        names=["device", "datetime", "date", "time", "latitude", "empty"],
+        skip_rows=1,
+        include_columns=["latitude", "device", "missing"],
+        engine=engine,
+    )
+    assert list(data.columns) == ["latitude", "device", "missing"]
+    assert data["latitude"].tolist() == [63.4, 63.5]
+    assert data["missing"].isna().all()
+
+
+def test_read_csv_trailing_separator():
+    rows = b"1,2,\n3,4,\n"
+    with pytest.raises(pa.ArrowInvalid):
+        read_csv(rows, names=["a", "b"], fallback=False)
+
+    data = read_csv(rows, names=["a", "b"], trailing_separator=True, fallback=False)
+    assert data.to_dict(orient="list") == {"a": [1, 3], "b": [2, 4]}
+
+
+def test_read_csv_invalid_row_handler():
+    rows = b"1,2\nPower off\n3,4\n"
+
+    def skip(row):
+        return "skip" if row.text == "Power off" else "error"
+
+    data = read_csv(rows, names=["a", "b"], invalid_row_handler=skip)
+    assert data.to_dict(orient="list") == {"a": [1, 3], "b": [2, 4]}
+
+
+def test_read_csv_falls_back_to_pandas(monkeypatch):
+    rows = b"1,2\n3\n"
+    calls = []
+    read_pandas = reader._read_pandas
+    monkeypatch.setattr(
+        reader,
+        "_read_pandas",
+        lambda *args, **kwargs: calls.append(args) or read_pandas(*args, **kwargs),
+    )
+
+    data = read_csv(rows, names=["a", "b"])
+    assert calls
+    assert data["a"].tolist() == [1, 3]
+
+    with pytest.raises(pa.ArrowInvalid):
+        read_csv(rows, names=["a", "b"], fallback=False)
+
+
+def test_read_csv_encoding():
+    rows = "place,value\nRøst,1\n".encode("latin-1")
+    data = read_csv(io.BytesIO(rows), encoding="latin-1")
+    assert data["place"].tolist() == ["Røst"]
+
+
+@pytest.mark.parametrize("engine", list(CSVEngine))
+def test_read_csv_decimal_comma(engine):
+    rows = b"date;latitude;hdop\n20.06.2011;70,387711;1,585856e-06\n21.06.2011;0;2\n"
+    data = read_csv(rows, separator=";", decimal_point=",", engine=engine)
+    assert data["date"].tolist() == ["20.06.2011", "21.06.2011"]
+    assert data["latitude"].tolist() == [70.387711, 0]
+    assert data["hdop"].tolist() == [1.585856e-06, 2]
+    assert data["hdop"].dtype == "float64"
+
+
+def test_join_decimal_parts():
+    integers = pd.Series(["-0", "34", "-12", None])
+    fractions = pd.Series(["26", "013", "5", "1"])
+    values = join_decimal_parts(integers, fractions)
+    assert values[:3].tolist() == [float("-0.26"), float("34.013"), float("-12.5")]
+    assert np.isnan(values[3])
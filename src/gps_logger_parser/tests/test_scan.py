@@ -0,0 +1,29 @@
+import io
+
+from ..scan import count_lines, merge_bounds, whole_lines, window_ranges
+
+
+def test_window_ranges():
+    assert window_ranges(10, 100, size=16, windows=4) is None
+    windows = window_ranges(10, 1_010, size=16, windows=3)
+    assert windows == [(10, 26), (252, 268), (502, 518), (752, 768), (994, 1_010)]
+
+
+def test_whole_lines():
+    block = b"ow 1\nrow 2\nrow 3\nro"
+    assert whole_lines(block, first=False, last=False) == b"row 2\nrow 3\n"
+    assert whole_lines(block, first=True, last=True) == block
+    assert whole_lines(b"no line break", first=False, last=False) == b""
+
+
+def test_count_lines():
+    data = b"header\nrow 1\r\nrow 2\nrow 3"
+    assert count_lines(io.BytesIO(data), 7, len(data), chunk_size=4) == 3
+    assert count_lines(io.BytesIO(data), 7, 20, chunk_size=4) == 2
+    assert count_lines(io.BytesIO(data), 7, 7) == 0
+
+
+def test_merge_bounds():
+    assert merge_bounds(None, None) is None
+    assert merge_bounds(None, (1, 2, 3, 4)) == (1, 2, 3, 4)
+    assert merge_bounds((1, 2, 3, 4), (0, 3, 2, 5)) == (0, 2, 3, 5)
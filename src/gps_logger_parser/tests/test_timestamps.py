@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..timestamps import (
+    DAY_FIRST_FORMATS,
+    from_components,
+    parse_timestamps,
+    sniff_format,
+)
+
+
+def test_from_components():
+    data = pd.DataFrame(
+        {
+            "year": [2020, 2024],
+            "month": [6, 2],
+            "day": [17, 29],
+            "hour": [17, 23],
+            "minute": [46, 59],
+            "second": [1, 59.25],
+        },
+        index=[5, 6],
+    )
+    timestamps = from_components(*(data[column] for column in data.columns))
+    assert timestamps.index.tolist() == [5, 6]
+    assert timestamps.tolist() == [
+        pd.Timestamp("2020-06-17 17:46:01"),
+        pd.Timestamp("2024-02-29 23:59:59.250"),
+    ]
+    assert timestamps.dtype == "datetime64[us]"
+
+
+def test_from_components_two_digit_years():
+    years = pd.Series([20, 68, 69, 99, 2001])
+    # Like %y by default
+    assert from_components(years, 1, 1).dt.year.tolist() == [
+        2020,
+        2068,
+        1969,
+        1999,
+        2001,
+    ]
+    assert from_components(years, 1, 1, century=2000).dt.year.tolist() == [
+        2020,
+        2068,
+        2069,
+        2099,
+        2001,
+    ]
+
+
+@pytest.mark.parametrize(
+    "month,day,hour",
+    [(2, 30, 0), (13, 1, 0), (1, 0, 0), (1, 1, 24), (np.nan, 1, 0), ("x", 1, 0)],
+)
+def test_from_components_invalid(month, day, hour):
+    year = pd.Series([2023, 2023])
+    month = pd.Series([1, month], dtype=object)
+    day = pd.Series([1, day])
+    hour = pd.Series([0, hour])
+    with pytest.raises(ValueError, match="row 1"):
+        from_components(year, month, day, hour)
+
+    timestamps = from_components(year, month, day, hour, errors="coerce")
+    assert timestamps.iloc[0] == pd.Timestamp("2023-01-01")
+    assert pd.isna(timestamps.iloc[1])
+
+
+@pytest.mark.parametrize(
+    "values,formats,expected",
+    [
+        (["2023-04-28 09:47:40.000", "2023-05-23T12:52:26"], None, "ISO8601"),
+        # Ambiguous dates are month first, unless a value has the day first
+        (["05/07/16 19:00:00"], None, "%m/%d/%y %H:%M:%S"),
+        (["05/07/16 19:00:00", "29/06/12 16:00:00"], None, "%d/%m/%y %H:%M:%S"),
+        (["05/07/16 19:00:00"], DAY_FIRST_FORMATS, "%d/%m/%y %H:%M:%S"),
+        (["Jul 5 2016 19:00"], None, "mixed"),
+        ([None, ""], None, None),
+    ],
+)
+def test_sniff_format(values, formats, expected):
+    values = pd.Series(values * 50, dtype=object)
+    if formats is None:
+        assert sniff_format(values) == expected
+    else:
+        assert sniff_format(values, formats) == expected
+
+
+def test_parse_timestamps_other_layouts():
+    """Rows the sniffed format fails on are parsed with the other formats."""
+    values = pd.Series(
+        ["07/05/2016 19:00:00"] * 100 + ["2016/07/06 19:00:00", None, " "],
+        index=range(1, 104),
+    )
+    timestamps = parse_timestamps(values)
+    assert timestamps.index.equals(values.index)
+    assert timestamps.iloc[0] == pd.Timestamp("2016-07-05 19:00:00")
+    assert timestamps.iloc[100] == pd.Timestamp("2016-07-06 19:00:00")
+    assert timestamps.iloc[101:].isna().all()
+
+
+def test_parse_timestamps_invalid():
+    values = pd.Series(["07/05/2016 19:00:00", "Power off"])
+    with pytest.raises(ValueError, match="Power off"):
+        parse_timestamps(values, formats=("%m/%d/%Y %H:%M:%S",))
+
+    timestamps = parse_timestamps(values, errors="coerce")
+    assert timestamps.iloc[0] == pd.Timestamp("2016-07-05 19:00:00")
+    assert pd.isna(timestamps.iloc[1])
+
+
+def test_parse_timestamps_keeps_day_and_month_order():
+    """Rows in another order than the sniffed format are not parsed again."""
+    values = pd.Series(["05/07/2016 19:00:00"] * 50 + ["29/06/2016 16:00:00"])
+    month_first = "%m/%d/%Y %H:%M:%S"
+    with pytest.raises(ValueError, match="29/06/2016"):
+        parse_timestamps(values, date_format=month_first)
+
+    timestamps = parse_timestamps(values, date_format=month_first, errors="coerce")
+    assert (timestamps.iloc[:50] == pd.Timestamp("2016-05-07 19:00:00")).all()
+    assert pd.isna(timestamps.iloc[50])
+
+    # Day first formats are only retried with other day first layouts
+    values = pd.Series(["05/07/16 19:00:00"] * 50 + ["29.06.2016 16:00:00"])
+    timestamps = parse_timestamps(values, DAY_FIRST_FORMATS)
+    assert timestamps.iloc[0] == pd.Timestamp("2016-07-05 19:00:00")
+    assert timestamps.iloc[50] == pd.Timestamp("2016-06-29 16:00:00")
@@ -0,0 +1,268 @@
+"""
+Vectorized timestamp construction.
+
+Loggers that write the date and time as separate numeric columns (year,
+month, day, hour, ...) get their timestamps composed arithmetically as
+datetime64 values, instead of joining the columns as strings for
+``pd.to_datetime`` to parse again.
+
+Timestamps written as text are parsed with an exact format, sniffed from a
+sample of the column among candidate formats, so that pandas does not infer
+one on every call. Only the rows the sniffed format fails on are parsed again
+with the other candidates writing the day and month in the same order, so that
+a column never mixes month first and day first dates. Exact formats other
+than ISO 8601 are parsed with Arrow's vectorized ``strptime``, as pandas
+parses them one value at a time.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Two-digit years from this one on are in the 1900s, like strptime's %y
+PIVOT_YEAR = 69
+
+# Candidate formats of timestamp text, in the order they are tried. Month
+# first comes before day first, like pandas' own inference; "mixed" infers
+# the format of each value, for the layouts not listed.
+FORMATS = (
+    "ISO8601",
+    "%m/%d/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%y %H:%M:%S",
+    "%d/%m/%y %H:%M:%S",
+    "%d.%m.%Y %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "mixed",
+)
+# For loggers writing the day first, where 05/07/16 is the 5th of July
+DAY_FIRST_FORMATS = (
+    "ISO8601",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%y %H:%M:%S",
+    "%d.%m.%Y %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "mixed",
+)
+# Values a format is sniffed on, spread over the column
+SAMPLE_SIZE = 64
+
+
+def _component(values, length: int) -> np.ndarray:
+    if np.isscalar(values):
+        return np.full(length, values, dtype="float64")
+    # Values that are not numbers are invalid components
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(
+        dtype="float64", na_value=np.nan
+    )
+
+
+def from_components(
+    year,
+    month,
+    day,
+    hour=0,
+    minute=0,
+    second=0,
+    century: int | None = None,
+    errors: str = "raise",
+) -> pd.Series:
+    """Build timestamps from columns of date and time components.
+
+    Args:
+        year: column of years, with 2 or 4 digits
+        month: column of months, 1 to 12
+        day: column of days of the month
+        hour: column of hours (or a scalar)
+        minute: column of minutes (or a scalar)
+        second: column of seconds (or a scalar), decimals are kept
+        century: years below 100 are in this century (2000 reads 20 as
+            2020); None follows ``%y``, 69-99 in the 1900s and 00-68 in the
+            2000s
+        errors: "raise" a ValueError for rows with missing or out of range
+            components, or "coerce" them to NaT
+
+    Returns:
+        The timestamps, as a datetime64[us] Series with the index of ``year``
+    """
+    length = len(year)
+    index = getattr(year, "index", None)
+    year, month, day, hour, minute, second = (
+        _component(values, length)
+        for values in (year, month, day, hour, minute, second)
+    )
+
+    if century is None:
+        century = np.where(year >= PIVOT_YEAR, 1900, 2000)
+    year = np.where(year < 100, year + century, year)
+
+    integers = np.stack([year, month, day, hour, minute])
+    valid = (
+        (integers == np.floor(integers)).all(axis=0)
+        & (year >= 1)
+        & (year <= 9999)
+        & (month >= 1)
+        & (month <= 12)
+        & (day >= 1)
+        & (hour >= 0)
+        & (hour <= 23)
+        & (minute >= 0)
+        & (minute <= 59)
+        & (second >= 0)
+        & (second < 60)
+    )
+
+    # Invalid rows are computed from placeholder components, then masked
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("int64")
+    first_days = months.astype("datetime64[M]").astype("datetime64[D]")
+    days_in_month = (
+        (months + 1).astype("datetime64[M]").astype("datetime64[D]") - first_days
+    ).astype("int64")
+    valid &= day <= days_in_month
+
+    microseconds = np.where(
+        valid,
+        ((day - 1) * 86_400 + hour * 3_600 + minute * 60) * 1_000_000
+        + np.round(second * 1_000_000),
+        0,
+    ).astype("int64")
+    timestamps = first_days.astype("datetime64[us]") + microseconds.astype(
+        "timedelta64[us]"
+    )
+
+    if not valid.all():
+        if errors == "raise":
+            row = int(np.flatnonzero(~valid)[0])
+            raise ValueError(f"Invalid date or time components in row {row}")
+        timestamps[~valid] = np.datetime64("NaT")
+
+    return pd.Series(timestamps, index=index)
+
+
+def as_utc(value) -> pd.Timestamp:
+    """A timestamp as naive UTC, timestamps without a timezone being UTC."""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert("UTC").tz_localize(None)
+    return value
+
+
+def _missing(values: pd.Series) -> pd.Series:
+    """Rows without a timestamp to parse: missing values and blank text."""
+    return values.isna() | values.astype("string").str.strip().eq("").fillna(True)
+
+
+def _to_datetime(values: pd.Series, date_format: str) -> pd.Series:
+    # Left to pandas: its own ISO 8601 parser, inference and fractional
+    # seconds, which Arrow's strptime does not read
+    if date_format not in ("ISO8601", "mixed") and "%f" not in date_format:
+        try:
+            text = pa.array(values, pa.string(), from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        else:
+            timestamps = pc.strptime(
+                text, format=date_format, unit="us", error_is_null=True
+            )
+            if "%Y" in date_format:
+                # Arrow's %Y also reads 16 as the year 16, pandas' needs 4 digits
+                timestamps = pc.if_else(
+                    pc.less(pc.year(timestamps), 1000), None, timestamps
+                )
+            return pd.Series(
+                timestamps.to_numpy(zero_copy_only=False), index=values.index
+            )
+    return pd.to_datetime(values, format=date_format, errors="coerce")
+
+
+def _day_first(date_format: str) -> bool | None:
+    """Whether a format writes the day before the month, None if it infers it."""
+    if date_format == "mixed":
+        return None
+    day, month = date_format.find("%d"), date_format.find("%m")
+    return 0 <= day < month
+
+
+def sniff_format(values, formats=FORMATS, sample_size: int = SAMPLE_SIZE) -> str | None:
+    """Pick the format of a column of timestamp text from a sample of it.
+
+    Args:
+        values: column of timestamp text
+        formats: candidate formats, in order of preference
+        sample_size: number of values tried, evenly spread over the column
+
+    Returns:
+        The first format parsing every sampled value, else the one parsing
+        the most, or None if the column has no values or none parse. The
+        values of a column in several layouts are left to the fallbacks of
+        ``parse_timestamps`` rather than to "mixed", which is only picked
+        when no other format parses any of them.
+    """
+    values = pd.Series(values)
+    present = values[~_missing(values)]
+    if present.empty:
+        return None
+    if len(present) > sample_size:
+        positions = np.linspace(0, len(present) - 1, sample_size).astype("int64")
+        present = present.iloc[np.unique(positions)]
+
+    best, best_count = None, 0
+    for date_format in formats:
+        if date_format == "mixed" and best is not None:
+            break
+        count = _to_datetime(present, date_format).notna().sum()
+        if count == len(present):
+            return date_format
+        if count > best_count:
+            best, best_count = date_format, count
+    return best
+
+
+def parse_timestamps(
+    values, formats=FORMATS, date_format: str | None = None, errors: str = "raise"
+) -> pd.Series:
+    """Parse a column of timestamp text with an exact format.
+
+    The whole column is parsed once with ``date_format``, sniffed from a sample
+    when not given. The rows it fails on are parsed again with the other
+    ``formats``, in order, so that a few rows in another layout do not
+    prevent the fast path for the rest. Only the formats writing the day and
+    month in the same order as ``date_format`` are tried, and never "mixed":
+    05/07/16 is not read as the 7th of May in a column of days first.
+
+    Args:
+        values: column of timestamp text
+        formats: candidate formats, in order of preference (see ``FORMATS``)
+        date_format: format of most of the values, e.g. sniffed on an earlier
+            batch of the same file; sniffed with ``sniff_format`` if None
+        errors: "raise" a ValueError for values no format tried parses, or
+            "coerce" them to NaT; missing and blank values are always NaT
+
+    Returns:
+        The timestamps, with the index of ``values``
+    """
+    values = pd.Series(values)
+    if date_format is None:
+        date_format = sniff_format(values, formats) or formats[0]
+
+    fallbacks = tuple(
+        fallback
+        for fallback in formats
+        if fallback != date_format and _day_first(fallback) == _day_first(date_format)
+    )
+    timestamps = _to_datetime(values, date_format)
+    failed = timestamps.isna()
+    failed[failed] = ~_missing(values[failed])
+    for fallback in fallbacks:
+        if not failed.any():
+            break
+        retried = _to_datetime(values[failed], fallback)
+        timestamps[retried.index] = retried
+        failed &= timestamps.isna()
+
+    if failed.any() and errors == "raise":
+        value = values[failed].iloc[0]
+        tried = (date_format, *fallbacks)
+        raise ValueError(f"Timestamp {value!r} does not match any of {tried}")
+    return timestamps